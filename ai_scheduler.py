@@ -0,0 +1,102 @@
+# ai_scheduler.py
+
+from __future__ import annotations
+import time
+import logging
+import numpy as np
+from typing import TYPE_CHECKING
+
+from config import Config
+
+if TYPE_CHECKING:
+    from entities import Player, DinosaurHerd
+    from game_map import GameMap
+    from spatial_hash import SpatialHash
+    from flow_field import FlowField
+
+logger = logging.getLogger(__name__)
+
+class AIScheduler:
+    """
+    Distance-based level of detail for dinosaur AI.
+
+    - Near tier (within AI_NEAR_RADIUS of the player): updated every tick.
+    - Middle tier (within AI_MID_RADIUS): updated every AI_MID_INTERVAL ticks.
+    - Far tier: updated every AI_FAR_INTERVAL ticks, or dormant if that is 0.
+
+    Reduced-rate updates are told how many ticks they stand for, so idle
+    wandering is advanced statistically rather than skipped. The middle and
+    far tiers are swept round-robin in batches under a per-frame time budget,
+    so the cost per tick follows the number of dinosaurs near the player.
+    """
+    def __init__(self, herd: DinosaurHerd, index: SpatialHash, field: FlowField | None = None) -> None:
+        self.herd = herd
+        self.index = index
+        self.field = field
+        self.tick = 0
+        self.last_tick = np.zeros(0, dtype=np.int64)
+        self.cursor = 0
+        self.stats = {"near": 0, "background": 0, "scanned": 0}
+
+    def _sync_size(self) -> None:
+        n = len(self.herd)
+        if len(self.last_tick) < n:
+            grown = np.full(n, self.tick, dtype=np.int64)
+            grown[:len(self.last_tick)] = self.last_tick
+            self.last_tick = grown
+        elif len(self.last_tick) > n:
+            self.last_tick = self.last_tick[:n]
+
+    def compact(self, keep: np.ndarray) -> None:
+        """
+        Follow DinosaurHerd.remove_many(): drop the bookkeeping of removed dinosaurs.
+        """
+        self.last_tick = self.last_tick[:len(keep)][keep[:len(self.last_tick)]]
+        self.cursor = 0
+
+    def update(self, player: Player, game_map: GameMap, night: bool) -> None:
+        self.tick += 1
+        self._sync_size()
+        herd = self.herd
+        n = len(herd)
+        if n == 0:
+            return
+
+        # Near tier: every dinosaur in the box around the player, via the spatial index
+        r = Config.AI_NEAR_RADIUS
+        near_views = self.index.query_rect(player.x - r, player.y - r, player.x + r, player.y + r)
+        near = np.fromiter((dino.index for dino in near_views), dtype=np.intp, count=len(near_views))
+        if len(near):
+            herd.update(player, game_map, night, near, self.index,
+                        ticks=self.tick - self.last_tick[near], field=self.field)
+            self.last_tick[near] = self.tick
+
+        # Middle and far tiers: round-robin sweep under the frame budget
+        deadline = time.perf_counter() + Config.AI_FRAME_BUDGET_MS / 1000.0
+        batch_size = Config.AI_BATCH_SIZE
+        mid_r2 = Config.AI_MID_RADIUS * Config.AI_MID_RADIUS
+        scanned = 0
+        background = 0
+        while scanned < n and time.perf_counter() < deadline:
+            start = self.cursor
+            stop = min(n, start + batch_size)
+            batch = np.arange(start, stop)
+            self.cursor = 0 if stop >= n else stop
+            scanned += stop - start
+
+            waited = self.tick - self.last_tick[batch]
+            dx = herd.x[batch] - player.x
+            dy = herd.y[batch] - player.y
+            in_mid = dx * dx + dy * dy <= mid_r2
+            due = in_mid & (waited >= Config.AI_MID_INTERVAL)
+            if Config.AI_FAR_INTERVAL > 0:
+                due |= ~in_mid & (waited >= Config.AI_FAR_INTERVAL)
+            due &= waited > 0
+            due_idx = batch[due]
+            if len(due_idx):
+                herd.update(player, game_map, night, due_idx, self.index, ticks=waited[due],
+                            field=self.field)
+                self.last_tick[due_idx] = self.tick
+                background += len(due_idx)
+
+        self.stats = {"near": len(near), "background": background, "scanned": scanned}
@@ -0,0 +1,64 @@
+# asset_manager.py
+
+from __future__ import annotations
+import pygame
+import logging
+
+logger = logging.getLogger(__name__)
+
+class AssetManager:
+    """
+    Process-wide registry of sprite surfaces. Each (path, size, flip)
+    combination is loaded, scaled and flipped exactly once; callers get
+    shared references and must not draw onto them.
+    """
+
+    def __init__(self) -> None:
+        self.images: dict[tuple[str, tuple[int, int] | None, bool], pygame.Surface | None] = {}
+        self.hits = 0
+        self.misses = 0
+        self.bytes_used = 0
+
+    def get_image(self, path: str, size: tuple[int, int] | None = None,
+                  flip: bool = False) -> pygame.Surface | None:
+        """
+        Return the image at 'path', optionally scaled to 'size' and mirrored
+        horizontally. Returns None (and remembers the failure) if it cannot be loaded.
+        """
+        key = (path, size, flip)
+        if key in self.images:
+            self.hits += 1
+            return self.images[key]
+
+        self.misses += 1
+        if flip:
+            base = self.get_image(path, size)
+            image = pygame.transform.flip(base, True, False) if base else None
+        elif size is not None:
+            base = self.get_image(path)
+            image = pygame.transform.scale(base, size) if base else None
+        else:
+            try:
+                image = pygame.image.load(path).convert_alpha()
+            except (pygame.error, OSError) as e:
+                logger.warning(f"Could not load image '{path}': {e}")
+                image = None
+
+        self.images[key] = image
+        if image is not None:
+            self.bytes_used += image.get_width() * image.get_height() * image.get_bytesize()
+        return image
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "images": sum(1 for image in self.images.values() if image is not None),
+            "hits": self.hits,
+            "misses": self.misses,
+            "bytes": self.bytes_used,
+        }
+
+    def clear(self) -> None:
+        self.images.clear()
+        self.bytes_used = 0
+
+asset_manager = AssetManager()
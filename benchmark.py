@@ -0,0 +1,271 @@
+# benchmark.py
+
+"""
+Benchmarks for the game's hot paths, runnable without a display.
+
+    python benchmark.py --output baseline.json
+    python benchmark.py --compare baseline.json --threshold 0.2
+
+Times map generation at several sizes, startup (Game.__init__), terrain and
+minimap rendering, and collision checks and dinosaur updates at increasing
+dinosaur counts. Results are printed (and optionally written) as JSON; in
+compare mode any benchmark whose median got slower than the baseline by more
+than the threshold is reported and the exit code is 1. Slowdowns smaller than
+--min-diff-ms are treated as timer noise, since sub-microsecond benchmarks
+swing by tens of percent between identical runs. With --rounds the whole
+suite runs several times and each benchmark reports the median of its
+per-round medians, which evens out load changes during the run.
+"""
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import sys
+import json
+import time
+import random
+import platform
+import logging
+import argparse
+import statistics
+from typing import Callable
+
+import numpy as np
+import pygame
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+MAP_SIZES = (128, 256, 512, 1024, 2048)
+DINO_COUNTS = (160, 1000, 10000, 50000)
+QUICK_MAP_SIZES = (128, 256, 512)
+QUICK_DINO_COUNTS = (160, 1000, 10000)
+DEFAULT_DINOS = (Config.DINOSAUR_COUNT_NORMAL, Config.DINOSAUR_COUNT_AGGRESSIVE)
+
+def measure(fn: Callable[[], object], repeat: int, warmup: int = 1) -> dict[str, float]:
+    """
+    Call 'fn' 'repeat' times after 'warmup' untimed calls; return timings in ms.
+    """
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return {
+        "median_ms": round(statistics.median(samples), 4),
+        "min_ms": round(min(samples), 4),
+        "mean_ms": round(statistics.fmean(samples), 4),
+        "repeat": repeat,
+    }
+
+def set_dinosaur_count(total: int) -> None:
+    """
+    Split 'total' into normal/aggressive dinosaurs in the configured ratio.
+    """
+    aggressive = round(total * DEFAULT_DINOS[1] / sum(DEFAULT_DINOS))
+    Config.DINOSAUR_COUNT_AGGRESSIVE = aggressive
+    Config.DINOSAUR_COUNT_NORMAL = total - aggressive
+
+def bench_map_generation(sizes: tuple[int, ...], repeat: int) -> dict[str, dict]:
+    from map_gen import generate_island_map
+
+    results = {}
+    width, height = Config.MAP_WIDTH, Config.MAP_HEIGHT
+    try:
+        for size in sizes:
+            Config.MAP_WIDTH = Config.MAP_HEIGHT = size
+
+            def generate() -> None:
+                random.seed(Config.SEED)
+                generate_island_map()
+
+            # Large maps are slow enough that fewer samples suffice
+            results[f"generate_island_map[{size}]"] = measure(generate, max(1, repeat // (1 + size // 1024)))
+    finally:
+        Config.MAP_WIDTH, Config.MAP_HEIGHT = width, height
+    return results
+
+def bench_startup(repeat: int) -> dict[str, dict]:
+    from game import Game
+
+    results = {}
+    cache_enabled = Config.MAP_CACHE_ENABLED
+    try:
+        Config.MAP_CACHE_ENABLED = False
+        results["game_init[cold]"] = measure(lambda: Game(headless=True), repeat, warmup=0)
+        Config.MAP_CACHE_ENABLED = True
+        results["game_init[cached]"] = measure(lambda: Game(headless=True), repeat)
+    finally:
+        Config.MAP_CACHE_ENABLED = cache_enabled
+    return results
+
+def bench_rendering(game, repeat: int) -> dict[str, dict]:
+    """
+    draw_map along a walk across the island (so chunk baking is included
+    where the cache misses) and the minimap with its marker refresh.
+    """
+    cx, cy = Config.MAP_WIDTH // 2, Config.MAP_HEIGHT // 2
+    path = [(cx + dx, cy) for dx in range(-repeat, repeat, 2)] or [(cx, cy)]
+    position = iter(path * 2)
+
+    def draw_map() -> None:
+        game.camx, game.camy = next(position)
+        game.draw_map()
+
+    def draw_minimap() -> None:
+        # Force the dinosaur markers to be redrawn each call
+        game.hud.minimap_frame = None
+        game.hud.draw_minimap()
+
+    return {
+        "draw_map": measure(draw_map, len(path)),
+        "hud_draw_minimap": measure(draw_minimap, repeat),
+    }
+
+def bench_simulation(game, counts: tuple[int, ...], repeat: int) -> dict[str, dict]:
+    import collision_manager
+
+    results = {}
+    try:
+        for count in counts:
+            set_dinosaur_count(count)
+            game.reset_game()
+            game.player.hp = 10 ** 9
+            night = False
+
+            results[f"check_collisions[{count}]"] = measure(
+                lambda: collision_manager.check_collisions(game), repeat)
+            results[f"dinosaur_update[{count}]"] = measure(
+                lambda: game.dinosaurs.update(game.player, game.game_map, night,
+                                              index=game.dino_index), repeat)
+            results[f"ai_scheduler_update[{count}]"] = measure(
+                lambda: game.ai_scheduler.update(game.player, game.game_map, night), repeat)
+            results[f"game_tick[{count}]"] = measure(game.tick, repeat)
+    finally:
+        set_dinosaur_count(sum(DEFAULT_DINOS))
+    return results
+
+def merge_rounds(rounds: list[dict[str, dict]]) -> dict[str, dict]:
+    """
+    Combine the results of several runs of the suite: the median of the
+    per-round medians, the overall minimum and the mean of the means.
+    """
+    merged = {}
+    for name in rounds[0]:
+        results = [r[name] for r in rounds]
+        merged[name] = {
+            "median_ms": round(statistics.median(r["median_ms"] for r in results), 4),
+            "min_ms": min(r["min_ms"] for r in results),
+            "mean_ms": round(statistics.fmean(r["mean_ms"] for r in results), 4),
+            "repeat": results[0]["repeat"],
+            "rounds": len(results),
+        }
+    return merged
+
+def run(quick: bool = False, repeat: int = 20, rounds: int = 1) -> dict:
+    results = merge_rounds([run_suite(quick, repeat) for _ in range(max(1, rounds))])
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "map_size": [Config.MAP_WIDTH, Config.MAP_HEIGHT],
+            "quick": quick,
+            "rounds": max(1, rounds),
+        },
+        "results": results,
+    }
+
+def run_suite(quick: bool, repeat: int) -> dict[str, dict]:
+    Config.AUDIO_ENABLED = False
+    from game import Game
+    from state import GameState
+
+    results = {}
+    results.update(bench_map_generation(QUICK_MAP_SIZES if quick else MAP_SIZES, repeat))
+    results.update(bench_startup(max(1, repeat // 5)))
+
+    game = Game(headless=True)
+    game.state = GameState.PLAYING
+    results.update(bench_rendering(game, repeat))
+    results.update(bench_simulation(game, QUICK_DINO_COUNTS if quick else DINO_COUNTS, repeat))
+    return results
+
+def compare(current: dict, baseline: dict, threshold: float,
+            min_diff_ms: float = 0.02) -> tuple[list[str], list[str]]:
+    """
+    Return (regressions, noise): a line per benchmark whose median regressed
+    by more than 'threshold' (a fraction, 0.2 = 20% slower) against the
+    baseline, and the names of those left out because the median grew by
+    less than 'min_diff_ms'.
+    """
+    regressions = []
+    noise = []
+    for name, result in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None or base["median_ms"] <= 0:
+            continue
+        ratio = result["median_ms"] / base["median_ms"]
+        result["baseline_median_ms"] = base["median_ms"]
+        result["ratio"] = round(ratio, 3)
+        if ratio > 1.0 + threshold:
+            if result["median_ms"] - base["median_ms"] < min_diff_ms:
+                result["noise"] = True
+                noise.append(name)
+                continue
+            regressions.append(f"{name}: {base['median_ms']:.3f} ms -> {result['median_ms']:.3f} ms "
+                               f"({(ratio - 1.0) * 100:+.0f}%)")
+    return regressions, noise
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the game's hot paths.")
+    parser.add_argument("--output", help="Write the JSON results to this file.")
+    parser.add_argument("--compare", metavar="BASELINE", help="Baseline JSON to compare against.")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Allowed slowdown before flagging a regression (default: 0.2 = 20%%).")
+    parser.add_argument("--min-diff-ms", type=float, default=0.02,
+                        help="Smallest slowdown in ms flagged as a regression (default: 0.02).")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed calls per benchmark.")
+    parser.add_argument("--rounds", type=int, default=3,
+                        help="Runs of the whole suite; medians are taken across them (default: 3).")
+    parser.add_argument("--quick", action="store_true", help="Smaller map sizes and dinosaur counts.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING,
+                        format="[%(asctime)s] %(levelname)s in %(module)s: %(message)s")
+    report = run(quick=args.quick, repeat=args.repeat, rounds=args.rounds)
+
+    regressions = []
+    noise = []
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions, noise = compare(report, baseline, args.threshold, args.min_diff_ms)
+        report["regressions"] = regressions
+        report["skipped_as_noise"] = noise
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+    if noise:
+        print(f"Skipped as noise (over {args.threshold:.0%} but less than {args.min_diff_ms} ms slower): "
+              f"{', '.join(noise)}", file=sys.stderr)
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.threshold:.0%}:", file=sys.stderr)
+        for line in regressions:
+            print(f"  {line}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -8,6 +8,8 @@ from typing import TYPE_CHECKING
 
 from config import Config
 from sound_manager import sound_manager
+from asset_manager import asset_manager
+from map_gen import BEACH_TILE
 
 if TYPE_CHECKING:
     from game import Game
@@ -16,23 +18,19 @@ logger = logging.getLogger(__name__)
 
 def create_boat_frames() -> list[pygame.Surface]:
     """
-    Loads and returns a list of boat frames from the config.
+    Returns a list of boat frames from the config, via the shared asset registry.
     Returns a list of loaded/missing frames (with fallback if none found).
     """
     frames = []
+    size = (Config.TILE_SIZE * Config.BOAT_SIZE_FACTOR, Config.TILE_SIZE * Config.BOAT_SIZE_FACTOR)
     for frame_key in ["frame_0", "frame_1"]:
         path = Config.get_sprite_path("boats", frame_key)
         if path:
-            try:
-                boat_img = pygame.image.load(path).convert_alpha()
-                boat_img = pygame.transform.scale(
-                    boat_img,
-                    (Config.TILE_SIZE * Config.BOAT_SIZE_FACTOR,
-                     Config.TILE_SIZE * Config.BOAT_SIZE_FACTOR)
-                )
+            boat_img = asset_manager.get_image(path, size)
+            if boat_img:
                 frames.append(boat_img)
-            except pygame.error as e:
-                logger.warning(f"Could not load boat sprite '{frame_key}' at '{path}': {e}")
+            else:
+                logger.warning(f"Could not load boat sprite '{frame_key}' at '{path}'.")
         else:
             logger.warning(f"Boat sprite key '{frame_key}' not found in config.")
 
@@ -44,39 +42,66 @@ def create_boat_frames() -> list[pygame.Surface]:
 
     return frames
 
+def choose_boat_site(game: Game, beach_only: bool | None = None,
+                     min_distance: float | None = None,
+                     attempts: int = 32) -> tuple[int, int]:
+    """
+    Pick a landing site from the map's precomputed coastline index.
+
+    A few O(1) random draws are tried against the filters (beach tiles only,
+    at least 'min_distance' tiles from the player). If none passes, the
+    coastline is filtered in one vectorized pass; if nothing matches, the
+    filters are dropped, and a map without coast falls back to any passable tile.
+    The filters default to Config.BOAT_BEACH_ONLY and Config.BOAT_MIN_PLAYER_DISTANCE.
+    """
+    if beach_only is None:
+        beach_only = Config.BOAT_BEACH_ONLY
+    if min_distance is None:
+        min_distance = Config.BOAT_MIN_PLAYER_DISTANCE
+    game_map = game.game_map
+    px, py = game.player.x, game.player.y
+    min_d2 = min_distance * min_distance
+
+    def acceptable(x, y) -> bool:
+        if beach_only and game_map.tile_at(x, y) != BEACH_TILE:
+            return False
+        return (x - px) * (x - px) + (y - py) * (y - py) >= min_d2
+
+    coast = game_map.coast
+    if len(coast):
+        for _ in range(attempts):
+            x, y = game_map.index_to_xy(int(coast[random.randrange(len(coast))]))
+            if acceptable(x, y):
+                return x, y
+
+        xs, ys = game_map.index_to_xy(coast)
+        ok = (xs - px) ** 2 + (ys - py) ** 2 >= min_d2
+        if beach_only:
+            ok &= game_map.tiles_at(xs, ys) == BEACH_TILE
+        candidates = coast[ok] if ok.any() else coast
+        if not ok.any():
+            logger.warning("No coastal tile matches the boat filters; ignoring them.")
+        return game_map.index_to_xy(int(random.choice(candidates)))
+
+    logger.warning("No coastal tile found; placing boat randomly on land.")
+    if len(game_map.passable_tiles):
+        return game_map.index_to_xy(int(random.choice(game_map.passable_tiles)))
+    return game_map.width // 2, game_map.height // 2
+
+def plan_boat(game: Game) -> None:
+    """
+    Choose where the boat will land ahead of its arrival.
+    """
+    game.boat_site = choose_boat_site(game)
+    logger.info(f"Boat will land at {game.boat_site}.")
+
 def place_boat(game: Game) -> None:
     """
-    Find a coastal tile and place the boat there. If no coast is found,
-    place the boat on a random non-water tile.
+    Place the boat at its planned landing site (planning it now if needed).
     """
-    logger.info("Placing boat on the map...")
-    coast_tiles = []
-    for y in range(Config.MAP_HEIGHT):
-        for x in range(Config.MAP_WIDTH):
-            if game.game_map[y][x] != 3:  # not water
-                adjacent_water = False
-                for ny in [y-1, y, y+1]:
-                    for nx in [x-1, x, x+1]:
-                        if 0 <= nx < Config.MAP_WIDTH and 0 <= ny < Config.MAP_HEIGHT:
-                            if game.game_map[ny][nx] == 3:
-                                adjacent_water = True
-                                break
-                    if adjacent_water:
-                        break
-                if adjacent_water:
-                    coast_tiles.append((x, y))
-
-    if coast_tiles:
-        x, y = random.choice(coast_tiles)
-        game.boat_x, game.boat_y = x, y
-    else:
-        logger.warning("No coastal tile found; placing boat randomly on land.")
-        while True:
-            x = random.randint(0, Config.MAP_WIDTH - 1)
-            y = random.randint(0, Config.MAP_HEIGHT - 1)
-            if game.game_map[y][x] != 3:
-                game.boat_x, game.boat_y = x, y
-                break
+    if game.boat_site is None:
+        plan_boat(game)
+    game.boat_x, game.boat_y = game.boat_site
 
     sound_manager.play("environment", "boat_arrives")
     logger.info(f"Boat placed at ({game.boat_x}, {game.boat_y}).")
@@ -9,24 +9,76 @@ class Config:
 
     WINDOW_WIDTH = 1500
     WINDOW_HEIGHT = 900
-    FPS = 30
+    FPS = 30  # Render frame cap
+    SIM_TICK_RATE = 30  # Fixed simulation ticks per second; speeds are per tick
+    MAX_TICKS_PER_FRAME = 5  # Beyond this the simulation slows down instead of catching up
+    # Frame rate per game state name (others use FPS); static screens block on input while idle
+    STATE_FPS = {"PAUSE": 15, "MAIN_MENU": 15, "HELP": 15, "INTRO": 15, "GAME_OVER": 15, "WON": 15}
+    IDLE_WAKE_MS = 500  # Longest an idle screen blocks waiting for input
+    MAX_RENDER_SKIP = 3  # Under load, render at least every this many frames
 
     MAP_WIDTH = 512
     MAP_HEIGHT = 512
     TILE_SIZE = 32
 
+    # Island generation
+    MAP_ROUGHNESS = 0.4
+    # (upper height bound, tile id) pairs, checked in order
+    MAP_BIOME_THRESHOLDS = ((0.20, 3), (0.30, 2), (0.80, 1), (float("inf"), 0))
+    MAP_MUD_FRACTION = 0.03
+    MAP_SPIKE_FRACTION = 0.02
+    MAP_LEGACY_RNG = True  # True reproduces the original islands for a given SEED; False is faster.
+    # Maps larger than this (in either dimension) are generated in tiles on a process pool
+    MAP_TILED_THRESHOLD = 4096
+    MAP_TILE_SIZE = 1024  # Must be a power of two
+    MAP_GEN_WORKERS = None  # None uses all cores
+    MAP_CACHE_ENABLED = True
+    MAP_CACHE_DIR = ".map_cache"
+    # Endless world streamed in chunks around the player instead of the fixed island
+    WORLD_STREAMING = False
+    STREAM_CHUNK_TILES = 64  # Must be a power of two and a multiple of TERRAIN_CHUNK_TILES
+    STREAM_RADIUS = 3  # Chunks kept loaded on each side of the player's chunk
+    STREAM_MAX_CHUNKS = 256  # Chunk store (LRU) capacity
+    STREAM_DINOSAURS_PER_CHUNK = 2.5  # Averages, on a chunk's first visit
+    STREAM_ITEMS_PER_CHUNK = 0.25
+    WORLD_PREBUILD_ENABLED = True  # Prepare the next island on a background thread while menus are shown
+
+    # Saved games (F5 or [S] in the pause menu saves, [L] in the main menu resumes the latest save)
+    SAVE_DIR = "saves"
+    AUTOSAVE_ENABLED = True
+    AUTOSAVE_INTERVAL = 60.0  # Seconds of play between autosaves
+    SAVE_VERIFY_MAX_BYTES = 64 * 1024 * 1024  # Larger map blocks are mapped without checksum verification
+
+    # Terrain rendering
+    TERRAIN_CHUNK_TILES = 16
+    TERRAIN_CACHE_MAX_BYTES = 64 * 1024 * 1024
+    MINIMAP_MARKER_INTERVAL = 0.1  # Seconds between minimap marker refreshes
+    TEXT_CACHE_SIZE = 256  # Rendered text surfaces kept for reuse
+
+    SPATIAL_CELL_SIZE = 8  # Tiles per spatial hash cell (entity queries and collisions)
+
+    # Frame-time profiler (F3 toggles the overlay, F4 exports CSV)
+    PROFILER_ENABLED = False
+    PROFILER_HISTORY = 600  # Frames kept for statistics and export
+    PROFILER_CSV_PATH = "frame_times.csv"
+
+    AUDIO_ENABLED = True  # False skips the mixer entirely (headless runs)
+    INPUT_RECORD_PATH = None  # Path to record live input to, for headless replays
+
     # Joystick Configuration
     ENABLE_JOYSTICK = False
     JOYSTICK_FIRE_BUTTON = 3
     JOYSTICK_AXIS_THRESHOLD = 0.5
 
+    # Optional per-biome keys: "dino_passable" (defaults to "passable"),
+    # "speed" (movement factor, default 1.0), "damage" (per-tick contact damage, default 0)
     BIOMES = {
         0: {"color": (139, 69, 19),  "passable": True,  "name": "Volcano"},
         1: {"color": (34, 139, 34),  "passable": True,  "name": "Forest"},
         2: {"color": (238, 214, 175),"passable": True,  "name": "Beach"},
-        3: {"color": (0, 0, 255),    "passable": False, "name": "Water"},
-        4: {"color": (102, 51, 0),   "passable": True,  "name": "Mud"},
-        5: {"color": (128, 128, 128),"passable": True,  "name": "Spikes"}
+        3: {"color": (0, 0, 255),    "passable": False, "dino_passable": False, "name": "Water"},
+        4: {"color": (102, 51, 0),   "passable": True,  "speed": 0.5, "name": "Mud"},
+        5: {"color": (128, 128, 128),"passable": True,  "damage": 1, "name": "Spikes"}
     }
 
     PLAYER_SPEED = 1
@@ -42,6 +94,18 @@ class Config:
     DINOSAUR_RANDOM_MOVE_CHANCE = 0.05
     DINOSAUR_RUNAWAY_DISTANCE = 3
 
+    # Dinosaur AI level of detail (see ai_scheduler.py).
+    # AI_NEAR_RADIUS must stay above DINOSAUR_SIGHT_NIGHT so chases always run at full rate.
+    AI_LOD_ENABLED = True
+    AI_NEAR_RADIUS = 24
+    AI_MID_RADIUS = 64
+    AI_MID_INTERVAL = 4  # Ticks between updates in the middle band
+    AI_FAR_INTERVAL = 30  # Ticks between updates far away; 0 leaves far dinosaurs dormant
+    AI_FRAME_BUDGET_MS = 2.0
+    AI_BATCH_SIZE = 2048
+    FLOW_FIELD_ENABLED = True  # Chasing and fleeing dinosaurs path around water
+    FLOW_FIELD_RADIUS = 16  # Tiles around the player covered by the pursuit field
+
     DAY_LENGTH = 8.0
     NIGHT_LENGTH = 8.0
     CYCLE_LENGTH = DAY_LENGTH + NIGHT_LENGTH
@@ -50,7 +114,6 @@ class Config:
     LAVA_INTERVAL = 10.0
     LAVA_DAMAGE = 20
 
-    SPIKE_DAMAGE = 1
     SPIKES_ENABLED = True
 
     POTION_HEAL = 25
@@ -59,6 +122,9 @@ class Config:
     BOAT_COLOR = (255, 255, 0)
     BOAT_SIZE_FACTOR = 2
     BOAT_ARRIVAL_CYCLES = 3
+    BOAT_SITE_LEAD = 5.0  # Seconds before arrival at which the landing site is chosen
+    BOAT_BEACH_ONLY = False  # Only land on beach tiles (if the coast has any)
+    BOAT_MIN_PLAYER_DISTANCE = 0  # Minimum tiles between the player and the landing site
 
     NIGHT_OVERLAY = (0, 0, 50, 100)
 
@@ -137,6 +203,8 @@ class Config:
     }
 
     DEFAULT_SOUND_VOLUME = 0.5
+    SOUND_CACHE_ENABLED = True  # Keep decoded PCM on disk so warm starts skip MP3 decoding
+    SOUND_CACHE_DIR = ".sound_cache"
     MUSIC_VOLUME_DAY = 0.4
     MUSIC_VOLUME_NIGHT = 0.4
 
@@ -154,7 +222,7 @@ class Config:
             "FLUCHT VON DER DINOSAURIER-INSEL",
             "Ein Spiel von Konrad Weber",
             "Umgesetzt von Stefan Weber (und ChatGPT 4o1) im Dezember 2024",
-            "Drücke [ENTER] zum STARTEN, [H] für Hilfe, [Q] zum Beenden."
+            "Drücke [ENTER] zum STARTEN, [L] zum Fortsetzen, [H] für Hilfe, [Q] zum Beenden."
         ],
         "HELP_SCREEN": [
             "HILFE",
@@ -163,13 +231,14 @@ class Config:
             " - Leertaste: Dino Spray benutzen",
             " - E oder Rechts-Shift: Heiltrank benutzen",
             " - ESC: Pause/Unpause oder Exit",
+            " - F5: Spiel speichern",
             "",
             "Ziel des Spiels ist es auf der Dinosaurier-Insel zu überleben bis das rettende Boot ankommt.",
             "Drücke eine beliebige Taste, um zum Hauptmenü zurückzukehren."
         ],
         "PAUSE_SCREEN": [
             "SPIEL PAUSIERT",
-            "Drücke [ESC] zum Fortsetzen, [H] für Hilfe, [M] für Musik an/aus oder [Q] zum Beenden."
+            "Drücke [ESC] zum Fortsetzen, [S] zum Speichern, [H] für Hilfe, [M] für Musik an/aus oder [Q] zum Beenden."
         ],
         "LOSE_SCREEN": [
             "GAME OVER!",
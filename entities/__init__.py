@@ -1,8 +1,8 @@
 # entities/__init__.py
 
 from .player import Player
-from .dinosaur import Dinosaur
+from .dinosaur import Dinosaur, DinosaurHerd
 from .item import Item
 
-__all__ = ['Player', 'Dinosaur', 'Item']
+__all__ = ['Player', 'Dinosaur', 'DinosaurHerd', 'Item']
 
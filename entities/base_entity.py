@@ -7,3 +7,13 @@ class Entity:
     def __init__(self, x: float, y: float) -> None:
         self.x = x
         self.y = y
+        # Position at the previous simulation tick, for render interpolation
+        self.prev_x = x
+        self.prev_y = y
+
+    def interpolated(self, alpha: float) -> tuple[float, float]:
+        """
+        Position blended between the previous and the current tick.
+        """
+        return (self.prev_x + (self.x - self.prev_x) * alpha,
+                self.prev_y + (self.y - self.prev_y) * alpha)
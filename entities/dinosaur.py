@@ -1,81 +1,85 @@
 # entities/dinosaur.py
 
 from __future__ import annotations  # Enables postponed evaluation of annotations (Python 3.7+)
-import math
 import random
 import pygame
 import logging
+import numpy as np
 from config import Config
 from entities.base_entity import Entity
-from utils import is_passable, direction_towards, load_frames
-from typing import TYPE_CHECKING
+from utils import load_frames
+from typing import TYPE_CHECKING, Iterator
 
 if TYPE_CHECKING:
     from entities.player import Player  # Imported only for type checking to avoid circular imports
+    from game_map import GameMap
+    from spatial_hash import SpatialHash
+    from flow_field import FlowField
 
 logger = logging.getLogger(__name__)
 
+# Unit steps for random idle movement: right, left, down, up
+_IDLE_STEPS = np.array([(1, 0), (-1, 0), (0, 1), (0, -1)], dtype=np.float64)
+
 class Dinosaur(Entity):
     """
-    Dinosaur entity that can chase, idle, or flee.
+    Thin per-dinosaur view into a DinosaurHerd, used by rendering,
+    collision and HUD code. All state lives in the herd's arrays.
     """
     IDLE = 0
     CHASE = 1
     FLEE = 2
 
-    def __init__(self, x: float, y: float, aggressive: bool = False) -> None:
-        super().__init__(x, y)
-        self.aggressive = aggressive
-        self.state = Dinosaur.IDLE
-        self.just_attacked = False
-
-        sprite_subtype = "aggressive" if self.aggressive else "normal"
-        self.frames_right, self.frames_left = load_frames(
-            ["idle_0", "idle_1"],
-            "entities",
-            "dinosaur",
-            sprite_subtype
-        )
-
-        self.current_frame = 0
-        self.animation_timer = 0.0
-        self.animation_interval = 0.2
-        self.facing_left = False
+    def __init__(self, herd: DinosaurHerd, index: int) -> None:
+        # Entity.__init__ is not called: x/y are properties backed by the herd
+        self.herd = herd
+        self.index = index
 
-    def update(self, player: Player, game_map: list[list[int]], night: bool) -> None:
-        """
-        Update the dinosaur's state based on the player's position and time of day.
+    @property
+    def x(self) -> float:
+        return float(self.herd.x[self.index])
 
-        Args:
-            player (Player): The player instance.
-            game_map (list[list[int]]): The game map grid.
-            night (bool): Whether it's currently night time.
-        """
-        dist = math.dist((self.x, self.y), (player.x, player.y))
-
-        if self.just_attacked:
-            self.state = Dinosaur.FLEE
-        else:
-            if self.aggressive:
-                sight = Config.DINOSAUR_SIGHT_NIGHT if night else Config.DINOSAUR_SIGHT_DAY
-                if dist <= sight and not player.repellent_active:
-                    self.state = Dinosaur.CHASE
-                else:
-                    self.state = Dinosaur.IDLE
-            else:
-                self.state = Dinosaur.IDLE
-
-        if self.state == Dinosaur.CHASE:
-            self._chase(player, game_map)
-        elif self.state == Dinosaur.FLEE:
-            self._flee(player, game_map)
-        else:
-            self._idle_move(game_map)
-
-        self.animation_timer += 1 / Config.FPS
-        if self.animation_timer >= self.animation_interval:
-            self.animation_timer = 0.0
-            self.current_frame = (self.current_frame + 1) % len(self.frames_right)
+    @x.setter
+    def x(self, value: float) -> None:
+        self.herd.x[self.index] = value
+
+    @property
+    def y(self) -> float:
+        return float(self.herd.y[self.index])
+
+    @y.setter
+    def y(self, value: float) -> None:
+        self.herd.y[self.index] = value
+
+    def interpolated(self, alpha: float) -> tuple[float, float]:
+        herd = self.herd
+        i = self.index
+        return (float(herd.prev_x[i] + (herd.x[i] - herd.prev_x[i]) * alpha),
+                float(herd.prev_y[i] + (herd.y[i] - herd.prev_y[i]) * alpha))
+
+    @property
+    def aggressive(self) -> bool:
+        return bool(self.herd.aggressive[self.index])
+
+    @property
+    def state(self) -> int:
+        return int(self.herd.state[self.index])
+
+    @property
+    def just_attacked(self) -> bool:
+        return bool(self.herd.just_attacked[self.index])
+
+    @just_attacked.setter
+    def just_attacked(self, value: bool) -> None:
+        self.herd.just_attacked[self.index] = value
+
+    @property
+    def facing_left(self) -> bool:
+        return bool(self.herd.facing_left[self.index])
+
+    @property
+    def current_frame(self) -> int:
+        return int(self.herd.frame[self.index])
 
     def get_current_frame(self) -> pygame.Surface:
         """
@@ -84,59 +88,250 @@ class Dinosaur(Entity):
         Returns:
             pygame.Surface: The current frame image.
         """
+        frames_right, frames_left = self.herd.frames[self.aggressive]
         if self.facing_left:
-            return self.frames_left[self.current_frame]
-        return self.frames_right[self.current_frame]
+            return frames_left[self.current_frame]
+        return frames_right[self.current_frame]
+
+class DinosaurHerd:
+    """
+    Structure-of-arrays store for all dinosaurs. Positions, states,
+    aggressiveness, facing and animation phase are kept in NumPy arrays
+    and the chase/flee/idle rules run as vectorized passes.
+    """
+    def __init__(self, capacity: int = 256) -> None:
+        self.count = 0
+        self.x = np.zeros(capacity, dtype=np.float64)
+        self.y = np.zeros(capacity, dtype=np.float64)
+        self.prev_x = np.zeros(capacity, dtype=np.float64)
+        self.prev_y = np.zeros(capacity, dtype=np.float64)
+        self.aggressive = np.zeros(capacity, dtype=bool)
+        self.state = np.full(capacity, Dinosaur.IDLE, dtype=np.int8)
+        self.just_attacked = np.zeros(capacity, dtype=bool)
+        self.facing_left = np.zeros(capacity, dtype=bool)
+        self.frame = np.zeros(capacity, dtype=np.int8)
+        self.animation_timer = np.zeros(capacity, dtype=np.float32)
+        self.animation_interval = 0.2
+        self.views: list[Dinosaur] = []
+
+        # Created on first update, seeded from the global random module so
+        # Config.SEED keeps runs reproducible without shifting spawn positions
+        self.rng = None
+
+        self.frames = {
+            aggressive: load_frames(["idle_0", "idle_1"], "entities", "dinosaur",
+                                    "aggressive" if aggressive else "normal")
+            for aggressive in (False, True)
+        }
+        self.frame_counts = np.array([len(self.frames[False][0]), len(self.frames[True][0])],
+                                     dtype=np.int8)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[Dinosaur]:
+        return iter(self.views)
+
+    def __getitem__(self, index: int) -> Dinosaur:
+        return self.views[index]
+
+    def _grow(self, needed: int) -> None:
+        capacity = len(self.x)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in ("x", "y", "prev_x", "prev_y", "aggressive", "state", "just_attacked",
+                     "facing_left", "frame", "animation_timer"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
 
-    def _chase(self, player: Player, game_map: list[list[int]]) -> None:
+    def spawn_many(self, xs: np.ndarray, ys: np.ndarray, aggressive: bool) -> list[Dinosaur]:
         """
-        Chase the player.
+        Add dinosaurs at the given positions and return their views.
+        """
+        n = len(xs)
+        start = self.count
+        self._grow(start + n)
+        end = start + n
+        self.x[start:end] = xs
+        self.y[start:end] = ys
+        self.prev_x[start:end] = xs
+        self.prev_y[start:end] = ys
+        self.aggressive[start:end] = aggressive
+        self.state[start:end] = Dinosaur.IDLE
+        self.just_attacked[start:end] = False
+        self.facing_left[start:end] = False
+        self.frame[start:end] = 0
+        self.animation_timer[start:end] = 0.0
+        self.count = end
+        views = [Dinosaur(self, i) for i in range(start, end)]
+        self.views.extend(views)
+        return views
 
-        Args:
-            player (Player): The player instance.
-            game_map (list[list[int]]): The game map grid.
+    def spawn(self, x: float, y: float, aggressive: bool = False) -> Dinosaur:
+        return self.spawn_many(np.array([x]), np.array([y]), aggressive)[0]
+
+    def remove_many(self, indices: np.ndarray) -> np.ndarray:
         """
-        dx, dy = direction_towards(self.x, self.y, player.x, player.y)
-        nx = self.x + dx * Config.DINOSAUR_SPEED_AGGRESSIVE
-        ny = self.y + dy * Config.DINOSAUR_SPEED_AGGRESSIVE
-        if is_passable(int(nx), int(ny), game_map, for_dino=True):
-            self.x = nx
-            self.y = ny
-        self.facing_left = (dx < 0)
-
-    def _flee(self, player: Player, game_map: list[list[int]]) -> None:
+        Remove the given dinosaurs, keeping the others in order. Their views
+        are renumbered; views of removed dinosaurs must no longer be used.
+        Returns the boolean mask of the dinosaurs that were kept.
         """
-        Flee from the player.
+        keep = np.ones(self.count, dtype=bool)
+        keep[indices] = False
+        n = int(np.count_nonzero(keep))
+        for name in ("x", "y", "prev_x", "prev_y", "aggressive", "state", "just_attacked",
+                     "facing_left", "frame", "animation_timer"):
+            arr = getattr(self, name)
+            arr[:n] = arr[:self.count][keep]
+        self.views = [view for view, kept in zip(self.views, keep.tolist()) if kept]
+        for i, view in enumerate(self.views):
+            view.index = i
+        self.count = n
+        return keep
 
-        Args:
-            player (Player): The player instance.
-            game_map (list[list[int]]): The game map grid.
+    def snapshot_positions(self) -> None:
         """
-        dx, dy = direction_towards(player.x, player.y, self.x, self.y)
-        nx = self.x + dx * Config.DINOSAUR_SPEED_AGGRESSIVE
-        ny = self.y + dy * Config.DINOSAUR_SPEED_AGGRESSIVE
-        if is_passable(int(nx), int(ny), game_map, for_dino=True):
-            self.x = nx
-            self.y = ny
-        self.facing_left = (dx < 0)
-
-        dist2 = math.dist((self.x, self.y), (player.x, player.y))
-        if dist2 > Config.DINOSAUR_RUNAWAY_DISTANCE:
-            self.just_attacked = False
-            self.state = Dinosaur.IDLE
-
-    def _idle_move(self, game_map: list[list[int]]) -> None:
+        Remember current positions as the previous tick's, for render interpolation.
         """
-        Perform random movement when idle.
+        self.prev_x[:self.count] = self.x[:self.count]
+        self.prev_y[:self.count] = self.y[:self.count]
+
+    @staticmethod
+    def _steer(field: FlowField, x: np.ndarray, y: np.ndarray, mask: np.ndarray,
+               dir_x: np.ndarray, dir_y: np.ndarray, flee: bool) -> None:
+        """
+        Overwrite dir_x/dir_y of the dinosaurs in 'mask' with the unit vector
+        towards the next tile the flow field gives for them, where it has one.
+        """
+        sel = np.flatnonzero(mask)
+        if len(sel) == 0:
+            return
+        next_x, next_y, valid = field.sample(x[sel], y[sel], flee=flee)
+        sel = sel[valid]
+        to_x = next_x[valid] + 0.5 - x[sel]
+        to_y = next_y[valid] + 0.5 - y[sel]
+        length = np.hypot(to_x, to_y)
+        length[length == 0] = 1.0
+        dir_x[sel] = to_x / length
+        dir_y[sel] = to_y / length
+
+    def update(self, player: Player, game_map: GameMap, night: bool,
+               indices: np.ndarray | None = None, index: SpatialHash | None = None,
+               ticks: np.ndarray | None = None, field: FlowField | None = None) -> None:
+        """
+        Update dinosaur states based on the player's position and time of day,
+        then move them: chase the player, flee after an attack, or wander.
 
         Args:
-            game_map (list[list[int]]): The game map grid.
+            player (Player): The player instance.
+            game_map (GameMap): The game map.
+            night (bool): Whether it's currently night time.
+            indices (np.ndarray | None): Subset of dinosaurs to update (default: all).
+            index (SpatialHash | None): Spatial index to keep in sync with moves.
+            ticks (np.ndarray | None): Simulation ticks each update stands for
+                (default: 1). Dinosaurs updated at a reduced rate wander with the
+                combined chance of all skipped ticks and advance their animation
+                by the full elapsed time.
+            field (FlowField | None): Pursuit field towards the player. Chasing
+                and fleeing dinosaurs inside it path around water; elsewhere
+                they move in a straight line.
         """
-        if random.random() < Config.DINOSAUR_RANDOM_MOVE_CHANCE:
-            direction = random.choice([(1, 0), (-1, 0), (0, 1), (0, -1)])
-            nx = self.x + direction[0] * Config.DINOSAUR_SPEED_NORMAL
-            ny = self.y + direction[1] * Config.DINOSAUR_SPEED_NORMAL
-            if is_passable(int(nx), int(ny), game_map, for_dino=True):
-                self.x = nx
-                self.y = ny
-            self.facing_left = (direction[0] < 0)
+        if indices is None:
+            indices = np.arange(self.count)
+        if len(indices) == 0:
+            return
+        if self.rng is None:
+            self.rng = np.random.default_rng(random.getrandbits(64))
+        x = self.x[indices]
+        y = self.y[indices]
+        old_x = x.copy()
+        old_y = y.copy()
+
+        # Unit vector and distance from each dinosaur towards the player
+        to_px = player.x - x
+        to_py = player.y - y
+        dist = np.hypot(to_px, to_py)
+        safe = np.where(dist == 0, 1.0, dist)
+        dir_x = np.where(dist == 0, 0.0, to_px / safe)
+        dir_y = np.where(dist == 0, 0.0, to_py / safe)
+
+        fleeing = self.just_attacked[indices]
+        sight = Config.DINOSAUR_SIGHT_NIGHT if night else Config.DINOSAUR_SIGHT_DAY
+        chasing = ~fleeing & self.aggressive[indices] & (dist <= sight)
+        if player.repellent_active:
+            chasing[:] = False
+        idle = ~fleeing & ~chasing
+
+        state = np.full(len(indices), Dinosaur.IDLE, dtype=np.int8)
+        state[chasing] = Dinosaur.CHASE
+        state[fleeing] = Dinosaur.FLEE
+
+        facing = self.facing_left[indices]
+        step_x = np.zeros(len(indices))
+        step_y = np.zeros(len(indices))
+
+        # Chase: straight towards the player. Flee: straight away from the player.
+        flee_x = -dir_x
+        flee_y = -dir_y
+        if field is not None and (chasing.any() or fleeing.any()):
+            # Inside the flow field, head for the centre of the next tile on the path instead
+            field.update(int(player.x), int(player.y))
+            self._steer(field, x, y, chasing, dir_x, dir_y, flee=False)
+            self._steer(field, x, y, fleeing, flee_x, flee_y, flee=True)
+
+        speed = Config.DINOSAUR_SPEED_AGGRESSIVE
+        step_x[chasing] = dir_x[chasing] * speed
+        step_y[chasing] = dir_y[chasing] * speed
+        step_x[fleeing] = flee_x[fleeing] * speed
+        step_y[fleeing] = flee_y[fleeing] * speed
+        facing[chasing] = dir_x[chasing] < 0
+        facing[fleeing] = flee_x[fleeing] < 0
+
+        # Idle: occasional random step in one of the four directions
+        move_chance = Config.DINOSAUR_RANDOM_MOVE_CHANCE
+        if ticks is not None:
+            move_chance = 1.0 - (1.0 - move_chance) ** ticks
+        wander = idle & (self.rng.random(len(indices)) < move_chance)
+        n_wander = int(np.count_nonzero(wander))
+        if n_wander:
+            steps = _IDLE_STEPS[self.rng.integers(0, 4, n_wander)]
+            step_x[wander] = steps[:, 0] * Config.DINOSAUR_SPEED_NORMAL
+            step_y[wander] = steps[:, 1] * Config.DINOSAUR_SPEED_NORMAL
+            facing[wander] = steps[:, 0] < 0
+
+        moving = chasing | fleeing | wander
+        nx = x + step_x
+        ny = y + step_y
+        ok = moving & game_map.passable_mask(nx.astype(np.intp), ny.astype(np.intp), for_dino=True)
+        x[ok] = nx[ok]
+        y[ok] = ny[ok]
+
+        # Fleeing dinosaurs calm down once they are far enough away
+        calmed = fleeing & (np.hypot(player.x - x, player.y - y) > Config.DINOSAUR_RUNAWAY_DISTANCE)
+        state[calmed] = Dinosaur.IDLE
+        self.just_attacked[indices[calmed]] = False
+
+        self.x[indices] = x
+        self.y[indices] = y
+        self.state[indices] = state
+        self.facing_left[indices] = facing
+
+        # Animation
+        elapsed = (1 if ticks is None else ticks) / Config.SIM_TICK_RATE
+        timer = self.animation_timer[indices] + elapsed
+        advance = timer >= self.animation_interval
+        timer[advance] = 0.0
+        self.animation_timer[indices] = timer
+        frame_counts = self.frame_counts[self.aggressive[indices[advance]].astype(np.intp)]
+        self.frame[indices[advance]] = (self.frame[indices[advance]] + 1) % frame_counts
+
+        if index is not None:
+            cs = index.cell_size
+            crossed = ok & ((old_x.astype(np.intp) // cs != x.astype(np.intp) // cs)
+                            | (old_y.astype(np.intp) // cs != y.astype(np.intp) // cs))
+            for i in indices[crossed].tolist():
+                index.update(self.views[i])
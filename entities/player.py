@@ -1,11 +1,16 @@
 # entities/player.py
 
+from __future__ import annotations
 import pygame
 import logging
 from config import Config
 from entities.base_entity import Entity
-from utils import is_passable, load_frames
+from utils import load_frames
 from sound_manager import sound_manager
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from game_map import GameMap
 
 logger = logging.getLogger(__name__)
 
@@ -32,17 +37,14 @@ class Player(Entity):
 
         # Footstep audio
         self.footstep_sound = sound_manager.sounds["entities"].get("player_move_soft", None)
-        self.footstep_channel = pygame.mixer.Channel(1)
+        self.footstep_channel = pygame.mixer.Channel(1) if pygame.mixer.get_init() else None
         self.is_moving = False
 
-    def move(self, dx: float, dy: float, game_map: list[list[int]]) -> None:
-        nx = self.x + dx
-        ny = self.y + dy
-        if is_passable(int(nx), int(ny), game_map):
-            tile_id = game_map[int(ny)][int(nx)]
-            factor = 1.0
-            if tile_id == 4:  # Mud
-                factor = 0.5
+    def move(self, dx: float, dy: float, game_map: GameMap) -> None:
+        nx = int(self.x + dx)
+        ny = int(self.y + dy)
+        if game_map.is_passable(nx, ny):
+            factor = game_map.speed_factor(nx, ny)
             self.x += dx * factor
             self.y += dy * factor
 
@@ -52,10 +54,11 @@ class Player(Entity):
             self.facing_left = False
 
         if dx != 0 or dy != 0:
-            if not self.is_moving and self.footstep_sound:
+            if not self.is_moving and self.footstep_sound and self.footstep_channel:
                 self.is_moving = True
-                if not self.footstep_channel.get_busy():
-                    self.footstep_channel.play(self.footstep_sound, loops=-1)
+                footstep = self.footstep_sound.get()
+                if footstep and not self.footstep_channel.get_busy():
+                    self.footstep_channel.play(footstep, loops=-1)
         else:
             if self.is_moving:
                 self.is_moving = False
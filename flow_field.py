@@ -0,0 +1,135 @@
+# flow_field.py
+
+from __future__ import annotations
+import math
+import logging
+import numpy as np
+from typing import TYPE_CHECKING
+
+from config import Config
+
+if TYPE_CHECKING:
+    from game_map import GameMap
+
+logger = logging.getLogger(__name__)
+
+# 8-connected moves: (dx, dy, cost)
+_MOVES = ((1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+          (1, 1, math.sqrt(2)), (1, -1, math.sqrt(2)), (-1, 1, math.sqrt(2)), (-1, -1, math.sqrt(2)))
+STEP_X = np.array([m[0] for m in _MOVES], dtype=np.intp)
+STEP_Y = np.array([m[1] for m in _MOVES], dtype=np.intp)
+
+class FlowField:
+    """
+    Shared pursuit field towards a target tile (the player), over the tiles
+    dinosaurs can walk on, limited to a square window of 'radius' tiles
+    around the target.
+
+    Distances are the Dijkstra shortest-path costs on the 8-connected grid
+    (diagonals cost sqrt(2) and may not cut corners), computed by vectorized
+    relaxation. The field is only recomputed, from scratch, when the target
+    crosses into another tile. Every tile stores the move to take when
+    chasing (down the distance gradient) and when fleeing (up it), so
+    dinosaurs sample their next step in O(1).
+    """
+    def __init__(self, game_map: GameMap, radius: int | None = None) -> None:
+        self.game_map = game_map
+        self.radius = Config.FLOW_FIELD_RADIUS if radius is None else radius
+        self.target: tuple[int, int] | None = None
+        self.x0 = self.y0 = 0
+        self.dist = np.zeros((0, 0))
+        self.chase_move = np.zeros((0, 0), dtype=np.int8)
+        self.flee_move = np.zeros((0, 0), dtype=np.int8)
+        self.stats = {"updates": 0, "iterations": 0}
+
+    def reset(self) -> None:
+        """
+        Forget the current field, e.g. after the map under it changed;
+        the next update() computes from scratch.
+        """
+        self.target = None
+        self.x0 = self.y0 = 0
+        self.dist = np.zeros((0, 0))
+        self.chase_move = np.zeros((0, 0), dtype=np.int8)
+        self.flee_move = np.zeros((0, 0), dtype=np.int8)
+
+    def update(self, tx: int, ty: int) -> bool:
+        """
+        Point the field at tile (tx, ty). Returns False (and does nothing)
+        if it already does or the tile is off the map.
+        """
+        if (tx, ty) == self.target or not self.game_map.in_bounds(tx, ty):
+            return False
+
+        r = self.radius
+        x0, y0 = max(0, tx - r), max(0, ty - r)
+        x1 = min(self.game_map.width, tx + r + 1)
+        y1 = min(self.game_map.height, ty + r + 1)
+        h, w = y1 - y0, x1 - x0
+
+        # Walkable tiles with an impassable border, so shifted views never leave the array
+        walkable = np.zeros((h + 2, w + 2), dtype=bool)
+        walkable[1:-1, 1:-1] = self.game_map.dino_passable_table[self.game_map.region(x0, y0, x1, y1)]
+
+        # Per-move cost of stepping from each tile, inf where the move is not allowed
+        move_cost = np.full((len(_MOVES), h, w), np.inf)
+        inner = walkable[1:-1, 1:-1]
+        for k, (dx, dy, cost) in enumerate(_MOVES):
+            allowed = inner & walkable[1 + dy:1 + dy + h, 1 + dx:1 + dx + w]
+            if dx and dy:
+                allowed &= walkable[1:1 + h, 1 + dx:1 + dx + w] & walkable[1 + dy:1 + dy + h, 1:1 + w]
+            move_cost[k][allowed] = cost
+
+        # The window moves with the target, so old paths may leave it: start from scratch
+        dist = np.full((h + 2, w + 2), np.inf)
+        dist[1 + ty - y0, 1 + tx - x0] = 0.0 if inner[ty - y0, tx - x0] else np.inf
+
+        # Relax until nothing changes (Bellman-Ford, one ring of tiles per pass)
+        current = dist[1:-1, 1:-1]
+        best = np.empty((h, w))
+        candidate = np.empty((h, w))
+        iterations = 0
+        while True:
+            iterations += 1
+            np.copyto(best, current)
+            for k, (dx, dy, _) in enumerate(_MOVES):
+                np.add(dist[1 + dy:1 + dy + h, 1 + dx:1 + dx + w], move_cost[k], out=candidate)
+                np.minimum(best, candidate, out=best)
+            if np.array_equal(best, current):
+                break
+            np.copyto(current, best)
+
+        # Next move per tile: steepest descent to chase, steepest ascent to flee
+        neighbour = np.stack([dist[1 + dy:1 + dy + h, 1 + dx:1 + dx + w] for dx, dy, _ in _MOVES])
+        via = neighbour + move_cost
+        chase = via.argmin(axis=0)
+        chase_ok = np.isfinite(current) & (current > 0) & np.isfinite(via.min(axis=0))
+        reachable = np.where(np.isfinite(via), neighbour, -np.inf)
+        flee = reachable.argmax(axis=0)
+        flee_ok = np.isfinite(current) & (reachable.max(axis=0) > current)
+
+        self.dist = current.copy()
+        self.chase_move = np.where(chase_ok, chase, -1).astype(np.int8)
+        self.flee_move = np.where(flee_ok, flee, -1).astype(np.int8)
+        self.x0, self.y0 = x0, y0
+        self.target = (tx, ty)
+        self.stats = {"updates": self.stats["updates"] + 1, "iterations": iterations}
+        return True
+
+    def sample(self, xs: np.ndarray, ys: np.ndarray, flee: bool = False) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Next tile to head for from each position: (next_x, next_y, valid).
+        'valid' is False outside the window, on unreachable tiles and on the
+        target itself; callers fall back to moving in a straight line there.
+        """
+        moves = self.flee_move if flee else self.chase_move
+        tx = xs.astype(np.intp)
+        ty = ys.astype(np.intp)
+        lx = tx - self.x0
+        ly = ty - self.y0
+        h, w = moves.shape
+        inside = (lx >= 0) & (lx < w) & (ly >= 0) & (ly < h)
+        move = np.full(len(xs), -1, dtype=np.intp)
+        move[inside] = moves[ly[inside], lx[inside]]
+        valid = move >= 0
+        return tx + STEP_X[move] * valid, ty + STEP_Y[move] * valid, valid
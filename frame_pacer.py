@@ -0,0 +1,93 @@
+# frame_pacer.py
+
+from __future__ import annotations
+import time
+import logging
+import pygame
+from config import Config
+from state import GameState
+
+logger = logging.getLogger(__name__)
+
+class FramePacer:
+    """
+    Decides how long each pass of the main loop waits and whether it renders.
+
+    - Each state has its own target frame rate (Config.STATE_FPS, else Config.FPS).
+    - When the game is idle (a static screen already on display) the loop
+      blocks in the event queue instead of polling, waking up at least every
+      Config.IDLE_WAKE_MS.
+    - Frames whose work (everything but the wait) exceeds the frame budget
+      are counted as overruns. When rendering plus simulation no longer fit
+      the budget, only every n-th frame is rendered (up to
+      Config.MAX_RENDER_SKIP), so the fixed-rate simulation keeps up; n
+      drops back once there is headroom.
+    """
+    def __init__(self, clock: pygame.time.Clock) -> None:
+        self.clock = clock
+        self.render_interval = 1
+        self.frames_since_render = 0
+        self.work_start = time.perf_counter()
+        self.avg_render = 0.0
+        self.avg_other = 0.0
+        self.budget = 1.0 / Config.FPS
+        self.stats = {"frames": 0, "rendered": 0, "overruns": 0, "idle_waits": 0}
+
+    def target_fps(self, state: GameState) -> int:
+        return Config.STATE_FPS.get(state.name, Config.FPS)
+
+    def wait(self, state: GameState, idle: bool) -> list[pygame.event.Event]:
+        """
+        Sleep until the next frame is due (or, when idle, until an event
+        arrives) and return the pending events.
+        """
+        fps = self.target_fps(state)
+        self.budget = 1.0 / fps
+        if idle:
+            self.stats["idle_waits"] += 1
+            first = pygame.event.wait(Config.IDLE_WAKE_MS)
+            events = [] if first.type == pygame.NOEVENT else [first]
+            events.extend(pygame.event.get())
+            # Don't let the blocked time count as a long frame
+            self.clock.tick()
+        else:
+            self.clock.tick(fps)
+            events = pygame.event.get()
+        self.work_start = time.perf_counter()
+        return events
+
+    def should_render(self, state: GameState) -> bool:
+        # Only gameplay is ever thinned out; screens always show up immediately
+        if state != GameState.PLAYING:
+            self.frames_since_render = 0
+            return True
+        self.frames_since_render += 1
+        if self.frames_since_render >= self.render_interval:
+            self.frames_since_render = 0
+            return True
+        return False
+
+    def end_frame(self, render_time: float | None) -> None:
+        """
+        Account for the frame's work time ('render_time' is the part spent
+        drawing and presenting, None if the frame was not rendered) and
+        pick the render interval for the frames ahead.
+        """
+        work = time.perf_counter() - self.work_start
+        self.stats["frames"] += 1
+        if work > self.budget:
+            self.stats["overruns"] += 1
+        if render_time is not None:
+            self.stats["rendered"] += 1
+            self.avg_render += (render_time - self.avg_render) * 0.1
+            work -= render_time
+        self.avg_other += (work - self.avg_other) * 0.1
+
+        # Expected cost per frame when rendering every n-th frame: other + render / n
+        n = self.render_interval
+        if self.avg_other + self.avg_render / n > self.budget and n < Config.MAX_RENDER_SKIP:
+            self.render_interval = n + 1
+            logger.info(f"Frame budget exceeded; rendering every {self.render_interval} frames.")
+        elif n > 1 and self.avg_other + self.avg_render / (n - 1) < self.budget * 0.8:
+            self.render_interval = n - 1
+            logger.info(f"Load eased; rendering every {self.render_interval} frames.")
@@ -1,8 +1,9 @@
 # game.py
 
+import os
+import time
 import pygame
 import sys
-import time
 import random
 import math
 import logging
@@ -10,17 +11,28 @@ import logging
 from config import Config
 from state import GameState
 from utils import is_night
-from map_gen import generate_island_map
-from entities import Player
+from entities import Player, DinosaurHerd
 from hud import HUD
 from screens import TitleScreen, IntroScreen, HelpScreen, PauseScreen, LoseScreen, WinScreen
 from sound_manager import sound_manager
+from asset_manager import asset_manager
+from profiler import profiler
 
 # Newly imported modules
 import spawn_manager
 import collision_manager
 import boat_manager
 import input_manager
+from terrain_cache import TerrainChunkCache
+from spatial_hash import SpatialHash
+from ai_scheduler import AIScheduler
+from flow_field import FlowField
+from lava import LavaGrid
+from game_clock import GameClock
+from frame_pacer import FramePacer
+from world_builder import WorldBuilder, PreparedWorld
+from save_manager import BackgroundSaver
+from input_manager import InputRecorder
 
 logger = logging.getLogger(__name__)
 
@@ -37,16 +49,35 @@ class Game:
     """
     The main game class, now primarily an orchestrator that delegates tasks.
     """
-    def __init__(self) -> None:
-        pygame.init()
-        self.window = pygame.display.set_mode((Config.WINDOW_WIDTH, Config.WINDOW_HEIGHT))
-        pygame.display.set_caption("Flucht von der Dinosaurier Insel")
+    def __init__(self, headless: bool = False) -> None:
+        self.headless = headless
+        if headless:
+            # No window and no mixer: a hidden 1x1 display only so sprites can be
+            # converted, and an off-screen surface in place of the window
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+            pygame.display.init()
+            pygame.font.init()
+            pygame.display.set_mode((1, 1))
+            self.window = pygame.Surface((Config.WINDOW_WIDTH, Config.WINDOW_HEIGHT))
+        else:
+            pygame.init()
+            self.window = pygame.display.set_mode((Config.WINDOW_WIDTH, Config.WINDOW_HEIGHT))
+            pygame.display.set_caption("Flucht von der Dinosaurier Insel")
+        # Decode sounds in the background while the world is being built
+        sound_manager.prefetch()
         self.clock = pygame.time.Clock()
+        self.pacer = FramePacer(self.clock)
+        self.game_clock = GameClock()
         self.font = pygame.font.SysFont("Arial", 20)
 
         self.state = GameState.MAIN_MENU
         self.running = True
 
+        # Input: scripted input replaces keyboard/joystick when set
+        self.joystick_handler = joystick_handler
+        self.input_source = None
+        self.input_recorder = InputRecorder() if Config.INPUT_RECORD_PATH else None
+
         # Screens
         self.title_screen = TitleScreen(self.window)
         self.intro_screen = IntroScreen(self.window)
@@ -54,47 +85,74 @@ class Game:
         self.pause_screen = PauseScreen(self.window)
         self.lose_screen = LoseScreen(self.window)
         self.win_screen = WinScreen(self.window)
+        self.screens = {
+            GameState.MAIN_MENU: self.title_screen,
+            GameState.INTRO: self.intro_screen,
+            GameState.HELP: self.help_screen,
+            GameState.PAUSE: self.pause_screen,
+            GameState.GAME_OVER: self.lose_screen,
+            GameState.WON: self.win_screen,
+        }
+        # (screen, composed surface) currently on display, to skip redrawing it
+        self.presented_screen = None
+
+        # The next world is prepared in the background; headless runs build synchronously
+        self.world_builder = WorldBuilder()
+        self.prebuild_worlds = Config.WORLD_PREBUILD_ENABLED and not headless
+
+        # Quicksaves and autosaves are written off the main thread; headless
+        # runs never autosave, so they cannot overwrite the player's autosave
+        self.saver = BackgroundSaver()
+        self.autosave = Config.AUTOSAVE_ENABLED and not headless
 
         self.hud = None
         self.reset_game()
         sound_manager.play("actions", "game_start")
 
-    def reset_game(self) -> None:
+    def reset_game(self, world: PreparedWorld | None = None) -> None:
         """
         Reset game state: generate map, create Player, spawn items/dinosaurs,
-        and set up boat frames, etc.
+        and set up boat frames, etc. A given 'world' (e.g. from a saved game)
+        is used instead of the next one from the world builder.
         """
         logger.info("Resetting game state...")
-        self.game_map = generate_island_map()
-        cx = Config.MAP_WIDTH // 2
-        cy = Config.MAP_HEIGHT // 2
-
-        self.player = Player(cx, cy)
+        # Map and spawn positions come ready-made from the world builder
+        if world is None:
+            world = self.world_builder.take()
+        random.setstate(world.rng_state)
+        self.game_map = world.game_map
+        self.streamer = world.streamer
+        self.terrain_cache = TerrainChunkCache(self.game_map)
+
+        self.player = Player(*world.start)
         self.hud = HUD(self.player, self)
-        self.items = []
-        self.dinosaurs = []
+        # Insertion-ordered set (values unused), so pickups remove in O(1)
+        self.items = {}
+        self.dinosaurs = DinosaurHerd()
+        self.item_index = SpatialHash()
+        self.dino_index = SpatialHash()
+        self.flow_field = FlowField(self.game_map) if Config.FLOW_FIELD_ENABLED else None
+        self.ai_scheduler = AIScheduler(self.dinosaurs, self.dino_index, self.flow_field)
 
         # Spawn items, dinosaurs
-        spawn_manager.spawn_items(self, count=6)
-        spawn_manager.spawn_dinosaurs(
-            self,
-            n_normal=Config.DINOSAUR_COUNT_NORMAL,
-            n_aggressive=Config.DINOSAUR_COUNT_AGGRESSIVE
-        )
+        spawn_manager.place_items(self, world.items)
+        spawn_manager.place_dinosaurs(self, world.dinosaurs)
 
         # Boat
         self.boat_active = False
         self.boat_x = None
         self.boat_y = None
+        self.boat_site = None
         self.boat_frames = boat_manager.create_boat_frames()
         self.boat_current_frame = 0
         self.boat_animation_timer = 0.0
         self.boat_animation_interval = 0.3
+        logger.info(f"Asset registry: {asset_manager.stats()}")
 
         # Lava
-        self.lava_fields = []
-        self.last_lava_time = time.time()
-        self.start_time = time.time()
+        self.lava = LavaGrid(self.game_map.width, self.game_map.height)
+        self.game_clock.reset()
+        self.last_lava_time = 0.0
 
         # Camera
         self.camx = self.player.x
@@ -104,67 +162,110 @@ class Game:
         # Start background music
         sound_manager.play_music()
 
+        # Prepare the next world while this one is played or the menus are up
+        if self.prebuild_worlds:
+            self.world_builder.start()
+
     def run(self) -> None:
         """
         Main game loop: handle events, update, draw.
         """
         try:
             while self.running:
-                dt = self.clock.tick(Config.FPS) / 1000.0
-                events = pygame.event.get()
-
-                for event in events:
-                    if event.type == pygame.QUIT:
-                        self.running = False
-                    # Delegate event logic to input_manager
-                    input_manager.handle_state_event(self, event)
-
-                # Joystick
-                if Config.ENABLE_JOYSTICK and joystick_handler:
-                    joystick_actions = joystick_handler.process_events(events)
-                    for action in joystick_actions:
-                        if action == 'activate_repellent':
-                            if self.player.inventory.get("repellent", 0) > 0:
-                                self.player.trigger_repellent()
-                                self.hud.trigger_flash((0, 0, 255), 100, 0.2)
-
-                if self.state == GameState.PLAYING:
-                    self.update_playing(dt)
-
-                self.draw()
-                pygame.display.flip()
+                events = self.pacer.wait(self.state, idle=self.is_idle())
+                profiler.begin_frame()
+
+                with profiler.section("events"):
+                    for event in events:
+                        if event.type == pygame.QUIT:
+                            self.running = False
+                        elif event.type == pygame.VIDEOEXPOSE:
+                            # The window contents were lost; present everything again
+                            self.presented_screen = None
+                        # Delegate event logic to input_manager
+                        input_manager.handle_state_event(self, event)
+
+                    # Joystick
+                    if Config.ENABLE_JOYSTICK and joystick_handler:
+                        joystick_actions = joystick_handler.process_events(events)
+                        for action in joystick_actions:
+                            if action == 'activate_repellent':
+                                input_manager.use_repellent(self)
+
+                with profiler.section("update"):
+                    if self.state == GameState.PLAYING:
+                        for _ in range(self.game_clock.advance()):
+                            self.tick()
+                            if self.state != GameState.PLAYING:
+                                break
+                    else:
+                        self.game_clock.hold()
+
+                # Under load the pacer skips some renders; the simulation above still runs
+                render_time = None
+                if self.pacer.should_render(self.state):
+                    render_start = time.perf_counter()
+                    with profiler.section("draw"):
+                        dirty = self.draw()
+                    # The overlay itself is not part of the measured frame
+                    if profiler.enabled:
+                        profiler.draw(self.window)
+                        self.presented_screen = None
+                        dirty = None
+
+                    with profiler.section("flip"):
+                        self.present(dirty)
+                    render_time = time.perf_counter() - render_start
+                self.pacer.end_frame(render_time)
+                profiler.end_frame()
 
         except Exception as e:
             logger.error(f"Caught exception in main loop: {e}")
         finally:
+            self.saver.wait()
+            if self.input_recorder is not None:
+                self.input_recorder.save(Config.INPUT_RECORD_PATH)
             if joystick_handler:
                 joystick_handler.quit()
             pygame.quit()
             sys.exit()
 
-    def update_playing(self, dt: float) -> None:
+    def is_idle(self) -> bool:
         """
-        Update logic for the PLAYING state.
+        True when a static screen is on display and nothing will change until input arrives.
         """
-        # Movement
-        keys = pygame.key.get_pressed()
-        dx = (keys[pygame.K_RIGHT] or keys[pygame.K_d]) - (keys[pygame.K_LEFT] or keys[pygame.K_a])
-        dy = (keys[pygame.K_DOWN] or keys[pygame.K_s]) - (keys[pygame.K_UP] or keys[pygame.K_w])
+        screen = self.screens.get(self.state)
+        return (screen is not None and not profiler.enabled
+                and self.presented_screen == (screen, screen.composed))
 
-        if Config.ENABLE_JOYSTICK and joystick_handler:
-            jdx, jdy = joystick_handler.get_movement()
-            dx += jdx
-            dy += jdy
+    def tick(self) -> None:
+        """
+        Advance the simulation by one fixed step of the game clock.
+        """
+        self.game_clock.step()
+        self.update_playing(self.game_clock.dt)
 
-        dx *= Config.PLAYER_SPEED
-        dy *= Config.PLAYER_SPEED
-        self.player.move(dx, dy, self.game_map)
-        self.player.update(dt)
-        self.hud.update(dt)
+    def update_playing(self, dt: float) -> None:
+        """
+        Update logic for the PLAYING state, for one simulation tick of length dt.
+        """
+        # Remember where things were for render interpolation
+        self.player.prev_x, self.player.prev_y = self.player.x, self.player.y
+        self.dinosaurs.snapshot_positions()
+
+        # Movement
+        with profiler.section("update.player"):
+            dx, dy = input_manager.read_movement(self)
+            dx *= Config.PLAYER_SPEED
+            dy *= Config.PLAYER_SPEED
+            self.player.move(dx, dy, self.game_map)
+            self.player.update(dt)
+            self.hud.update(dt)
+            if self.streamer is not None:
+                self.streamer.follow(self)
 
         # Day/Night
-        now = time.time()
-        current_time = now - self.start_time
+        current_time = self.game_clock.sim_time
         night = is_night(current_time)
         if self.old_night_state is None:
             self.old_night_state = night
@@ -172,23 +273,33 @@ class Game:
             if night != self.old_night_state:
                 self.old_night_state = night
 
-        # Lava check
-        if now - self.last_lava_time > Config.LAVA_INTERVAL:
-            self.lava_fields = spawn_manager.spawn_lava(self)
-            self.last_lava_time = now
+        # Lava: cool down old fields, erupt new ones
+        with profiler.section("update.lava"):
+            self.lava.update(current_time)
+            if current_time - self.last_lava_time > Config.LAVA_INTERVAL:
+                spawn_manager.spawn_lava(self)
+                self.last_lava_time = current_time
 
         # Update dinos
-        for dino in self.dinosaurs:
-            dino.update(self.player, self.game_map, night)
+        with profiler.section("update.dinosaurs"):
+            if Config.AI_LOD_ENABLED:
+                self.ai_scheduler.update(self.player, self.game_map, night)
+            else:
+                self.dinosaurs.update(self.player, self.game_map, night, index=self.dino_index,
+                                      field=self.flow_field)
 
         # Collision checks
-        collision_manager.check_collisions(self)
+        with profiler.section("update.collisions"):
+            collision_manager.check_collisions(self)
 
         # Camera
         self.camx = self.player.x
         self.camy = self.player.y
 
-        # Boat arrival
+        # Boat arrival; the landing site is chosen a little earlier
+        arrival_time = Config.BOAT_ARRIVAL_CYCLES * Config.CYCLE_LENGTH
+        if self.boat_site is None and current_time >= arrival_time - Config.BOAT_SITE_LEAD:
+            boat_manager.plan_boat(self)
         cycles_passed = int(current_time // Config.CYCLE_LENGTH)
         if (cycles_passed >= Config.BOAT_ARRIVAL_CYCLES) and not self.boat_active:
             self.boat_active = True
@@ -211,55 +322,80 @@ class Game:
                 self.boat_animation_timer = 0.0
                 self.boat_current_frame = (self.boat_current_frame + 1) % len(self.boat_frames)
 
-    def draw(self) -> None:
+        if self.autosave and self.state == GameState.PLAYING:
+            self.saver.update(self)
+
+    def draw(self) -> list[pygame.Rect] | None:
         """
         Main draw method, calls draw_{map,entities,etc.}
+
+        Returns the window areas that changed: None for the whole window,
+        an empty list when a static screen is already on display.
         """
+        screen = self.screens.get(self.state)
+        if screen is not None:
+            composed = screen.get_surface()
+            if self.presented_screen == (screen, composed):
+                return []
+            screen.draw()
+            self.presented_screen = (screen, composed)
+            return [self.window.get_rect()]
+
+        self.presented_screen = None
         self.window.fill((30, 30, 30))
-        if self.state == GameState.MAIN_MENU:
-            self.title_screen.draw()
-        elif self.state == GameState.INTRO:
-            self.intro_screen.draw()
-        elif self.state == GameState.HELP:
-            self.help_screen.draw()
-        elif self.state == GameState.PAUSE:
-            self.pause_screen.draw()
-        elif self.state == GameState.GAME_OVER:
-            self.lose_screen.draw()
-        elif self.state == GameState.WON:
-            self.win_screen.draw()
-        elif self.state == GameState.PLAYING:
+        if self.state == GameState.PLAYING:
             self.draw_playing()
+        return None
+
+    def present(self, rects: list[pygame.Rect] | None) -> None:
+        """
+        Push the changed areas of the window to the display.
+        """
+        if rects is None:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
 
     def draw_playing(self) -> None:
-        self.draw_map()
-        self.draw_entities()
+        # Interpolate between the last two simulation ticks
+        alpha = self.game_clock.alpha
+        self.camx, self.camy = self.player.interpolated(alpha)
+
+        with profiler.section("draw.map"):
+            self.draw_map()
+        with profiler.section("draw.entities"):
+            self.draw_entities()
         self.hud.draw(self.window)
 
         # Night overlay
-        now = time.time()
-        if is_night(now - self.start_time):
-            overlay = pygame.Surface((Config.WINDOW_WIDTH, Config.WINDOW_HEIGHT), pygame.SRCALPHA)
-            overlay.fill(Config.NIGHT_OVERLAY)
-            self.window.blit(overlay, (0, 0))
+        if is_night(self.game_clock.sim_time):
+            with profiler.section("draw.night"):
+                self.window.blit(self.hud.overlay(Config.NIGHT_OVERLAY, self.window.get_size()), (0, 0))
 
-    def draw_map(self) -> None:
+    def visible_tile_range(self) -> tuple[int, int, int, int]:
+        """
+        Return (start_x, start_y, end_x, end_y) of the tiles around the camera
+        that can appear on screen, clipped to the map.
+        """
         tile_cols = Config.WINDOW_WIDTH // Config.TILE_SIZE
         tile_rows = Config.WINDOW_HEIGHT // Config.TILE_SIZE
 
         start_x = max(0, int(self.camx) - tile_cols // 2 - 1)
-        end_x = min(Config.MAP_WIDTH, int(self.camx) + tile_cols // 2 + 2)
+        end_x = min(self.game_map.width, int(self.camx) + tile_cols // 2 + 2)
         start_y = max(0, int(self.camy) - tile_rows // 2 - 1)
-        end_y = min(Config.MAP_HEIGHT, int(self.camy) + tile_rows // 2 + 2)
-
-        for ty in range(start_y, end_y):
-            for tx in range(start_x, end_x):
-                tile_id = self.game_map[ty][tx]
-                c = Config.BIOMES[tile_id]["color"]
-                if (tx, ty) in self.lava_fields:
-                    c = (255, 0, 0)  # Lava
+        end_y = min(self.game_map.height, int(self.camy) + tile_rows // 2 + 2)
+        return start_x, start_y, end_x, end_y
+
+    def draw_map(self) -> None:
+        start_x, start_y, end_x, end_y = self.visible_tile_range()
+        self.terrain_cache.draw(self.window, start_x, start_y, end_x, end_y, self.world_to_screen)
+
+        # Lava
+        if len(self.lava):
+            xs, ys = self.lava.region(start_x, start_y, end_x, end_y)
+            for tx, ty in zip(xs.tolist(), ys.tolist()):
                 sx, sy = self.world_to_screen(tx, ty)
-                pygame.draw.rect(self.window, c, (sx, sy, Config.TILE_SIZE, Config.TILE_SIZE))
+                self.window.fill((255, 0, 0), (sx, sy, Config.TILE_SIZE, Config.TILE_SIZE))
 
         # Boat
         if self.boat_active and self.boat_x is not None:
@@ -269,17 +405,22 @@ class Game:
                 self.window.blit(self.boat_frames[self.boat_current_frame], (sx, sy))
 
     def draw_entities(self) -> None:
+        alpha = self.game_clock.alpha
+
         # Player
-        sx, sy = self.world_to_screen(self.player.x, self.player.y)
+        sx, sy = self.world_to_screen(*self.player.interpolated(alpha))
         self.window.blit(self.player.get_current_frame(), (sx, sy))
 
+        # Only entities near the camera can be visible
+        start_x, start_y, end_x, end_y = self.visible_tile_range()
+
         # Dinosaurs
-        for dino in self.dinosaurs:
-            dsx, dsy = self.world_to_screen(dino.x, dino.y)
+        for dino in self.dino_index.query_rect(start_x, start_y, end_x, end_y):
+            dsx, dsy = self.world_to_screen(*dino.interpolated(alpha))
             self.window.blit(dino.get_current_frame(), (dsx, dsy))
 
         # Items
-        for it in self.items:
+        for it in self.item_index.query_rect(start_x, start_y, end_x, end_y):
             isx, isy = self.world_to_screen(it.x, it.y)
             self.window.blit(it.get_current_frame(), (isx, isy))
 
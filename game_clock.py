@@ -0,0 +1,89 @@
+# game_clock.py
+
+from __future__ import annotations
+import time
+import logging
+from typing import Callable
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class ManualTimeSource:
+    """
+    Time source that only moves when told to; for headless runs and replays.
+    """
+    def __init__(self, start: float = 0.0) -> None:
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+class GameClock:
+    """
+    Fixed-timestep simulation clock decoupled from rendering.
+
+    Each frame, advance() reports how many fixed ticks of length 'dt' are
+    due according to the time source. Slow frames run several ticks
+    (skipping renders) up to 'max_ticks_per_frame'; anything beyond that is
+    dropped so the game slows down instead of spiralling. 'alpha' is the
+    fraction of a tick left over, used to interpolate rendering.
+    """
+    def __init__(self, tick_rate: float | None = None,
+                 time_source: Callable[[], float] = time.perf_counter,
+                 max_ticks_per_frame: int | None = None) -> None:
+        # Settings not given come from Config at construction time
+        tick_rate = Config.SIM_TICK_RATE if tick_rate is None else tick_rate
+        if max_ticks_per_frame is None:
+            max_ticks_per_frame = Config.MAX_TICKS_PER_FRAME
+        self.dt = 1.0 / tick_rate
+        self.time_source = time_source
+        self.max_ticks_per_frame = max_ticks_per_frame
+        self.time_scale = 1.0
+        self.reset()
+
+    def reset(self) -> None:
+        self.sim_time = 0.0
+        self.ticks = 0
+        self.accumulator = 0.0
+        self.dropped_ticks = 0
+        self.last_time = None
+
+    def hold(self) -> None:
+        """
+        Keep simulation time still (menus, pause) without building up a backlog.
+        """
+        self.last_time = self.time_source()
+        self.accumulator = 0.0
+
+    def advance(self) -> int:
+        """
+        Return the number of simulation ticks to run this frame.
+        """
+        now = self.time_source()
+        if self.last_time is None:
+            self.last_time = now
+        self.accumulator += (now - self.last_time) * self.time_scale
+        self.last_time = now
+
+        # The small epsilon keeps float rounding from deferring a tick to the next frame
+        due = int(self.accumulator / self.dt + 1e-9)
+        if due > self.max_ticks_per_frame:
+            self.dropped_ticks += due - self.max_ticks_per_frame
+            self.accumulator -= (due - self.max_ticks_per_frame) * self.dt
+            due = self.max_ticks_per_frame
+        self.accumulator -= due * self.dt
+        return due
+
+    def step(self) -> None:
+        """
+        Account for one simulated tick.
+        """
+        self.ticks += 1
+        self.sim_time = self.ticks * self.dt
+
+    @property
+    def alpha(self) -> float:
+        return min(1.0, max(0.0, self.accumulator / self.dt))
@@ -0,0 +1,160 @@
+# game_map.py
+
+from __future__ import annotations
+import random
+import logging
+import numpy as np
+from config import Config
+from map_gen import build_map_indexes
+
+logger = logging.getLogger(__name__)
+
+class GameMap:
+    """
+    Island tile grid backed by a contiguous uint8 buffer, with per-tile
+    attribute tables (passability, speed factor, contact damage, color)
+    built once from Config.BIOMES.
+    """
+    def __init__(self, tiles: np.ndarray, indexes: dict[str, np.ndarray] | None = None) -> None:
+        if tiles.dtype != np.uint8 or not tiles.flags.c_contiguous:
+            tiles = np.ascontiguousarray(tiles, dtype=np.uint8)
+        self.tiles = tiles
+        self.height, self.width = tiles.shape
+        # Plain memoryview indexing returns Python ints, which keeps scalar queries cheap
+        self._cells = memoryview(tiles.reshape(-1))
+
+        self.passable_table = np.zeros(256, dtype=bool)
+        self.dino_passable_table = np.zeros(256, dtype=bool)
+        self.speed_table = np.ones(256, dtype=np.float32)
+        self.damage_table = np.zeros(256, dtype=np.int32)
+        self.color_table = np.zeros((256, 3), dtype=np.uint8)
+        for tile, biome in Config.BIOMES.items():
+            self.passable_table[tile] = biome["passable"]
+            self.dino_passable_table[tile] = biome.get("dino_passable", biome["passable"])
+            self.speed_table[tile] = biome.get("speed", 1.0)
+            self.damage_table[tile] = biome.get("damage", 0)
+            self.color_table[tile] = biome["color"]
+        if not Config.SPIKES_ENABLED:
+            self.damage_table[:] = 0
+
+        self._passable = tuple(self.passable_table.tolist())
+        self._dino_passable = tuple(self.dino_passable_table.tolist())
+        self._speed = tuple(self.speed_table.tolist())
+        self._damage = tuple(self.damage_table.tolist())
+        self.colors = tuple(tuple(c) for c in self.color_table.tolist())
+
+        self.set_indexes(indexes)
+
+    def set_indexes(self, indexes: dict[str, np.ndarray] | None = None) -> None:
+        """
+        Install the derived lookup arrays (coast, passable tiles), rebuilding
+        them from the tiles if not given, e.g. after the tiles were rewritten.
+        """
+        if indexes is None:
+            indexes = build_map_indexes(self.tiles)
+        self.coast = indexes["coast"]
+        self.passable_tiles = indexes["passable"]
+        self.dino_passable_tiles = indexes["passable_dino"]
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def tile_at(self, x: int, y: int) -> int:
+        """
+        Tile id at (x, y). The caller is responsible for bounds checking.
+        """
+        return self._cells[y * self.width + x]
+
+    def is_passable(self, x: int, y: int, for_dino: bool = False) -> bool:
+        if x < 0 or x >= self.width or y < 0 or y >= self.height:
+            return False
+        tile = self._cells[y * self.width + x]
+        return self._dino_passable[tile] if for_dino else self._passable[tile]
+
+    def speed_factor(self, x: int, y: int) -> float:
+        return self._speed[self._cells[y * self.width + x]]
+
+    def contact_damage(self, x: int, y: int) -> int:
+        if x < 0 or x >= self.width or y < 0 or y >= self.height:
+            return 0
+        return self._damage[self._cells[y * self.width + x]]
+
+    def tiles_at(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """
+        Tile ids for arrays of in-bounds integer coordinates.
+        """
+        return self.tiles[ys, xs]
+
+    def passable_mask(self, xs: np.ndarray, ys: np.ndarray, for_dino: bool = False) -> np.ndarray:
+        """
+        Vectorized is_passable() for arrays of integer coordinates.
+        Out-of-bounds coordinates are reported as impassable.
+        """
+        xs = np.asarray(xs, dtype=np.intp)
+        ys = np.asarray(ys, dtype=np.intp)
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        table = self.dino_passable_table if for_dino else self.passable_table
+        result = np.zeros(xs.shape, dtype=bool)
+        result[inside] = table[self.tiles[ys[inside], xs[inside]]]
+        return result
+
+    def region(self, x0: int, y0: int, x1: int, y1: int) -> np.ndarray:
+        """
+        View of the tiles in [x0, x1) x [y0, y1), clipped to the map.
+        """
+        x0, y0 = max(0, x0), max(0, y0)
+        x1, y1 = min(self.width, x1), min(self.height, y1)
+        return self.tiles[y0:max(y0, y1), x0:max(x0, x1)]
+
+    def region_colors(self, x0: int, y0: int, x1: int, y1: int) -> np.ndarray:
+        """
+        RGB colors (rows, cols, 3) of the tiles in [x0, x1) x [y0, y1), clipped to the map.
+        """
+        return self.color_table[self.region(x0, y0, x1, y1)]
+
+    def sample_tiles(self, n: int, for_dino: bool = False,
+                     rect: tuple[int, int, int, int] | None = None,
+                     rng: np.random.Generator | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Draw exactly 'n' passable tiles uniformly at random (with replacement)
+        from the precomputed passable-tile index, optionally restricted to
+        rect = (x0, y0, x1, y1), half-open and clipped to the map.
+
+        The index is sorted row-major, so each row of the rect is a contiguous
+        run of it found by binary search; draws are spread over the runs by
+        their lengths. Cost is O(rows + n log rows) regardless of map size.
+        Raises ValueError if there is no candidate tile.
+        """
+        indices = self.dino_passable_tiles if for_dino else self.passable_tiles
+        if rng is None:
+            # Seeded from the global random module so Config.SEED keeps spawns reproducible
+            rng = np.random.default_rng(random.getrandbits(64))
+
+        if rect is None:
+            if n and not len(indices):
+                raise ValueError("The map has no passable tile.")
+            return self.index_to_xy(indices[rng.integers(0, len(indices), n)])
+
+        x0, y0, x1, y1 = rect
+        x0, y0 = max(0, x0), max(0, y0)
+        x1, y1 = min(self.width, x1), min(self.height, y1)
+        if n == 0:
+            return np.zeros(0, dtype=indices.dtype), np.zeros(0, dtype=indices.dtype)
+        rows = np.arange(y0, max(y0, y1)) * self.width
+        starts = np.searchsorted(indices, rows + x0)
+        counts = np.searchsorted(indices, rows + max(x0, x1)) - starts
+        total = int(counts.sum())
+        if total == 0:
+            raise ValueError(f"No passable tile in {(x0, y0, x1, y1)}.")
+        ranks = rng.integers(0, total, n)
+        ends = np.cumsum(counts)
+        row = np.searchsorted(ends, ranks, side="right")
+        picked = indices[starts[row] + ranks - (ends[row] - counts[row])]
+        return self.index_to_xy(picked)
+
+    def index_to_xy(self, index: int | np.ndarray) -> tuple:
+        """
+        Convert flat (y * width + x) tile indices, as used by the
+        precomputed indexes, to (x, y).
+        """
+        return index % self.width, index // self.width
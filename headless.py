@@ -0,0 +1,119 @@
+# headless.py
+
+"""
+Run the full game simulation without a window or audio, as fast as possible.
+
+    python headless.py --ticks 20000 --dinos 5000
+    python headless.py --script recorded_input.json --json
+
+Movement comes from a scripted or recorded input file (see
+input_manager.ScriptedInput) or, by default, a seeded random walk.
+Reports simulation ticks per second.
+"""
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import sys
+import json
+import time
+import logging
+import argparse
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Headless dinosaur island simulation.")
+    parser.add_argument("--ticks", type=int, default=10000, help="Simulation ticks to run.")
+    parser.add_argument("--script", help="JSON input script or recording to play back.")
+    parser.add_argument("--seed", type=int, help="Override Config.SEED.")
+    parser.add_argument("--dinos", type=int, help="Total dinosaurs (split normal/aggressive like the config).")
+    parser.add_argument("--map-size", type=int, help="Square map size in tiles.")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    parser.add_argument("--verbose", action="store_true", help="Show game log output.")
+    return parser.parse_args(argv)
+
+def apply_overrides(args: argparse.Namespace) -> None:
+    Config.AUDIO_ENABLED = False
+    if args.seed is not None:
+        Config.SEED = args.seed
+    if args.map_size is not None:
+        Config.MAP_WIDTH = Config.MAP_HEIGHT = args.map_size
+    if args.dinos is not None:
+        total = Config.DINOSAUR_COUNT_NORMAL + Config.DINOSAUR_COUNT_AGGRESSIVE
+        aggressive = round(args.dinos * Config.DINOSAUR_COUNT_AGGRESSIVE / total)
+        Config.DINOSAUR_COUNT_AGGRESSIVE = aggressive
+        Config.DINOSAUR_COUNT_NORMAL = args.dinos - aggressive
+
+def run(args: argparse.Namespace) -> dict:
+    """
+    Build the game headless, advance it tick by tick and return a report.
+    When a run ends (won or lost) the world is reset and the run continues;
+    reset time is excluded from the tick rate.
+    """
+    apply_overrides(args)
+    # Imported after the overrides: the sound manager reads Config on import
+    from game import Game
+    from state import GameState
+    from input_manager import ScriptedInput
+
+    start = time.perf_counter()
+    game = Game(headless=True)
+    startup = time.perf_counter() - start
+
+    if args.script:
+        game.input_source = ScriptedInput.from_file(args.script)
+    else:
+        game.input_source = ScriptedInput.random_walk(args.ticks, seed=Config.SEED)
+    game.state = GameState.PLAYING
+
+    runs = {"won": 0, "lost": 0}
+    sim_seconds = 0.0
+    resets = 0.0
+    start = time.perf_counter()
+    for _ in range(args.ticks):
+        game.tick()
+        if game.state != GameState.PLAYING:
+            runs["won" if game.state == GameState.WON else "lost"] += 1
+            sim_seconds += game.game_clock.sim_time
+            reset_start = time.perf_counter()
+            game.reset_game()
+            game.state = GameState.PLAYING
+            resets += time.perf_counter() - reset_start
+    elapsed = time.perf_counter() - start - resets
+    sim_seconds += game.game_clock.sim_time
+
+    return {
+        "ticks": args.ticks,
+        "seconds": round(elapsed, 4),
+        "ticks_per_second": round(args.ticks / elapsed, 1) if elapsed > 0 else None,
+        "realtime_factor": round(sim_seconds / elapsed, 1) if elapsed > 0 else None,
+        "startup_seconds": round(startup, 4),
+        "dinosaurs": len(game.dinosaurs),
+        "map_size": [game.game_map.width, game.game_map.height],
+        "runs_won": runs["won"],
+        "runs_lost": runs["lost"],
+        "player_hp": game.player.hp,
+        "player_score": game.player.score,
+    }
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="[%(asctime)s] %(levelname)s in %(module)s: %(message)s"
+    )
+    report = run(args)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{report['ticks']} ticks in {report['seconds']:.2f}s: "
+              f"{report['ticks_per_second']} ticks/s ({report['realtime_factor']}x realtime), "
+              f"{report['dinosaurs']} dinosaurs, startup {report['startup_seconds']:.2f}s")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
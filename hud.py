@@ -3,9 +3,13 @@
 from __future__ import annotations
 import pygame
 import logging
+import numpy as np
 from config import Config
 from entities import Player
-from typing import TYPE_CHECKING
+from asset_manager import asset_manager
+from profiler import profiler
+from text_cache import text_cache
+from typing import TYPE_CHECKING, Any, Callable
 
 if TYPE_CHECKING:
     from game import Game
@@ -15,6 +19,11 @@ logger = logging.getLogger(__name__)
 class HUD:
     """
     Renders in-game HUD elements: health bar, score, inventory, etc.
+
+    Retained mode: each widget is rendered to its own surface and only
+    re-rendered when the value it shows changes; text goes through the
+    shared text cache and full-window overlays are allocated once per
+    window size.
     """
     def __init__(self, player: Player, game: Game) -> None:
         self.player = player
@@ -27,109 +36,221 @@ class HUD:
         self.screen_flash = None
         self.flash_timer = 0.0
 
-        # Load small item icons
+        # Retained widgets: (value they show, rendered surface)
+        self.widgets: dict[str, tuple[object, pygame.Surface]] = {}
+        self.overlays: dict[tuple[tuple[int, int], tuple[int, int, int, int]], pygame.Surface] = {}
+
+        # Minimap: terrain is baked once, lava and markers are layered on top
+        self.minimap_size = (200, 150)
+        self.minimap_position = (Config.WINDOW_WIDTH - self.minimap_size[0] - 10, 10)
+        self.minimap_terrain = None
+        self.minimap_static = None
+        self.minimap_frame = None
+        self.minimap_timer = 0.0
+
+        # Small item icons
         self.item_sprites = {}
         for item_type in ["potion", "repellent"]:
             path = Config.get_sprite_path("items", item_type)
-            if path:
-                try:
-                    sprite = pygame.image.load(path).convert_alpha()
-                    sprite = pygame.transform.scale(sprite, (32, 32))
-                    self.item_sprites[item_type] = sprite
-                except pygame.error as e:
-                    logger.warning(f"Could not load HUD sprite '{item_type}' from '{path}': {e}")
-                    self.item_sprites[item_type] = None
-            else:
-                self.item_sprites[item_type] = None
+            self.item_sprites[item_type] = asset_manager.get_image(path, (32, 32)) if path else None
 
     def update(self, dt: float) -> None:
+        self.minimap_timer -= dt
+        if self.minimap_timer <= 0:
+            self.minimap_timer = Config.MINIMAP_MARKER_INTERVAL
+            self.minimap_frame = None
         if self.screen_flash:
             self.flash_timer -= dt
             if self.flash_timer <= 0:
                 self.screen_flash = None
 
     def draw(self, surface: pygame.Surface) -> None:
-        self.draw_health_bar(surface)
-        self.draw_score(surface)
-        self.draw_inventory(surface)
-        self.draw_status_effects(surface)
-        self.draw_flash(surface)
-        self.draw_minimap()
+        with profiler.section("draw.hud"):
+            self.draw_health_bar(surface)
+            self.draw_score(surface)
+            self.draw_inventory(surface)
+            self.draw_status_effects(surface)
+            self.draw_flash(surface)
+        with profiler.section("draw.minimap"):
+            self.draw_minimap()
+
+    def _widget(self, name: str, value: object,
+                render: Callable[[Any], pygame.Surface]) -> pygame.Surface:
+        """
+        Return the cached surface of widget 'name', re-rendering it with
+        render(value) only when 'value' changed since the last frame.
+        """
+        cached = self.widgets.get(name)
+        if cached is not None and cached[0] == value:
+            return cached[1]
+        widget = render(value)
+        self.widgets[name] = (value, widget)
+        return widget
+
+    def overlay(self, rgba: tuple[int, int, int, int], size: tuple[int, int] | None = None) -> pygame.Surface:
+        """
+        A shared full-window surface of one translucent color, created once per size and color.
+        """
+        size = size or (Config.WINDOW_WIDTH, Config.WINDOW_HEIGHT)
+        key = (size, tuple(rgba))
+        overlay = self.overlays.get(key)
+        if overlay is None:
+            # Uniform alpha blits faster as surface alpha than as per-pixel alpha
+            overlay = pygame.Surface(size)
+            overlay.fill(rgba[:3])
+            overlay.set_alpha(rgba[3])
+            self.overlays[key] = overlay
+        return overlay
+
+    def _render_health_bar(self, hp: int) -> pygame.Surface:
+        w, h = self.health_bar_size
+        widget = pygame.Surface((w, h + 25), pygame.SRCALPHA)
+        widget.blit(text_cache.render(self.font, f"HP: {hp}/{Config.PLAYER_MAX_HP}", (255, 255, 255)), (0, 0))
+        pygame.draw.rect(widget, (255, 0, 0), (0, 25, w, h))
+        ratio = max(0, min(1, hp / Config.PLAYER_MAX_HP))
+        pygame.draw.rect(widget, (0, 255, 0), (0, 25, w * ratio, h))
+        return widget
 
     def draw_health_bar(self, surface: pygame.Surface) -> None:
-        pygame.draw.rect(surface, (255, 0, 0), (*self.health_bar_position, *self.health_bar_size))
-        ratio = max(0, min(1, self.player.hp / Config.PLAYER_MAX_HP))
-        green_width = self.health_bar_size[0] * ratio
-        pygame.draw.rect(surface, (0, 255, 0),
-                         (self.health_bar_position[0], self.health_bar_position[1],
-                          green_width, self.health_bar_size[1]))
-        text = self.font.render(f"HP: {self.player.hp}/{Config.PLAYER_MAX_HP}", True, (255, 255, 255))
-        surface.blit(text, (self.health_bar_position[0], self.health_bar_position[1] - 25))
+        position = (self.health_bar_position[0], self.health_bar_position[1] - 25)
+        surface.blit(self._widget("health", self.player.hp, self._render_health_bar), position)
 
     def draw_score(self, surface: pygame.Surface) -> None:
-        score_txt = self.font.render(f"Score: {self.player.score}", True, (255, 255, 255))
+        score_txt = self._widget("score", self.player.score,
+                                 lambda score: text_cache.render(self.font, f"Score: {score}", (255, 255, 255)))
         surface.blit(score_txt, self.score_position)
 
-    def draw_inventory(self, surface: pygame.Surface) -> None:
-        x, y = self.inventory_position
-        for item_type, sprite in self.item_sprites.items():
+    def _render_inventory(self, counts: tuple[int, ...]) -> pygame.Surface:
+        widget = pygame.Surface((150, 50 * len(self.item_sprites)), pygame.SRCALPHA)
+        y = 0
+        for sprite, count in zip(self.item_sprites.values(), counts):
             if sprite:
-                surface.blit(sprite, (x, y))
-            count = self.player.inventory.get(item_type, 0)
-            count_txt = self.font.render(f"x{count}", True, (255, 255, 255))
-            surface.blit(count_txt, (x + 40, y + 5))
+                widget.blit(sprite, (0, y))
+            widget.blit(text_cache.render(self.font, f"x{count}", (255, 255, 255)), (40, y + 5))
             y += 50
+        return widget
+
+    def draw_inventory(self, surface: pygame.Surface) -> None:
+        counts = tuple(self.player.inventory.get(item_type, 0) for item_type in self.item_sprites)
+        surface.blit(self._widget("inventory", counts, self._render_inventory),
+                     self.inventory_position)
 
     def draw_status_effects(self, surface: pygame.Surface) -> None:
         if self.player.repellent_active:
-            player_screen_pos = self.game.world_to_screen(self.player.x, self.player.y)
+            # Interpolated like the player sprite, so the circle stays on it between ticks
+            alpha = self.game.game_clock.alpha
+            player_screen_pos = self.game.world_to_screen(*self.player.interpolated(alpha))
             pygame.draw.circle(surface, (0, 0, 255), player_screen_pos, 50, 5)
 
     def draw_flash(self, surface: pygame.Surface) -> None:
         if self.screen_flash:
             color, alpha, _ = self.screen_flash
-            overlay = pygame.Surface((Config.WINDOW_WIDTH, Config.WINDOW_HEIGHT), pygame.SRCALPHA)
-            overlay.fill((*color, alpha))
-            surface.blit(overlay, (0, 0))
+            surface.blit(self.overlay((*color, alpha), surface.get_size()), (0, 0))
 
     def trigger_flash(self, color: tuple[int, int, int], alpha: int, duration: float) -> None:
         self.screen_flash = (color, alpha, duration)
         self.flash_timer = duration
 
-    def draw_minimap(self) -> None:
-        mw, mh = 200, 150
-        mmx, mmy = Config.WINDOW_WIDTH - mw - 10, 10
-        pygame.draw.rect(self.game.window, (50, 50, 50), (mmx, mmy, mw, mh))
-
-        mapw, maph = Config.MAP_WIDTH, Config.MAP_HEIGHT
-        for my in range(mh):
-            row = int(my / mh * maph)
-            for mx in range(mw):
-                col = int(mx / mw * mapw)
-                tile = self.game.game_map[row][col]
-                c = Config.BIOMES[tile]["color"]
-                if (col, row) in self.game.lava_fields:
-                    c = (255, 0, 0)
-                self.game.window.set_at((mmx + mx, mmy + my), c)
-
-        # Draw player
+    def invalidate_minimap(self) -> None:
+        """
+        Force the minimap terrain to be re-baked, e.g. after the terrain changed.
+        """
+        self.minimap_terrain = None
+
+    def _minimap_samples(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Map tile (rows, cols) sampled by each minimap pixel row/column.
+        """
+        game_map = self.game.game_map
+        mw, mh = self.minimap_size
+        rows = (np.arange(mh) / mh * game_map.height).astype(np.intp)
+        cols = (np.arange(mw) / mw * game_map.width).astype(np.intp)
+        return rows, cols
+
+    def _bake_minimap_terrain(self) -> None:
+        rows, cols = self._minimap_samples()
+        colors = self.game.game_map.color_table[self.game.game_map.tiles[np.ix_(rows, cols)]]
+        self.minimap_terrain = pygame.surfarray.make_surface(colors.transpose(1, 0, 2))
+        self.minimap_static = None
+
+    def _bake_minimap_static(self) -> None:
+        """
+        Terrain plus all current lava.
+        """
+        self.game.lava.take_dirty()
+        surf = self.minimap_terrain.copy()
+        if len(self.game.lava):
+            rows, cols = self._minimap_samples()
+            mask = self.game.lava.grid[np.ix_(rows, cols)]
+            if mask.any():
+                pixels = pygame.surfarray.pixels3d(surf)
+                pixels[mask.T] = (255, 0, 0)
+                del pixels
+        self.minimap_static = surf
+        self.minimap_frame = None
+
+    def _patch_minimap_lava(self, dirty: list[int]) -> None:
+        """
+        Repaint only the minimap pixels that sample tiles whose lava changed.
+        """
+        game_map = self.game.game_map
+        rows, cols = self._minimap_samples()
+        dirty = np.asarray(dirty, dtype=np.int64)
+        xs, ys = game_map.index_to_xy(dirty)
+        # Sample rows/cols are sorted, so each tile maps to a (possibly empty) pixel range
+        c0, c1 = np.searchsorted(cols, xs, "left"), np.searchsorted(cols, xs, "right")
+        r0, r1 = np.searchsorted(rows, ys, "left"), np.searchsorted(rows, ys, "right")
+        hit = np.flatnonzero((c1 > c0) & (r1 > r0))
+        if len(hit) == 0:
+            return
+        pixels = pygame.surfarray.pixels3d(self.minimap_static)
+        for i in hit.tolist():
+            x, y = int(xs[i]), int(ys[i])
+            color = (255, 0, 0) if self.game.lava.is_lava(x, y) else game_map.colors[game_map.tile_at(x, y)]
+            pixels[c0[i]:c1[i], r0[i]:r1[i]] = color
+        del pixels
+        self.minimap_frame = None
+
+    def _draw_minimap_markers(self) -> None:
+        """
+        Stamp 3x3 player and dinosaur markers onto a copy of the static layer.
+        """
+        game_map = self.game.game_map
+        mw, mh = self.minimap_size
+        mapw, maph = game_map.width, game_map.height
+        frame = self.minimap_static.copy()
+
         px = int(self.player.x / mapw * mw)
         py = int(self.player.y / maph * mh)
-        for dy in range(-1, 2):
-            for dx in range(-1, 2):
-                fx = mmx + px + dx
-                fy = mmy + py + dy
-                if 0 <= fx < mmx + mw and 0 <= fy < mmy + mh:
-                    self.game.window.set_at((fx, fy), (0, 0, 255))
-
-        # Draw dinosaurs
-        for dino in self.game.dinosaurs:
-            dx = int(dino.x / mapw * mw)
-            dy = int(dino.y / maph * mh)
-            color = (255, 0, 0) if dino.aggressive else (0, 255, 0)
+        frame.fill((0, 0, 255), (px - 1, py - 1, 3, 3))
+
+        herd = self.game.dinosaurs
+        n = len(herd)
+        if n:
+            dx = (herd.x[:n] / mapw * mw).astype(np.intp)
+            dy = (herd.y[:n] / maph * mh).astype(np.intp)
+            colors = np.where(herd.aggressive[:n, np.newaxis], (255, 0, 0), (0, 255, 0))
+            pixels = pygame.surfarray.pixels3d(frame)
             for ddy in range(-1, 2):
                 for ddx in range(-1, 2):
-                    fx = mmx + dx + ddx
-                    fy = mmy + dy + ddy
-                    if 0 <= fx < mmx + mw and 0 <= fy < mmy + mh:
-                        self.game.window.set_at((fx, fy), color)
+                    fx = dx + ddx
+                    fy = dy + ddy
+                    inside = (fx >= 0) & (fx < mw) & (fy >= 0) & (fy < mh)
+                    pixels[fx[inside], fy[inside]] = colors[inside]
+            del pixels
+        self.minimap_frame = frame
+
+    def draw_minimap(self) -> None:
+        if self.minimap_terrain is None:
+            self._bake_minimap_terrain()
+        if self.minimap_static is None:
+            self._bake_minimap_static()
+        else:
+            dirty = self.game.lava.take_dirty()
+            if dirty is None:
+                self._bake_minimap_static()
+            elif dirty:
+                self._patch_minimap_lava(dirty)
+        if self.minimap_frame is None:
+            self._draw_minimap_markers()
+        self.game.window.blit(self.minimap_frame, self.minimap_position)
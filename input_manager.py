@@ -1,12 +1,16 @@
 # input_manager.py
 
 from __future__ import annotations  # Enables postponed evaluation of annotations
+import json
+import random
 import pygame
 import logging
 from state import GameState
 from typing import TYPE_CHECKING
 
 from config import Config  # Import Config to use in type annotations and logic
+from profiler import profiler
+import save_manager
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +25,15 @@ def handle_state_event(game: Game, event: pygame.event.Event) -> None:
         game (Game): The main game instance.
         event (pygame.event.Event): The event to handle.
     """
+    # Profiler keys work in every state
+    if event.type == pygame.KEYDOWN:
+        if event.key == pygame.K_F3:
+            profiler.toggle()
+            return
+        if event.key == pygame.K_F4:
+            profiler.export_csv(Config.PROFILER_CSV_PATH)
+            return
+
     if game.state == GameState.MAIN_MENU:
         game.title_screen.handle_event(event, game)
         if event.type == pygame.KEYDOWN:
@@ -31,6 +44,13 @@ def handle_state_event(game: Game, event: pygame.event.Event) -> None:
             elif event.key == pygame.K_h:
                 game.state = GameState.HELP
                 logger.info("Transitioned to HELP state from MAIN_MENU.")
+            elif event.key == pygame.K_l:
+                path = save_manager.latest_save()
+                if path is None:
+                    logger.info("No saved game to load.")
+                elif save_manager.load_game(game, path):
+                    game.state = GameState.PLAYING
+                    logger.info("Resumed saved game from MAIN_MENU.")
             elif event.key == pygame.K_q:
                 game.running = False
                 logger.info("Exiting game from MAIN_MENU.")
@@ -81,19 +101,153 @@ def handle_events_playing(game: Game, event: pygame.event.Event) -> None:
             game.state = GameState.PAUSE
             logger.info("Paused game from PLAYING state.")
         elif event.key == pygame.K_SPACE:
-            if game.player.inventory.get("repellent", 0) > 0:
-                game.player.trigger_repellent()
-                game.hud.trigger_flash((0, 0, 255), 100, 0.2)
-                logger.info("Player activated repellent using SPACE key.")
-            else:
-                logger.info("Player attempted to activate repellent but none are available.")
+            use_repellent(game)
         elif event.key in [pygame.K_e, pygame.K_RSHIFT]:
-            if game.player.inventory.get("potion", 0) > 0 and game.player.hp < Config.PLAYER_MAX_HP:
-                game.player.use_potion()
-                game.hud.trigger_flash((0, 255, 0), 100, 0.2)
-                logger.info("Player used potion with key press.")
-            else:
-                if game.player.inventory.get("potion", 0) <= 0:
-                    logger.info("Player attempted to use potion but none are available.")
-                if game.player.hp >= Config.PLAYER_MAX_HP:
-                    logger.info("Player attempted to use potion but HP is already full.")
+            use_potion(game)
+        elif event.key == pygame.K_F5:
+            quicksave(game)
+
+def quicksave(game: Game) -> None:
+    """
+    Save the running game in the background.
+    """
+    if game.saver.save(game, save_manager.save_path("quicksave")):
+        game.hud.trigger_flash((255, 255, 255), 60, 0.1)
+    else:
+        logger.info("Still writing the previous save; quicksave skipped.")
+
+def use_repellent(game: Game) -> None:
+    """
+    Activate a repellent if the player has one.
+    """
+    if game.input_recorder is not None:
+        game.input_recorder.record_action("repellent")
+    if game.player.inventory.get("repellent", 0) > 0:
+        game.player.trigger_repellent()
+        game.hud.trigger_flash((0, 0, 255), 100, 0.2)
+        logger.info("Player activated repellent.")
+    else:
+        logger.info("Player attempted to activate repellent but none are available.")
+
+def use_potion(game: Game) -> None:
+    """
+    Drink a potion if the player has one and is not at full health.
+    """
+    if game.input_recorder is not None:
+        game.input_recorder.record_action("potion")
+    if game.player.inventory.get("potion", 0) > 0 and game.player.hp < Config.PLAYER_MAX_HP:
+        game.player.use_potion()
+        game.hud.trigger_flash((0, 255, 0), 100, 0.2)
+        logger.info("Player used potion.")
+    else:
+        if game.player.inventory.get("potion", 0) <= 0:
+            logger.info("Player attempted to use potion but none are available.")
+        if game.player.hp >= Config.PLAYER_MAX_HP:
+            logger.info("Player attempted to use potion but HP is already full.")
+
+ACTIONS = {
+    "repellent": use_repellent,
+    "potion": use_potion,
+}
+
+def read_movement(game: Game) -> tuple[int, int]:
+    """
+    Movement direction for this tick: scripted input if the game has one,
+    otherwise keyboard (WASD / arrows) plus joystick.
+    """
+    if game.input_source is not None:
+        dx, dy = game.input_source.next_tick(game)
+    else:
+        keys = pygame.key.get_pressed()
+        dx = (keys[pygame.K_RIGHT] or keys[pygame.K_d]) - (keys[pygame.K_LEFT] or keys[pygame.K_a])
+        dy = (keys[pygame.K_DOWN] or keys[pygame.K_s]) - (keys[pygame.K_UP] or keys[pygame.K_w])
+        if game.joystick_handler:
+            jdx, jdy = game.joystick_handler.get_movement()
+            dx += jdx
+            dy += jdy
+    if game.input_recorder is not None:
+        game.input_recorder.record_tick(dx, dy)
+    return dx, dy
+
+class ScriptedInput:
+    """
+    Plays back movement and actions tick by tick, for headless runs.
+
+    A script is a list of steps like {"ticks": 30, "move": [1, 0], "actions": ["potion"]};
+    the actions fire on the first tick of their step. When 'loop' is set the
+    script starts over at the end, otherwise the player stands still.
+    """
+    def __init__(self, steps: list[dict], loop: bool = True) -> None:
+        self.steps = steps
+        self.loop = loop
+        self.step_index = 0
+        self.ticks_left = steps[0].get("ticks", 1) if steps else 0
+        self.first_tick = True
+
+    @classmethod
+    def from_file(cls, path: str, loop: bool = True) -> ScriptedInput:
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f), loop=loop)
+
+    @classmethod
+    def random_walk(cls, ticks: int, seed: int | None = None, step_ticks: int = 15) -> ScriptedInput:
+        """
+        A script that wanders in random directions and uses items now and then.
+        """
+        rng = random.Random(seed)
+        steps = []
+        for _ in range(max(1, ticks // step_ticks)):
+            step = {"ticks": step_ticks, "move": [rng.choice((-1, 0, 1)), rng.choice((-1, 0, 1))]}
+            if rng.random() < 0.05:
+                step["actions"] = [rng.choice(list(ACTIONS))]
+            steps.append(step)
+        return cls(steps)
+
+    def next_tick(self, game: Game) -> tuple[int, int]:
+        if not self.steps:
+            return 0, 0
+        while self.ticks_left <= 0:
+            self.step_index += 1
+            if self.step_index >= len(self.steps):
+                if not self.loop:
+                    return 0, 0
+                self.step_index = 0
+            self.ticks_left = self.steps[self.step_index].get("ticks", 1)
+            self.first_tick = True
+
+        step = self.steps[self.step_index]
+        if self.first_tick:
+            self.first_tick = False
+            for action in step.get("actions", ()):
+                ACTIONS[action](game)
+        self.ticks_left -= 1
+        dx, dy = step.get("move", (0, 0))
+        return dx, dy
+
+class InputRecorder:
+    """
+    Records live input per tick in the ScriptedInput format, run-length encoded.
+    """
+    def __init__(self) -> None:
+        self.steps: list[dict] = []
+        self.pending_actions: list[str] = []
+
+    def record_action(self, action: str) -> None:
+        self.pending_actions.append(action)
+
+    def record_tick(self, dx: int, dy: int) -> None:
+        move = [int(dx), int(dy)]
+        last = self.steps[-1] if self.steps else None
+        if last is not None and last["move"] == move and not self.pending_actions:
+            last["ticks"] += 1
+            return
+        step = {"ticks": 1, "move": move}
+        if self.pending_actions:
+            step["actions"] = self.pending_actions
+            self.pending_actions = []
+        self.steps.append(step)
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.steps, f)
+        logger.info(f"Recorded {sum(step['ticks'] for step in self.steps)} input ticks to '{path}'.")
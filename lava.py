@@ -0,0 +1,141 @@
+# lava.py
+
+from __future__ import annotations
+import heapq
+import logging
+import numpy as np
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class LavaGrid:
+    """
+    Active lava tiles with timed expiry.
+
+    A boolean grid the size of the map answers "is there lava here" in O(1)
+    (and for whole regions at once), a dict holds each active tile's expiry
+    time and a heap orders expiries, so update() only touches tiles that
+    actually expire. Every tile that appears or disappears is recorded in
+    a dirty list for render caches to patch just those tiles.
+    """
+    # Past this many pending dirty tiles, consumers are told to rebuild instead
+    MAX_DIRTY = 4096
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.grid = np.zeros((height, width), dtype=bool)
+        self.expiry: dict[int, float] = {}
+        self._heap: list[tuple[float, int]] = []
+        self.dirty: list[int] = []
+        self.dirty_overflow = False
+
+    def __len__(self) -> int:
+        return len(self.expiry)
+
+    def __contains__(self, pos: tuple[int, int]) -> bool:
+        return self.is_lava(*pos)
+
+    def is_lava(self, x: int, y: int) -> bool:
+        if x < 0 or x >= self.width or y < 0 or y >= self.height:
+            return False
+        return bool(self.grid[y, x])
+
+    def add(self, xs: np.ndarray, ys: np.ndarray, now: float,
+            duration: float | None = None) -> None:
+        """
+        Put lava on the given tiles until 'now + duration' (default:
+        Config.LAVA_DURATION). Tiles that are already lava have their
+        expiry extended.
+        """
+        if duration is None:
+            duration = Config.LAVA_DURATION
+        until = now + duration
+        flats = (np.asarray(ys, dtype=np.int64) * self.width + np.asarray(xs, dtype=np.int64)).tolist()
+        for flat in flats:
+            if flat not in self.expiry:
+                self._mark_dirty(flat)
+            self.expiry[flat] = until
+            heapq.heappush(self._heap, (until, flat))
+        self.grid.reshape(-1)[flats] = True
+
+    def update(self, now: float) -> int:
+        """
+        Remove lava whose time is up; returns how many tiles expired.
+        """
+        heap = self._heap
+        expired = 0
+        while heap and heap[0][0] <= now:
+            until, flat = heapq.heappop(heap)
+            # Skip heap entries superseded by a later add() on the same tile
+            if self.expiry.get(flat) != until:
+                continue
+            del self.expiry[flat]
+            self.grid.reshape(-1)[flat] = False
+            self._mark_dirty(flat)
+            expired += 1
+        return expired
+
+    def clear(self) -> None:
+        for flat in self.expiry:
+            self._mark_dirty(flat)
+        self.grid[:] = False
+        self.expiry.clear()
+        self._heap.clear()
+
+    def shift(self, dx: int, dy: int) -> None:
+        """
+        Move all lava by (-dx, -dy) tiles, dropping what leaves the grid,
+        for when the map under it scrolls by (dx, dy). Consumers of the
+        dirty list are told to rebuild.
+        """
+        w, h = self.width, self.height
+        kept = {}
+        for flat, until in self.expiry.items():
+            x, y = flat % w - dx, flat // w - dy
+            if 0 <= x < w and 0 <= y < h:
+                kept[y * w + x] = until
+        self.grid[:] = False
+        self.grid.reshape(-1)[list(kept)] = True
+        self.expiry = kept
+        self._heap = [(until, flat) for flat, until in kept.items()]
+        heapq.heapify(self._heap)
+        self.dirty.clear()
+        self.dirty_overflow = True
+
+    def region(self, x0: int, y0: int, x1: int, y1: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        (xs, ys) of the lava tiles in [x0, x1) x [y0, y1).
+        """
+        x0, y0 = max(0, x0), max(0, y0)
+        ys, xs = np.nonzero(self.grid[y0:max(y0, y1), x0:max(x0, x1)])
+        return xs + x0, ys + y0
+
+    def active(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Flat (y * width + x) indices of all lava tiles and their expiry times.
+        """
+        flats = np.fromiter(self.expiry.keys(), dtype=np.int64, count=len(self.expiry))
+        times = np.fromiter(self.expiry.values(), dtype=np.float64, count=len(self.expiry))
+        return flats, times
+
+    def _mark_dirty(self, flat: int) -> None:
+        if self.dirty_overflow:
+            return
+        if len(self.dirty) >= self.MAX_DIRTY:
+            self.dirty.clear()
+            self.dirty_overflow = True
+            return
+        self.dirty.append(flat)
+
+    def take_dirty(self) -> list[int] | None:
+        """
+        Flat indices of tiles that changed since the last call, or None if
+        too many changed to track and the caller should rebuild everything.
+        """
+        if self.dirty_overflow:
+            self.dirty_overflow = False
+            return None
+        dirty = self.dirty
+        self.dirty = []
+        return dirty
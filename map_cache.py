@@ -0,0 +1,168 @@
+# map_cache.py
+
+from __future__ import annotations
+
+import os
+import json
+import random
+import struct
+import hashlib
+import logging
+import threading
+import numpy as np
+from config import Config
+from map_gen import generate_island_tiles, build_map_indexes, uses_tiled_generation
+
+logger = logging.getLogger(__name__)
+
+CACHE_MAGIC = b"DINOMAP\0"
+CACHE_VERSION = 1
+
+# magic, version, width, height, section count
+_HEADER = struct.Struct("<8sIIII")
+# name, dtype string, byte offset, element count
+_SECTION = struct.Struct("<16s4sQQ")
+_ALIGN = 64
+
+def cache_key() -> str:
+    """
+    Build a digest of every setting that influences the generated island.
+    """
+    params = {
+        "version": CACHE_VERSION,
+        "seed": Config.SEED,
+        "width": Config.MAP_WIDTH,
+        "height": Config.MAP_HEIGHT,
+        "roughness": Config.MAP_ROUGHNESS,
+        "thresholds": [list(pair) for pair in Config.MAP_BIOME_THRESHOLDS],
+        "mud": Config.MAP_MUD_FRACTION,
+        "spikes": Config.MAP_SPIKE_FRACTION if Config.SPIKES_ENABLED else 0,
+        "legacy_rng": Config.MAP_LEGACY_RNG,
+        "passable": [(Config.BIOMES[tile]["passable"], Config.BIOMES[tile].get("dino_passable"))
+                     for tile in sorted(Config.BIOMES)],
+    }
+    if uses_tiled_generation(Config.MAP_WIDTH, Config.MAP_HEIGHT):
+        params["tile_size"] = Config.MAP_TILE_SIZE
+    blob = json.dumps(params, sort_keys=True).encode("utf-8")
+    return hashlib.sha1(blob).hexdigest()
+
+def cache_path() -> str:
+    return os.path.join(
+        Config.MAP_CACHE_DIR,
+        f"island_{Config.SEED}_{Config.MAP_WIDTH}x{Config.MAP_HEIGHT}_{cache_key()[:16]}.bin"
+    )
+
+def write_sections(path: str, width: int, height: int, sections: dict[str, np.ndarray],
+                   magic: bytes = CACHE_MAGIC, version: int = CACHE_VERSION) -> None:
+    """
+    Write named arrays into a single binary file with a small section table,
+    so each array can later be memory-mapped in place. The file is written
+    to a temporary name first and then moved over 'path'.
+    """
+    table_size = _HEADER.size + _SECTION.size * len(sections)
+    offset = -(-table_size // _ALIGN) * _ALIGN
+    entries = []
+    for name, arr in sections.items():
+        arr = np.ascontiguousarray(arr)
+        entries.append((name, arr, offset))
+        offset += -(-arr.nbytes // _ALIGN) * _ALIGN
+
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(magic, version, width, height, len(sections)))
+        for name, arr, start in entries:
+            f.write(_SECTION.pack(name.encode("ascii"), arr.dtype.str.encode("ascii"), start, arr.size))
+        for _, arr, start in entries:
+            f.seek(start)
+            arr.tofile(f)
+    os.replace(tmp_path, path)
+
+def read_sections(path: str, magic: bytes = CACHE_MAGIC,
+                  version: int = CACHE_VERSION) -> tuple[int, int, dict[str, np.ndarray]]:
+    """
+    Memory-map every section of a file written by write_sections().
+    Returns (width, height, {name: read-only array}).
+    Raises ValueError if the file is not a valid file of that magic and version.
+    """
+    file_size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        header = f.read(_HEADER.size)
+        if len(header) != _HEADER.size:
+            raise ValueError("truncated header")
+        file_magic, file_version, width, height, count = _HEADER.unpack(header)
+        if file_magic != magic or file_version != version:
+            raise ValueError(f"unsupported file (version {file_version})")
+        table = f.read(_SECTION.size * count)
+        if len(table) != _SECTION.size * count:
+            raise ValueError("truncated section table")
+
+    sections = {}
+    for i in range(count):
+        name, dtype, offset, size = _SECTION.unpack_from(table, i * _SECTION.size)
+        dtype = np.dtype(dtype.rstrip(b"\0").decode("ascii"))
+        if offset + size * dtype.itemsize > file_size:
+            raise ValueError("truncated section data")
+        name = name.rstrip(b"\0").decode("ascii")
+        if size == 0:
+            sections[name] = np.zeros(0, dtype=dtype)
+        else:
+            sections[name] = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(size,))
+    return width, height, sections
+
+def pack_rng_state(rand: random.Random) -> np.ndarray:
+    _, state, _ = rand.getstate()
+    return np.array(state, dtype=np.uint32)
+
+def unpack_rng_state(state: np.ndarray, rand: random.Random) -> None:
+    rand.setstate((3, tuple(int(v) for v in state), None))
+
+def load_island(rand: random.Random | None = None) -> tuple[np.ndarray, dict[str, np.ndarray]] | None:
+    """
+    Load the cached island for the current settings, or None on a cache miss.
+    The state of 'rand' (default: the global 'random' module) is restored to
+    what it was right after the island was generated, so spawning afterwards
+    is identical to a cold start.
+    """
+    path = cache_path()
+    if not os.path.exists(path):
+        return None
+    try:
+        width, height, sections = read_sections(path)
+        tiles = sections.pop("tiles").reshape(height, width)
+        rng_state = sections.pop("rng_state")
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Ignoring unreadable map cache '{path}': {e}")
+        return None
+    unpack_rng_state(rng_state, random if rand is None else rand)
+    logger.info(f"Loaded island from cache '{path}'.")
+    return tiles, sections
+
+def store_island(tiles: np.ndarray, indexes: dict[str, np.ndarray],
+                 rand: random.Random | None = None) -> None:
+    path = cache_path()
+    try:
+        os.makedirs(Config.MAP_CACHE_DIR, exist_ok=True)
+        sections = {"tiles": tiles.reshape(-1), "rng_state": pack_rng_state(random if rand is None else rand), **indexes}
+        write_sections(path, tiles.shape[1], tiles.shape[0], sections)
+        logger.info(f"Stored island in cache '{path}'.")
+    except OSError as e:
+        logger.warning(f"Could not write map cache '{path}': {e}")
+
+def get_island(rand: random.Random | None = None) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+    """
+    Return (tiles, indexes) for the current settings, generating and caching
+    the island on a miss. 'indexes' holds the derived lookup arrays from
+    map_gen.build_map_indexes(). Random seeds (Config.SEED = None) bypass the cache.
+    'rand' is the random stream the island is drawn from (see generate_island_tiles).
+    """
+    use_cache = Config.MAP_CACHE_ENABLED and Config.SEED is not None
+    if use_cache:
+        cached = load_island(rand)
+        if cached is not None:
+            return cached
+
+    tiles = generate_island_tiles(rand)
+    indexes = build_map_indexes(tiles)
+    if use_cache:
+        store_island(tiles, indexes, rand)
+    return tiles, indexes
@@ -1,132 +1,581 @@
 # map_gen.py
 
+from __future__ import annotations
+
+import os
 import random
-import math
 import logging
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 from config import Config
 
 logger = logging.getLogger(__name__)
 
-def diamond_square(size: int, roughness: float = 0.45) -> list[list[float]]:
+BEACH_TILE = 2
+WATER_TILE = 3
+MUD_TILE = 4
+SPIKES_TILE = 5
+
+def _legacy_draw(rand: random.Random, count: int) -> np.ndarray:
+    """
+    Draw 'count' floats from 'rand', in call order.
+    This keeps the exact random stream of the original pure-Python generator.
+    """
+    draw = rand.random
+    return np.fromiter((draw() for _ in range(count)), dtype=np.float64, count=count)
+
+def _displacement(r: np.ndarray, roughness: float, step: int) -> np.ndarray:
+    """
+    Turn uniform draws into the random offset (r - 0.5) * roughness * step, in place.
+    """
+    r -= 0.5
+    r *= roughness
+    r *= step
+    return r
+
+def diamond_square(size: int, roughness: float = 0.45,
+                   rng: np.random.Generator | None = None,
+                   rand: random.Random | None = None) -> np.ndarray:
     """
     Generate a 2D fractal heightmap using the Diamond-Square algorithm.
-    Returns a 2D list of floats (0.0 - 1.0).
+    Each diamond/square pass is done with whole-array operations.
+    Returns a (size, size) float array normalized to 0.0 - 1.0.
+
+    Without 'rng' the random numbers are taken from 'rand' (default: the
+    global 'random' module) in the same order as the original nested-loop
+    implementation, so a seeded run reproduces the old heightmap bit for bit.
+    With 'rng' the grid is computed in float32, which halves memory traffic
+    on large maps.
     """
-    arr = [[0.0 for _ in range(size)] for __ in range(size)]
-    arr[0][0] = random.random()
-    arr[0][size - 1] = random.random()
-    arr[size - 1][0] = random.random()
-    arr[size - 1][size - 1] = random.random()
+    if rng is None:
+        legacy = random if rand is None else rand
+        draw = lambda count: _legacy_draw(legacy, count)
+        dtype = np.float64
+    else:
+        draw = lambda count: rng.random(count, dtype=np.float32)
+        dtype = np.float32
+    arr = np.zeros((size, size), dtype=dtype)
+    corners = draw(4)
+    arr[0, 0] = corners[0]
+    arr[0, size - 1] = corners[1]
+    arr[size - 1, 0] = corners[2]
+    arr[size - 1, size - 1] = corners[3]
 
     step = size - 1
     while step > 1:
         half = step // 2
-        # Diamond step
-        for y in range(0, size - 1, step):
-            for x in range(0, size - 1, step):
-                c1 = arr[y][x]
-                c2 = arr[y][x + step]
-                c3 = arr[y + step][x]
-                c4 = arr[y + step][x + step]
-                mid = (c1 + c2 + c3 + c4) / 4.0
-                mid += (random.random() - 0.5) * roughness * step
-                arr[y + half][x + half] = mid
-
-        # Square step
-        for y in range(0, size, half):
-            for x in range((y + half) % step, size, step):
-                pts = []
-                if y - half >= 0:
-                    pts.append(arr[y - half][x])
-                if y + half < size:
-                    pts.append(arr[y + half][x])
-                if x - half >= 0:
-                    pts.append(arr[y][x - half])
-                if x + half < size:
-                    pts.append(arr[y][x + half])
-                if pts:
-                    m = sum(pts) / len(pts)
-                    m += (random.random() - 0.5) * roughness * step
-                    arr[y][x] = m
+        n = (size - 1) // step
+
+        # Diamond step: centers of every step x step square
+        mid = arr[0:size - 1:step, 0:size - 1:step] + arr[0:size - 1:step, step::step]
+        mid += arr[step::step, 0:size - 1:step]
+        mid += arr[step::step, step::step]
+        mid /= 4.0
+        mid += _displacement(draw(n * n).reshape(n, n), roughness, step)
+        arr[half::step, half::step] = mid
+
+        # Square step. The original loop visits rows y = 0, half, step, ...
+        # alternating between n points (y on the corner grid) and n + 1 points
+        # (y on the center grid); split the draws the same way.
+        r = draw(2 * n * (n + 1))
+        pairs = r[:-n].reshape(n, 2 * n + 1)
+        r_edge = np.concatenate((pairs[:, :n], r[-n:].reshape(1, n)))
+        r_center = pairs[:, n:]
+        centers = arr[half::step, half::step]
+
+        # Points on corner rows: neighbours above/below are diamond centers.
+        # Missing neighbours on the border contribute 0 to the sum, as before.
+        m = np.empty((n + 1, n), dtype=dtype)
+        m[0] = 0.0
+        m[1:] = centers
+        m[:-1] += centers
+        m += arr[0::step, 0:size - 1:step]
+        m += arr[0::step, step::step]
+        count = np.full((n + 1, 1), 4.0, dtype=dtype)
+        count[0] = count[-1] = 3.0
+        m /= count
+        m += _displacement(r_edge, roughness, step)
+        arr[0::step, half::step] = m
+
+        # Points on center rows: neighbours left/right are diamond centers
+        m = arr[0:size - 1:step, 0::step] + arr[step::step, 0::step]
+        m[:, 1:] += centers
+        m[:, :-1] += centers
+        count = np.full((1, n + 1), 4.0, dtype=dtype)
+        count[0, 0] = count[0, -1] = 3.0
+        m /= count
+        m += _displacement(r_center, roughness, step)
+        arr[half::step, 0::step] = m
 
         step //= 2
         roughness *= 0.7
 
     # Normalize
-    mn = min(min(r) for r in arr)
-    mx = max(max(r) for r in arr)
-    rng = mx - mn
-    if rng < 1e-7:
-        return [[0.5]*size for _ in range(size)]
-    for yy in range(size):
-        for xx in range(size):
-            arr[yy][xx] = (arr[yy][xx] - mn) / rng
-
+    mn = arr.min()
+    mx = arr.max()
+    span = mx - mn
+    if span < 1e-7:
+        return np.full((size, size), 0.5, dtype=dtype)
+    arr -= mn
+    arr /= span
     return arr
 
-def generate_island_map() -> list[list[int]]:
+def apply_radial_fade(heights: np.ndarray, ds: int, x0: int = 0, y0: int = 0) -> None:
+    """
+    Fade heights towards the edges of the (ds x ds) diamond-square grid,
+    in place, so the land forms an island around its center.
+    'heights' may be a window of the grid starting at (x0, y0).
+    """
+    h, w = heights.shape
+    cx = ds // 2
+    cy = ds // 2
+    max_r = ds / 2
+    dx = np.arange(x0, x0 + w, dtype=heights.dtype) - cx
+    dy = np.arange(y0, y0 + h, dtype=heights.dtype) - cy
+    fade = dx[np.newaxis, :] * dx[np.newaxis, :] + dy[:, np.newaxis] * dy[:, np.newaxis]
+    np.sqrt(fade, out=fade)
+    fade /= max_r
+    fade *= fade
+    np.subtract(1.0, fade, out=fade)
+    np.maximum(fade, 0.0, out=fade)
+    heights *= fade
+
+def classify_biomes(heights: np.ndarray, thresholds: tuple | None = None) -> np.ndarray:
+    """
+    Convert heights to tile indices using 'thresholds' (default: Config.MAP_BIOME_THRESHOLDS).
+    """
+    if thresholds is None:
+        thresholds = Config.MAP_BIOME_THRESHOLDS
+    lut = np.array([tile for _, tile in thresholds], dtype=np.uint8)
+    idx = np.zeros(heights.shape, dtype=np.uint8)
+    for bound, _ in thresholds[:-1]:
+        idx += heights >= bound
+    return lut[idx]
+
+def generate_island_tiles(rand: random.Random | None = None) -> np.ndarray:
     """
     Generate the island map using Diamond-Square + a radial fade,
     then convert to tile indices (volcano, forest, beach, water, etc.).
+    Returns a (MAP_HEIGHT, MAP_WIDTH) uint8 array.
+
+    'rand' (default: the global 'random' module) is seeded from SEED. With
+    Config.MAP_LEGACY_RNG its stream is consumed exactly like the original
+    generator did, so a given SEED yields the same island (and the same spawn
+    positions afterwards). Otherwise a NumPy generator seeded from SEED is
+    used, which is several times faster on large maps. Passing a private
+    random.Random lets the island be generated off the main thread.
+    Maps larger than Config.MAP_TILED_THRESHOLD use the tiled pipeline
+    (generate_island_tiles_tiled) instead.
     """
+    if rand is None:
+        rand = random
     if Config.SEED is not None:
-        random.seed(Config.SEED)
+        rand.seed(Config.SEED)
     else:
-        Config.SEED = random.randint(0, 999999999)
-        random.seed(Config.SEED)
+        Config.SEED = rand.randint(0, 999999999)
+        rand.seed(Config.SEED)
         logger.info(f"No seed specified, using random seed {Config.SEED}.")
 
     w, h = Config.MAP_WIDTH, Config.MAP_HEIGHT
+    if uses_tiled_generation(w, h):
+        return generate_island_tiles_tiled(Config.SEED)
+
+    rng = None if Config.MAP_LEGACY_RNG else np.random.default_rng(Config.SEED)
     ds = 1
     while ds < max(w, h):
         ds *= 2
     ds += 1
 
-    big_map = diamond_square(ds, roughness=0.4)
-    cx = ds // 2
-    cy = ds // 2
-    max_r = ds / 2
+    heights = diamond_square(ds, roughness=Config.MAP_ROUGHNESS, rng=rng, rand=rand)[:h, :w]
+    apply_radial_fade(heights, ds)
+    game_map = classify_biomes(heights)
 
-    # Radial fade
-    for ry in range(ds):
-        for rx in range(ds):
-            dx = rx - cx
-            dy = ry - cy
-            dist = math.sqrt(dx*dx + dy*dy)
-            fade = dist / max_r
-            factor = max(0.0, 1.0 - fade*fade)
-            big_map[ry][rx] *= factor
-
-    # Convert to tile indices
-    game_map = [[3 for _ in range(w)] for __ in range(h)]
-    for row in range(h):
-        for col in range(w):
-            v = big_map[row][col]
-            if v < 0.20:
-                tile = 3  # Water
-            elif v < 0.30:
-                tile = 2  # Beach
-            elif v < 0.80:
-                tile = 1  # Forest
-            else:
-                tile = 0  # Volcano
-            game_map[row][col] = tile
-
-    # Optionally add mud
-    land_tiles = [(x, y) for y in range(h) for x in range(w) if game_map[y][x] != 3]
-    random.shuffle(land_tiles)
+    # Mud and spikes on a random selection of land tiles
+    flat = game_map.reshape(-1)
+    land_tiles = np.flatnonzero(flat != WATER_TILE)
     total_land = len(land_tiles)
-    mud_count = int(total_land * 0.03)
-    for i in range(mud_count):
-        lx, ly = land_tiles[i]
-        game_map[ly][lx] = 4  # Mud
-
-    # Optionally add spikes
-    if Config.SPIKES_ENABLED:
-        spike_count = int(total_land * 0.02)
-        for i in range(spike_count):
-            lx, ly = land_tiles[i + mud_count]
-            game_map[ly][lx] = 5  # Spikes
+    mud_count = int(total_land * Config.MAP_MUD_FRACTION)
+    spike_count = int(total_land * Config.MAP_SPIKE_FRACTION) if Config.SPIKES_ENABLED else 0
+    if rng is None:
+        order = list(range(total_land))
+        rand.shuffle(order)
+        chosen = land_tiles[np.array(order[:mud_count + spike_count], dtype=np.intp)]
+    else:
+        chosen = land_tiles[rng.choice(total_land, mud_count + spike_count, replace=False)]
+    flat[chosen[:mud_count]] = MUD_TILE
+    flat[chosen[mud_count:]] = SPIKES_TILE
 
     logger.info("Island map generated successfully.")
     return game_map
+
+def generate_island_map() -> list[list[int]]:
+    """
+    Generate the island map as a 2D list of tile indices.
+    """
+    return generate_island_tiles().tolist()
+
+def _band_rows(width: int) -> int:
+    # About 4M tiles per band keeps the temporaries of the index passes small
+    return max(1, (1 << 22) // max(1, width))
+
+def find_coast_tiles(game_map: np.ndarray) -> np.ndarray:
+    """
+    Return the flat (y * width + x) indices of all land tiles that have water
+    in their 3x3 neighbourhood, in row-major order.
+    Works through the map in bands of rows, so it also suits memory-mapped maps.
+    """
+    h, w = game_map.shape
+    step = _band_rows(w)
+    parts = []
+    for r0 in range(0, h, step):
+        r1 = min(h, r0 + step)
+        # One row of context above and below the band
+        s0, s1 = max(0, r0 - 1), min(h, r1 + 1)
+        water = game_map[s0:s1] == WATER_TILE
+        near_water = water.copy()
+        near_water[1:, :] |= water[:-1, :]
+        near_water[:-1, :] |= water[1:, :]
+        rows = near_water.copy()
+        near_water[:, 1:] |= rows[:, :-1]
+        near_water[:, :-1] |= rows[:, 1:]
+        band = (near_water & ~water)[r0 - s0:r1 - s0]
+        parts.append((np.flatnonzero(band) + r0 * w).astype(np.int32))
+    return np.concatenate(parts) if parts else np.zeros(0, dtype=np.int32)
+
+def passable_tile_indices(game_map: np.ndarray, for_dino: bool = False) -> np.ndarray:
+    """
+    Return the flat (y * width + x) indices of all passable tiles, in row-major order.
+    """
+    key = "dino_passable" if for_dino else "passable"
+    lut = np.zeros(256, dtype=bool)
+    for tile, biome in Config.BIOMES.items():
+        lut[tile] = biome.get(key, biome["passable"])
+    h, w = game_map.shape
+    step = _band_rows(w)
+    parts = [(np.flatnonzero(lut[game_map[r0:r0 + step]]) + r0 * w).astype(np.int32)
+             for r0 in range(0, h, step)]
+    return np.concatenate(parts) if parts else np.zeros(0, dtype=np.int32)
+
+def build_map_indexes(game_map: np.ndarray) -> dict[str, np.ndarray]:
+    """
+    Derive the per-map lookup data that is stored alongside the tiles.
+    """
+    return {
+        "coast": find_coast_tiles(game_map),
+        "passable": passable_tile_indices(game_map),
+        "passable_dino": passable_tile_indices(game_map, for_dino=True),
+    }
+
+# Tiled generation
+#
+# Large islands are generated in square tiles of Config.MAP_TILE_SIZE (a
+# power of two) on a process pool. A coarse diamond-square grid gives the
+# height at every tile corner. Each tile edge is filled by 1D midpoint
+# displacement between its two corners, from a generator seeded by the
+# edge's own coordinates, so both tiles sharing an edge compute it
+# identically and there are no seams. The interior of a tile is then filled
+# by diamond-square from a generator seeded by the tile's coordinates, so
+# every tile can be produced on its own. Two passes over the tiles (global
+# min/max, then normalize, fade and classify) keep the height range
+# consistent without storing float heights; the second pass writes straight
+# into a memory-mapped tile grid.
+
+def uses_tiled_generation(width: int, height: int) -> bool:
+    return max(width, height) > Config.MAP_TILED_THRESHOLD
+
+def _tiled_params(seed: int) -> dict:
+    """
+    Everything the workers need, passed explicitly so it does not depend on
+    how the pool starts its processes.
+    """
+    w, h = Config.MAP_WIDTH, Config.MAP_HEIGHT
+    size = Config.MAP_TILE_SIZE
+    if size < 2 or size & (size - 1):
+        raise ValueError(f"MAP_TILE_SIZE must be a power of two, got {size}")
+    span = 1
+    while span * size < max(w, h):
+        span *= 2
+    return {
+        "seed": seed,
+        "width": w,
+        "height": h,
+        "tile": size,
+        "span": span,  # tiles per side of the coarse grid, a power of two
+        "ds": span * size + 1,
+        "roughness": Config.MAP_ROUGHNESS,
+        "thresholds": tuple(Config.MAP_BIOME_THRESHOLDS),
+        "mud": Config.MAP_MUD_FRACTION,
+        "spikes": Config.MAP_SPIKE_FRACTION if Config.SPIKES_ENABLED else 0.0,
+    }
+
+def _midpoint_edge(rng: np.random.Generator, a: float, b: float, length: int,
+                   roughness: float, scale: int = 1) -> np.ndarray:
+    """
+    1D midpoint displacement from height 'a' to 'b' over length + 1 points.
+    """
+    edge = np.empty(length + 1, dtype=np.float32)
+    edge[0], edge[-1] = a, b
+    step = length
+    while step > 1:
+        half = step // 2
+        mid = edge[0:-1:step] + edge[step::step]
+        mid *= 0.5
+        mid += _displacement(rng.random(len(mid), dtype=np.float32), roughness, step * scale)
+        edge[half::step] = mid
+        step //= 2
+        roughness *= 0.7
+    return edge
+
+def _fill_interior(arr: np.ndarray, rng: np.random.Generator, roughness: float, scale: int = 1) -> None:
+    """
+    Diamond-square over a (2^k + 1)^2 grid whose border is already filled,
+    in place. Displacements are sized as if one grid step were 'scale' tiles.
+    """
+    size = arr.shape[0]
+    step = size - 1
+    while step > 1:
+        half = step // 2
+        n = (size - 1) // step
+
+        mid = arr[0:-1:step, 0:-1:step] + arr[0:-1:step, step::step]
+        mid += arr[step::step, 0:-1:step]
+        mid += arr[step::step, step::step]
+        mid *= 0.25
+        mid += _displacement(rng.random((n, n), dtype=np.float32), roughness, step * scale)
+        arr[half::step, half::step] = mid
+        centers = arr[half::step, half::step]
+
+        if n > 1:
+            # Inner points on corner rows: diamond centers above and below
+            m = centers[:-1] + centers[1:]
+            m += arr[step:-1:step, 0:-1:step]
+            m += arr[step:-1:step, step::step]
+            m *= 0.25
+            m += _displacement(rng.random(m.shape, dtype=np.float32), roughness, step * scale)
+            arr[step:-1:step, half::step] = m
+
+            # Inner points on center rows: diamond centers left and right
+            m = centers[:, :-1] + centers[:, 1:]
+            m += arr[0:-1:step, step:-1:step]
+            m += arr[step::step, step:-1:step]
+            m *= 0.25
+            m += _displacement(rng.random(m.shape, dtype=np.float32), roughness, step * scale)
+            arr[half::step, step:-1:step] = m
+
+        step //= 2
+        roughness *= 0.7
+
+def _coarse_grid(params: dict) -> np.ndarray:
+    """
+    Heights at the tile corners: a (span + 1)^2 diamond-square grid.
+    """
+    span, scale = params["span"], params["tile"]
+    rng = np.random.default_rng([params["seed"], 3])
+    grid = np.empty((span + 1, span + 1), dtype=np.float32)
+    grid[[0, 0, -1, -1], [0, -1, 0, -1]] = rng.random(4, dtype=np.float32)
+    r = params["roughness"]
+    grid[0, :] = _midpoint_edge(rng, grid[0, 0], grid[0, -1], span, r, scale)
+    grid[-1, :] = _midpoint_edge(rng, grid[-1, 0], grid[-1, -1], span, r, scale)
+    grid[:, 0] = _midpoint_edge(rng, grid[0, 0], grid[-1, 0], span, r, scale)
+    grid[:, -1] = _midpoint_edge(rng, grid[0, -1], grid[-1, -1], span, r, scale)
+    _fill_interior(grid, rng, r, scale)
+    return grid
+
+def _tile_heights(params: dict, corners: tuple[float, float, float, float], tx: int, ty: int) -> np.ndarray:
+    """
+    Raw heights of tile (tx, ty), cropped to the map. 'corners' are the
+    coarse heights at its top-left, top-right, bottom-left and bottom-right.
+    """
+    seed, size = params["seed"], params["tile"]
+    # Roughness decays by 0.7 per halving of the step; the coarse grid took log2(span) of them
+    r = params["roughness"] * 0.7 ** (params["span"].bit_length() - 1)
+    c00, c10, c01, c11 = corners
+    arr = np.empty((size + 1, size + 1), dtype=np.float32)
+    # Edges are keyed by direction (1 horizontal, 2 vertical) and their first corner
+    arr[0, :] = _midpoint_edge(np.random.default_rng([seed, 1, tx, ty]), c00, c10, size, r)
+    arr[-1, :] = _midpoint_edge(np.random.default_rng([seed, 1, tx, ty + 1]), c01, c11, size, r)
+    arr[:, 0] = _midpoint_edge(np.random.default_rng([seed, 2, tx, ty]), c00, c01, size, r)
+    arr[:, -1] = _midpoint_edge(np.random.default_rng([seed, 2, tx + 1, ty]), c10, c11, size, r)
+    _fill_interior(arr, np.random.default_rng([seed, 0, tx, ty]), r)
+    h = min(size, params["height"] - ty * size)
+    w = min(size, params["width"] - tx * size)
+    return arr[:h, :w]
+
+def _tile_extent(params: dict, corners: tuple[float, float, float, float], tx: int, ty: int) -> tuple[float, float]:
+    heights = _tile_heights(params, corners, tx, ty)
+    return float(heights.min()), float(heights.max())
+
+def _scatter_mud_and_spikes(tiles: np.ndarray, rng: np.random.Generator, mud: float, spikes: float) -> None:
+    """
+    Turn the given fractions of the land tiles into mud and spikes, in place.
+    """
+    flat = tiles.reshape(-1)
+    land = np.flatnonzero(flat != WATER_TILE)
+    mud_count = int(len(land) * mud)
+    spike_count = int(len(land) * spikes)
+    chosen = land[rng.choice(len(land), mud_count + spike_count, replace=False)]
+    flat[chosen[:mud_count]] = MUD_TILE
+    flat[chosen[mud_count:]] = SPIKES_TILE
+
+def _tile_render(params: dict, corners: tuple[float, float, float, float], tx: int, ty: int,
+                 lo: float, hi: float, path: str) -> None:
+    """
+    Normalize, fade and classify tile (tx, ty), scatter its mud and spikes
+    and write it into the memory-mapped tile grid at 'path'.
+    """
+    heights = _tile_heights(params, corners, tx, ty)
+    if hi - lo < 1e-7:
+        heights[:] = 0.5
+    else:
+        heights -= lo
+        heights /= hi - lo
+    size = params["tile"]
+    x0, y0 = tx * size, ty * size
+    apply_radial_fade(heights, params["ds"], x0, y0)
+    tiles = classify_biomes(heights, params["thresholds"])
+
+    _scatter_mud_and_spikes(tiles, np.random.default_rng([params["seed"], 4, tx, ty]),
+                            params["mud"], params["spikes"])
+
+    grid = np.memmap(path, dtype=np.uint8, mode="r+", shape=(params["height"], params["width"]))
+    grid[y0:y0 + tiles.shape[0], x0:x0 + tiles.shape[1]] = tiles
+    grid.flush()
+    del grid
+
+def generate_island_tiles_tiled(seed: int, workers: int | None = None) -> np.ndarray:
+    """
+    Generate a (MAP_HEIGHT, MAP_WIDTH) island tile by tile on a pool of
+    'workers' processes (default: Config.MAP_GEN_WORKERS, else all cores).
+    Returns a memory-mapped uint8 array backed by a temporary file.
+    """
+    params = _tiled_params(seed)
+    coarse = _coarse_grid(params)
+    size = params["tile"]
+    jobs = [(tx, ty) for ty in range(-(-params["height"] // size))
+            for tx in range(-(-params["width"] // size))]
+    n = len(jobs)
+    corners = [(float(coarse[ty, tx]), float(coarse[ty, tx + 1]),
+                float(coarse[ty + 1, tx]), float(coarse[ty + 1, tx + 1])) for tx, ty in jobs]
+    txs = [tx for tx, _ in jobs]
+    tys = [ty for _, ty in jobs]
+
+    fd, path = tempfile.mkstemp(prefix="island_", suffix=".tiles")
+    with os.fdopen(fd, "wb") as f:
+        f.truncate(params["width"] * params["height"])
+
+    if workers is None:
+        workers = Config.MAP_GEN_WORKERS or os.cpu_count() or 1
+    workers = max(1, min(workers, n))
+    logger.info(f"Generating a {params['width']}x{params['height']} island "
+                f"in {n} tiles on {workers} process(es).")
+    # Spawned, not forked: this may run on the world builder thread of a
+    # process that already has other threads, and forking that can deadlock
+    pool = (ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            if workers > 1 else None)
+    try:
+        if pool:
+            chunksize = max(1, n // (workers * 4))
+            run = lambda fn, *args: pool.map(fn, *args, chunksize=chunksize)
+        else:
+            run = map
+        extents = list(run(_tile_extent, [params] * n, corners, txs, tys))
+        lo = min(e[0] for e in extents)
+        hi = max(e[1] for e in extents)
+        list(run(_tile_render, [params] * n, corners, txs, tys, [lo] * n, [hi] * n, [path] * n))
+    except BaseException:
+        os.remove(path)
+        raise
+    finally:
+        if pool:
+            pool.shutdown()
+
+    tiles = np.memmap(path, dtype=np.uint8, mode="r+", shape=(params["height"], params["width"]))
+    try:
+        # The mapping stays valid without the name where the OS allows removing it
+        os.remove(path)
+    except OSError:
+        logger.warning(f"Could not remove the temporary tile grid '{path}'.")
+    logger.info("Island map generated successfully.")
+    return tiles
+
+# Streaming chunks
+#
+# The streaming world has no edges, so chunk corner heights come from value
+# noise over the chunk lattice instead of a coarse grid, and heights are not
+# normalized. Edges and interiors are filled like the tiles above, with
+# generators keyed by the (zigzag-encoded) chunk coordinates, so any chunk
+# can be generated on its own and always comes out the same.
+
+# Value noise octaves over the chunk lattice: (period in chunks, weight)
+_STREAM_OCTAVES = ((16, 0.55), (4, 0.3), (1, 0.15))
+# Spread of the averaged noise (which clusters around 0.5) and its mean height,
+# chosen so the biome mix comes out close to the island's
+_STREAM_CONTRAST = 1.8
+_STREAM_LEVEL = 0.3
+
+def zigzag(v: int) -> int:
+    """
+    Map any integer to a distinct non-negative one, as seed sequences need.
+    """
+    return 2 * v if v >= 0 else -2 * v - 1
+
+def _lattice_values(seed: int, xs: np.ndarray, ys: np.ndarray, salt: int) -> np.ndarray:
+    """
+    Deterministic uniform [0, 1) value per integer lattice point (splitmix64 hash).
+    """
+    with np.errstate(over="ignore"):
+        h = xs.astype(np.int64).astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+        h ^= ys.astype(np.int64).astype(np.uint64) * np.uint64(0xC2B2AE3D27D4EB4F)
+        h ^= np.uint64((seed * 1000003 + salt) & 0xFFFFFFFFFFFFFFFF)
+        h ^= h >> np.uint64(30)
+        h *= np.uint64(0xBF58476D1CE4E5B9)
+        h ^= h >> np.uint64(27)
+        h *= np.uint64(0x94D049BB133111EB)
+        h ^= h >> np.uint64(31)
+    return (h >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+def stream_corner_heights(seed: int, cxs: np.ndarray, cys: np.ndarray) -> np.ndarray:
+    """
+    Heights at chunk lattice corners (cx, cy): smoothed value noise in
+    several octaves, stretched around _STREAM_LEVEL.
+    """
+    cxs = np.asarray(cxs, dtype=np.int64)
+    cys = np.asarray(cys, dtype=np.int64)
+    total = np.zeros(cxs.shape)
+    for octave, (period, weight) in enumerate(_STREAM_OCTAVES):
+        gx, gy = cxs // period, cys // period
+        fx = (cxs - gx * period) / period
+        fy = (cys - gy * period) / period
+        fx = fx * fx * (3 - 2 * fx)
+        fy = fy * fy * (3 - 2 * fy)
+        v00 = _lattice_values(seed, gx, gy, octave)
+        v10 = _lattice_values(seed, gx + 1, gy, octave)
+        v01 = _lattice_values(seed, gx, gy + 1, octave)
+        v11 = _lattice_values(seed, gx + 1, gy + 1, octave)
+        top = v00 + (v10 - v00) * fx
+        bottom = v01 + (v11 - v01) * fx
+        total += weight * (top + (bottom - top) * fy)
+    return (total - 0.5) * _STREAM_CONTRAST + _STREAM_LEVEL
+
+def generate_chunk_tiles(seed: int, cx: int, cy: int, size: int) -> np.ndarray:
+    """
+    Tiles of streaming chunk (cx, cy), a (size, size) uint8 array
+    ('size' a power of two). Neighbouring chunks join without seams.
+    """
+    corners = stream_corner_heights(seed, np.array([cx, cx + 1, cx, cx + 1]), np.array([cy, cy, cy + 1, cy + 1]))
+    c00, c10, c01, c11 = corners.astype(np.float32).tolist()
+    zx, zy = zigzag(cx), zigzag(cy)
+    # Displacements of at most about +-MAP_ROUGHNESS / 2 at the chunk scale
+    r = Config.MAP_ROUGHNESS / size
+    arr = np.empty((size + 1, size + 1), dtype=np.float32)
+    arr[0, :] = _midpoint_edge(np.random.default_rng([seed, 1, zx, zy]), c00, c10, size, r)
+    arr[-1, :] = _midpoint_edge(np.random.default_rng([seed, 1, zx, zigzag(cy + 1)]), c01, c11, size, r)
+    arr[:, 0] = _midpoint_edge(np.random.default_rng([seed, 2, zx, zy]), c00, c01, size, r)
+    arr[:, -1] = _midpoint_edge(np.random.default_rng([seed, 2, zigzag(cx + 1), zy]), c10, c11, size, r)
+    _fill_interior(arr, np.random.default_rng([seed, 0, zx, zy]), r)
+    tiles = classify_biomes(arr[:size, :size])
+    spikes = Config.MAP_SPIKE_FRACTION if Config.SPIKES_ENABLED else 0.0
+    _scatter_mud_and_spikes(tiles, np.random.default_rng([seed, 4, zx, zy]), Config.MAP_MUD_FRACTION, spikes)
+    return tiles
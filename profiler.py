@@ -0,0 +1,185 @@
+# profiler.py
+
+from __future__ import annotations
+import csv
+import time
+import logging
+from collections import deque
+import numpy as np
+import pygame
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Colors for the stacked frame graph, assigned to top-level sections by name
+_GRAPH_COLORS = [
+    (230, 80, 80), (80, 200, 90), (90, 140, 240), (240, 200, 60),
+    (200, 90, 220), (70, 210, 210), (240, 140, 60), (160, 160, 160),
+]
+
+class _NullSection:
+    """
+    Shared do-nothing context returned while the profiler is off.
+    """
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+_NULL_SECTION = _NullSection()
+
+class _Section:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: FrameProfiler, name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc) -> None:
+        self.profiler.add(self.name, time.perf_counter() - self.start)
+
+class FrameProfiler:
+    """
+    Per-frame timing of named sections of the game loop.
+
+    Wrap a phase in 'with profiler.section("draw.map"):'. Dotted names are
+    sub-sections of their top-level section; a section entered several times
+    in a frame (e.g. once per simulation tick) accumulates. Frames are kept in
+    a rolling window for averages, p95/p99, the overlay graph and CSV export.
+    While disabled, section() returns a shared no-op context.
+    """
+    def __init__(self, history: int | None = None) -> None:
+        self.enabled = Config.PROFILER_ENABLED
+        if history is None:
+            history = Config.PROFILER_HISTORY
+        self.frames: deque[tuple[float, dict[str, float]]] = deque(maxlen=history)
+        self.names: dict[str, None] = {}
+        self.current: dict[str, float] | None = None
+        self.frame_start = 0.0
+        self.frame_count = 0
+        self.font = None
+
+    def toggle(self) -> None:
+        self.enabled = not self.enabled
+        self.current = None
+        logger.info(f"Profiler {'enabled' if self.enabled else 'disabled'}.")
+
+    def section(self, name: str) -> _Section | _NullSection:
+        if not self.enabled or self.current is None:
+            return _NULL_SECTION
+        return _Section(self, name)
+
+    def add(self, name: str, seconds: float) -> None:
+        if self.current is None:
+            return
+        self.current[name] = self.current.get(name, 0.0) + seconds
+        if name not in self.names:
+            self.names[name] = None
+
+    def begin_frame(self) -> None:
+        if not self.enabled:
+            return
+        self.current = {}
+        self.frame_start = time.perf_counter()
+
+    def end_frame(self) -> None:
+        if self.current is None:
+            return
+        self.frames.append((time.perf_counter() - self.frame_start, self.current))
+        self.frame_count += 1
+        self.current = None
+
+    def reset(self) -> None:
+        self.frames.clear()
+        self.names.clear()
+        self.current = None
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """
+        Average, p95 and p99 in milliseconds per section (and 'frame') over the window.
+        """
+        if not self.frames:
+            return {}
+        columns = {"frame": np.array([total for total, _ in self.frames])}
+        for name in self.names:
+            columns[name] = np.array([sections.get(name, 0.0) for _, sections in self.frames])
+        result = {}
+        for name, values in columns.items():
+            avg, p95, p99 = values.mean(), *np.percentile(values, (95, 99))
+            result[name] = {"avg": float(avg) * 1000.0, "p95": float(p95) * 1000.0,
+                            "p99": float(p99) * 1000.0}
+        return result
+
+    def export_csv(self, path: str | None = None) -> None:
+        """
+        Write one row per frame in the window: total and per-section times in ms,
+        to 'path' (default: Config.PROFILER_CSV_PATH).
+        """
+        if path is None:
+            path = Config.PROFILER_CSV_PATH
+        names = sorted(self.names)
+        first = self.frame_count - len(self.frames)
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "total_ms", *(f"{name}_ms" for name in names)])
+            for i, (total, sections) in enumerate(self.frames):
+                writer.writerow([first + i, f"{total * 1000.0:.3f}",
+                                 *(f"{sections.get(name, 0.0) * 1000.0:.3f}" for name in names)])
+        logger.info(f"Exported {len(self.frames)} frame timings to '{path}'.")
+
+    def draw(self, surface: pygame.Surface) -> None:
+        """
+        Draw a stacked graph of recent frames by top-level section, the
+        frame budget line and a table of avg/p95/p99 per section.
+        """
+        if not self.enabled or not self.frames:
+            return
+        if self.font is None:
+            self.font = pygame.font.SysFont("Consolas", 14)
+
+        # Sorted names put each section right before its sub-sections
+        names = sorted(self.names)
+        top_level = [name for name in names if "." not in name]
+        colors = {name: _GRAPH_COLORS[i % len(_GRAPH_COLORS)] for i, name in enumerate(top_level)}
+        graph_w, graph_h = 300, 120
+        budget_ms = 1000.0 / Config.FPS
+        scale = graph_h / (budget_ms * 2)  # the budget line sits at half height
+
+        stats = self.stats()
+        lines = [(f"{'section':<18}{'avg':>7}{'p95':>7}{'p99':>7}", (255, 255, 255))]
+        for name in ["frame", *names]:
+            s = stats[name]
+            color = colors.get(name, (200, 200, 200))
+            label = "  " + name.split(".", 1)[1] if "." in name else name
+            lines.append((f"{label:<18}{s['avg']:7.2f}{s['p95']:7.2f}{s['p99']:7.2f}", color))
+        line_h = self.font.get_linesize()
+
+        panel = pygame.Surface((graph_w + 10, graph_h + 10 + line_h * len(lines)), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 180))
+        x = graph_w + 5
+        for _, sections in reversed(self.frames):
+            x -= 2
+            if x < 5:
+                break
+            y = graph_h + 5
+            for name in top_level:
+                h = int(sections.get(name, 0.0) * 1000.0 * scale)
+                if h > 0:
+                    y -= h
+                    panel.fill(colors[name], (x, max(5, y), 2, h))
+        budget_y = graph_h + 5 - int(budget_ms * scale)
+        pygame.draw.line(panel, (255, 255, 255), (5, budget_y), (graph_w + 5, budget_y))
+
+        y = graph_h + 10
+        for text, color in lines:
+            panel.blit(self.font.render(text, True, color), (5, y))
+            y += line_h
+        surface.blit(panel, (10, Config.WINDOW_HEIGHT - panel.get_height() - 80))
+
+profiler = FrameProfiler()
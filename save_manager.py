@@ -0,0 +1,345 @@
+# save_manager.py
+
+from __future__ import annotations
+import os
+import json
+import time
+import zlib
+import random
+import logging
+import threading
+import numpy as np
+from typing import TYPE_CHECKING
+
+from config import Config
+import map_cache
+from game_map import GameMap
+from world_builder import PreparedWorld
+from world_stream import WorldStreamer
+
+if TYPE_CHECKING:
+    from game import Game
+
+logger = logging.getLogger(__name__)
+
+SAVE_MAGIC = b"DINOSAV\0"
+SAVE_VERSION = 1
+
+# Entities are stored as packed little-endian records, one section per kind
+PLAYER_RECORD = np.dtype([
+    ("x", "<f8"), ("y", "<f8"), ("hp", "<i4"), ("score", "<i4"),
+    ("potions", "<i4"), ("repellents", "<i4"), ("repellent_timer", "<f8"),
+    ("repellent_active", "u1"), ("facing_left", "u1"),
+])
+DINOSAUR_RECORD = np.dtype([
+    ("x", "<f8"), ("y", "<f8"), ("aggressive", "u1"), ("state", "i1"), ("just_attacked", "u1"),
+    ("facing_left", "u1"), ("frame", "i1"), ("animation_timer", "<f4"), ("last_tick", "<i8"),
+])
+ITEM_RECORD = np.dtype([("x", "<f8"), ("y", "<f8"), ("type", "u1")])
+LAVA_RECORD = np.dtype([("flat", "<i8"), ("until", "<f8")])
+# Streaming mode: the chunk store and the dinosaurs paged out into it
+CHUNK_RECORD = np.dtype([("cx", "<i8"), ("cy", "<i8"), ("populated", "u1")])
+STORED_DINOSAUR_RECORD = np.dtype([("x", "<f8"), ("y", "<f8"), ("aggressive", "u1")])
+
+ITEM_TYPES = ("potion", "repellent")
+# Sections holding the map; large ones are only memory-mapped, not verified
+_MAP_SECTIONS = ("tiles", "coast", "passable", "passable_dino")
+
+def save_path(name: str) -> str:
+    return os.path.join(Config.SAVE_DIR, f"{name}.sav")
+
+def latest_save() -> str | None:
+    """
+    The most recently written of the quicksave and the autosave, if any.
+    """
+    paths = [path for path in (save_path("quicksave"), save_path("autosave")) if os.path.exists(path)]
+    return max(paths, key=os.path.getmtime) if paths else None
+
+def _records(dtype: np.dtype, columns: dict[str, np.ndarray], count: int) -> np.ndarray:
+    records = np.zeros(count, dtype=dtype)
+    for name, values in columns.items():
+        records[name] = values
+    return records
+
+def _item_records(items: list[tuple[str, float, float]]) -> np.ndarray:
+    return _records(ITEM_RECORD, {
+        "x": [x for _, x, _ in items],
+        "y": [y for _, _, y in items],
+        "type": [ITEM_TYPES.index(t) for t, _, _ in items],
+    }, len(items))
+
+def snapshot(game: Game) -> tuple[int, int, dict[str, np.ndarray]]:
+    """
+    Capture everything a save holds, as (width, height, sections), on the
+    main thread between ticks. Only small state is copied: the island's
+    tiles and indexes are never modified in place, so they are referenced.
+    """
+    game_map = game.game_map
+    player = game.player
+    herd = game.dinosaurs
+    n = len(herd)
+    scheduler = game.ai_scheduler
+
+    last_tick = np.full(n, scheduler.tick, dtype=np.int64)
+    known = min(n, len(scheduler.last_tick))
+    last_tick[:known] = scheduler.last_tick[:known]
+
+    meta = {
+        "seed": Config.SEED,
+        "ticks": game.game_clock.ticks,
+        "last_lava_time": game.last_lava_time,
+        "ai_tick": scheduler.tick,
+        "herd_rng": None if herd.rng is None else herd.rng.bit_generator.state,
+        "boat": {
+            "active": game.boat_active,
+            "x": game.boat_x,
+            "y": game.boat_y,
+            "site": game.boat_site,
+            "frame": game.boat_current_frame,
+            "timer": game.boat_animation_timer,
+        },
+        "stream": None,
+    }
+    streamer = game.streamer
+    if streamer is not None:
+        meta["stream"] = {
+            "seed": streamer.seed,
+            "chunk_tiles": streamer.chunk_tiles,
+            "radius": streamer.radius,
+            "max_chunks": streamer.max_chunks,
+            "origin": streamer.origin,
+        }
+
+    flats, until = game.lava.active()
+    sections = {
+        # default=int: coordinates may be NumPy integers
+        "meta": np.frombuffer(json.dumps(meta, default=int).encode("utf-8"), dtype=np.uint8),
+        "rng_state": map_cache.pack_rng_state(random),
+        "tiles": game_map.tiles.reshape(-1),
+        "coast": game_map.coast,
+        "passable": game_map.passable_tiles,
+        "passable_dino": game_map.dino_passable_tiles,
+        "player": _records(PLAYER_RECORD, {
+            "x": player.x, "y": player.y, "hp": player.hp, "score": player.score,
+            "potions": player.inventory["potion"], "repellents": player.inventory["repellent"],
+            "repellent_timer": player.repellent_timer, "repellent_active": player.repellent_active,
+            "facing_left": player.facing_left,
+        }, 1),
+        "dinosaurs": _records(DINOSAUR_RECORD, {
+            "x": herd.x[:n], "y": herd.y[:n], "aggressive": herd.aggressive[:n],
+            "state": herd.state[:n], "just_attacked": herd.just_attacked[:n],
+            "facing_left": herd.facing_left[:n], "frame": herd.frame[:n],
+            "animation_timer": herd.animation_timer[:n], "last_tick": last_tick,
+        }, n),
+        "items": _item_records([(it.type, it.x, it.y) for it in game.items]),
+        "lava": _records(LAVA_RECORD, {"flat": flats, "until": until}, len(flats)),
+    }
+
+    if streamer is not None:
+        # The window is rewritten in place when it moves
+        sections["tiles"] = game_map.tiles.reshape(-1).copy()
+        keys, populated, (xs, ys, aggressive), items = streamer.stored_chunks()
+        sections["stream_chunks"] = _records(CHUNK_RECORD, {
+            "cx": keys[:, 0], "cy": keys[:, 1], "populated": populated,
+        }, len(keys))
+        sections["stream_dinosaurs"] = _records(STORED_DINOSAUR_RECORD, {
+            "x": xs, "y": ys, "aggressive": aggressive,
+        }, len(xs))
+        sections["stream_items"] = _item_records(items)
+    return game_map.width, game_map.height, sections
+
+def write_snapshot(path: str, width: int, height: int, sections: dict[str, np.ndarray]) -> None:
+    """
+    Write a snapshot to 'path' (safe off the main thread). Record arrays are
+    stored as raw bytes; a final 'crc32' section holds one checksum per
+    section, in order.
+    """
+    sections = {name: np.ascontiguousarray(arr).reshape(-1).view(np.uint8)
+                if arr.dtype.names else arr for name, arr in sections.items()}
+    crcs = [zlib.crc32(np.ascontiguousarray(arr)) for arr in sections.values()]
+    sections["crc32"] = np.array(crcs, dtype=np.uint32)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    map_cache.write_sections(path, width, height, sections, magic=SAVE_MAGIC, version=SAVE_VERSION)
+
+def save_game(game: Game, path: str) -> None:
+    start = time.perf_counter()
+    write_snapshot(path, *snapshot(game))
+    logger.info(f"Saved game to '{path}' in {time.perf_counter() - start:.3f}s.")
+
+def read_save(path: str) -> tuple[int, int, dict[str, np.ndarray]]:
+    """
+    Memory-map a save file and check its checksums. Map sections larger
+    than Config.SAVE_VERIFY_MAX_BYTES in total are left unread, so resuming
+    a huge map does not have to page it all in.
+    Raises ValueError if the file is invalid or corrupt.
+    """
+    width, height, sections = map_cache.read_sections(path, magic=SAVE_MAGIC, version=SAVE_VERSION)
+    crcs = sections.pop("crc32", None)
+    if crcs is None or len(crcs) != len(sections):
+        raise ValueError("missing checksums")
+    map_bytes = sum(sections[name].nbytes for name in _MAP_SECTIONS if name in sections)
+    verify_map = map_bytes <= Config.SAVE_VERIFY_MAX_BYTES
+    for (name, arr), crc in zip(sections.items(), crcs.tolist()):
+        if name in _MAP_SECTIONS and not verify_map:
+            continue
+        if zlib.crc32(arr) != crc:
+            raise ValueError(f"checksum mismatch in section '{name}'")
+    if len(sections["tiles"]) != width * height:
+        raise ValueError("tile block does not match the map size")
+    return width, height, sections
+
+def _unpack(sections: dict[str, np.ndarray], name: str, dtype: np.dtype) -> np.ndarray:
+    data = sections[name]
+    if data.nbytes % dtype.itemsize:
+        raise ValueError(f"section '{name}' is not a whole number of records")
+    return np.frombuffer(data, dtype=dtype)
+
+def load_game(game: Game, path: str) -> bool:
+    """
+    Resume the game saved at 'path'. The tile block is memory-mapped, not
+    copied (except for the window of a streaming world, which is rewritten
+    as it moves). Returns False, leaving the game as it was, if the save
+    cannot be used.
+    """
+    start = time.perf_counter()
+    try:
+        width, height, sections = read_save(path)
+        meta = json.loads(bytes(sections["meta"]).decode("utf-8"))
+        player = _unpack(sections, "player", PLAYER_RECORD)[0]
+        dinosaurs = _unpack(sections, "dinosaurs", DINOSAUR_RECORD)
+        items = _unpack(sections, "items", ITEM_RECORD)
+        lava = _unpack(sections, "lava", LAVA_RECORD)
+        tiles = sections["tiles"].reshape(height, width)
+        indexes = {name: sections[name] for name in ("coast", "passable", "passable_dino")}
+        stream = meta["stream"]
+        if stream is not None:
+            chunks = _unpack(sections, "stream_chunks", CHUNK_RECORD)
+            stored_dinosaurs = _unpack(sections, "stream_dinosaurs", STORED_DINOSAUR_RECORD)
+            stored_items = _unpack(sections, "stream_items", ITEM_RECORD)
+    except (OSError, ValueError, KeyError, IndexError) as e:
+        logger.warning(f"Could not load saved game '{path}': {e}")
+        return False
+
+    streamer = None
+    if stream is None:
+        game_map = GameMap(tiles, indexes)
+    else:
+        streamer = WorldStreamer(stream["seed"], stream["chunk_tiles"], stream["radius"],
+                                 stream["max_chunks"], origin=tuple(stream["origin"]),
+                                 tiles=tiles, indexes=indexes)
+        streamer.restore_chunks(
+            np.stack((chunks["cx"], chunks["cy"]), axis=1), chunks["populated"].astype(bool),
+            (stored_dinosaurs["x"].copy(), stored_dinosaurs["y"].copy(),
+             stored_dinosaurs["aggressive"].astype(bool)),
+            [(ITEM_TYPES[t], x, y) for x, y, t in stored_items.tolist()],
+        )
+        game_map = streamer.game_map
+
+    rand = random.Random()
+    map_cache.unpack_rng_state(sections["rng_state"], rand)
+    world = PreparedWorld(
+        game_map, (float(player["x"]), float(player["y"])),
+        [(ITEM_TYPES[t], x, y) for x, y, t in items.tolist()],
+        [(dinosaurs["x"].copy(), dinosaurs["y"].copy(), False)],
+        rand.getstate(), None, streamer,
+    )
+    game.reset_game(world)
+    _restore_state(game, meta, player, dinosaurs, lava)
+    logger.info(f"Loaded saved game '{path}' in {time.perf_counter() - start:.3f}s.")
+    return True
+
+def _restore_state(game: Game, meta: dict, player: np.void, dinosaurs: np.ndarray,
+                   lava: np.ndarray) -> None:
+    """
+    Put back what reset_game() does not set up from the prepared world.
+    """
+    p = game.player
+    p.hp = int(player["hp"])
+    p.score = int(player["score"])
+    p.inventory["potion"] = int(player["potions"])
+    p.inventory["repellent"] = int(player["repellents"])
+    p.repellent_timer = float(player["repellent_timer"])
+    p.repellent_active = bool(player["repellent_active"])
+    p.facing_left = bool(player["facing_left"])
+
+    herd = game.dinosaurs
+    n = len(dinosaurs)
+    for name in ("aggressive", "state", "just_attacked", "facing_left", "frame", "animation_timer"):
+        getattr(herd, name)[:n] = dinosaurs[name]
+    if meta["herd_rng"] is not None:
+        herd.rng = np.random.default_rng()
+        herd.rng.bit_generator.state = meta["herd_rng"]
+    game.ai_scheduler.tick = meta["ai_tick"]
+    game.ai_scheduler.last_tick = dinosaurs["last_tick"].copy()
+
+    game.game_clock.ticks = meta["ticks"]
+    game.game_clock.sim_time = game.game_clock.ticks * game.game_clock.dt
+    game.last_lava_time = meta["last_lava_time"]
+    width = game.lava.width
+    for until in np.unique(lava["until"]).tolist():
+        flats = lava["flat"][lava["until"] == until]
+        game.lava.add(flats % width, flats // width, 0.0, until)
+
+    boat = meta["boat"]
+    game.boat_active = boat["active"]
+    game.boat_x, game.boat_y = boat["x"], boat["y"]
+    game.boat_site = None if boat["site"] is None else tuple(boat["site"])
+    game.boat_current_frame = boat["frame"]
+    game.boat_animation_timer = boat["timer"]
+
+class BackgroundSaver:
+    """
+    Writes saves on a background thread. The snapshot is taken on the main
+    thread (cheap: small copies and references), so the frame only pays for
+    that; serializing, checksumming and writing happen off it. A save
+    requested while one is still being written is skipped.
+
+    update() autosaves every Config.AUTOSAVE_INTERVAL seconds of play.
+    """
+    def __init__(self) -> None:
+        self.thread: threading.Thread | None = None
+        self.last_autosave = 0.0
+        self.stats = {"saved": 0, "skipped": 0, "failed": 0}
+
+    @property
+    def busy(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+
+    def save(self, game: Game, path: str) -> bool:
+        """
+        Start saving the game to 'path'. Returns False if a save is already underway.
+        """
+        if self.busy:
+            self.stats["skipped"] += 1
+            return False
+        snap = snapshot(game)
+        self.thread = threading.Thread(target=self._run, args=(path, snap), name="saver", daemon=True)
+        self.thread.start()
+        return True
+
+    def _run(self, path: str, snap: tuple[int, int, dict[str, np.ndarray]]) -> None:
+        start = time.perf_counter()
+        try:
+            write_snapshot(path, *snap)
+        except OSError as e:
+            self.stats["failed"] += 1
+            logger.warning(f"Could not write saved game '{path}': {e}")
+            return
+        self.stats["saved"] += 1
+        logger.info(f"Saved game to '{path}' in {time.perf_counter() - start:.3f}s.")
+
+    def update(self, game: Game) -> None:
+        now = game.game_clock.sim_time
+        if now < self.last_autosave:
+            # A new or loaded game started over
+            self.last_autosave = now
+        if now - self.last_autosave >= Config.AUTOSAVE_INTERVAL and self.save(game, save_path("autosave")):
+            self.last_autosave = now
+
+    def wait(self) -> None:
+        """
+        Let a save in progress finish, e.g. before exiting.
+        """
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
@@ -6,18 +6,25 @@ import logging
 from config import Config
 from state import GameState
 from sound_manager import sound_manager
+import input_manager
 
 logger = logging.getLogger(__name__)
 
 class BaseScreen:
     """
     Generic base class for menu/pause/help/intro/win/lose screens.
+
+    The background, image and text are composed once into a cached surface,
+    which is rebuilt only when the window size or the text changes; drawing
+    the screen is a single blit.
     """
     def __init__(self, screen_key: str, text_key: str, window: pygame.Surface) -> None:
         self.window = window
         self.text_lines = Config.TEXTS.get(text_key, [])
         self.font_title = pygame.font.SysFont("Arial", 40)
         self.font_text = pygame.font.SysFont("Arial", 24)
+        self.composed = None
+        self.composed_key = None
 
         image_path = Config.get_screen_image(screen_key)
         self.image = None
@@ -25,7 +32,7 @@ class BaseScreen:
             try:
                 loaded = pygame.image.load(image_path).convert_alpha()
                 self.image = self.scale_image(loaded, Config.WINDOW_WIDTH * 0.9, Config.WINDOW_HEIGHT * 0.4)
-            except pygame.error as e:
+            except (pygame.error, OSError) as e:
                 logger.warning(f"Could not load background image '{screen_key}': {e}")
 
     def scale_image(self, image: pygame.Surface, max_width: float, max_height: float) -> pygame.Surface:
@@ -34,13 +41,27 @@ class BaseScreen:
         new_size = (int(w * ratio), int(h * ratio))
         return pygame.transform.scale(image, new_size)
 
-    def draw(self) -> None:
-        self.window.fill((30, 30, 30))
+    def set_text(self, lines: list[str]) -> None:
+        self.text_lines = lines
+
+    def get_surface(self) -> pygame.Surface:
+        """
+        The composed screen, rebuilt if the window size or text changed.
+        """
+        key = (self.window.get_size(), tuple(self.text_lines))
+        if self.composed is None or key != self.composed_key:
+            self.composed = self.compose(self.window.get_size())
+            self.composed_key = key
+        return self.composed
+
+    def compose(self, size: tuple[int, int]) -> pygame.Surface:
+        surface = pygame.Surface(size).convert()
+        surface.fill((30, 30, 30))
         if self.image:
             rect = self.image.get_rect()
             rect.centerx = Config.WINDOW_WIDTH // 2
             rect.top = 80
-            self.window.blit(self.image, rect)
+            surface.blit(self.image, rect)
 
         y_start = 80 + (self.image.get_height() if self.image else 0) + 40
         for idx, line in enumerate(self.text_lines):
@@ -49,8 +70,12 @@ class BaseScreen:
             else:
                 txt_surf = self.font_text.render(line, True, (255, 255, 255))
             x_pos = Config.WINDOW_WIDTH // 2 - txt_surf.get_width() // 2
-            self.window.blit(txt_surf, (x_pos, y_start))
+            surface.blit(txt_surf, (x_pos, y_start))
             y_start += txt_surf.get_height() + 15
+        return surface
+
+    def draw(self) -> None:
+        self.window.blit(self.get_surface(), (0, 0))
 
     def handle_event(self, event: pygame.event.Event, game: 'Game') -> None:
         pass
@@ -85,6 +110,8 @@ class PauseScreen(BaseScreen):
                 game.running = False
             elif event.key == pygame.K_m:
                 sound_manager.toggle_music()
+            elif event.key == pygame.K_s:
+                input_manager.quicksave(game)
 
 
 class LoseScreen(BaseScreen):
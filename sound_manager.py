@@ -1,18 +1,140 @@
 # sound_manager.py
 
+import os
+import time
+import struct
 import pygame
 import random
+import hashlib
 import logging
+import threading
 from config import Config
 
 logger = logging.getLogger(__name__)
 
+# magic, version, source mtime (ns), source size, mixer frequency, format, channels
+PCM_MAGIC = b"DINOPCM\0"
+PCM_VERSION = 1
+_PCM_HEADER = struct.Struct("<8sIqqiii")
+
+def pcm_cache_path(path: str) -> str:
+    digest = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(Config.SOUND_CACHE_DIR, f"{os.path.basename(path)}.{digest}.pcm")
+
+def _source_signature(path: str) -> tuple[int, int, int, int, int]:
+    """
+    What decoded PCM depends on: the source file's mtime and size and the mixer format.
+    """
+    st = os.stat(path)
+    frequency, fmt, channels = pygame.mixer.get_init()
+    return st.st_mtime_ns, st.st_size, frequency, fmt, channels
+
+def load_cached_pcm(path: str) -> pygame.mixer.Sound | None:
+    """
+    The pre-decoded sound for 'path' from the on-disk cache, or None if
+    there is no cache entry or it is stale.
+    """
+    cache_file = pcm_cache_path(path)
+    try:
+        with open(cache_file, "rb") as f:
+            header = f.read(_PCM_HEADER.size)
+            if len(header) != _PCM_HEADER.size:
+                return None
+            magic, version, *signature = _PCM_HEADER.unpack(header)
+            if magic != PCM_MAGIC or version != PCM_VERSION or tuple(signature) != _source_signature(path):
+                return None
+            return pygame.mixer.Sound(buffer=f.read())
+    except FileNotFoundError:
+        return None
+    except (OSError, pygame.error) as e:
+        logger.warning(f"Ignoring unreadable sound cache '{cache_file}': {e}")
+        return None
+
+def store_cached_pcm(path: str, sound: pygame.mixer.Sound) -> None:
+    cache_file = pcm_cache_path(path)
+    try:
+        os.makedirs(Config.SOUND_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_PCM_HEADER.pack(PCM_MAGIC, PCM_VERSION, *_source_signature(path)))
+            f.write(sound.get_raw())
+        os.replace(tmp_path, cache_file)
+    except OSError as e:
+        logger.warning(f"Could not write sound cache '{cache_file}': {e}")
+
+class SoundHandle:
+    """
+    A sound that is decoded on first use (or by the background prefetch),
+    from the PCM cache when it is fresh, otherwise from the source file.
+    """
+    def __init__(self, path: str, volume: float) -> None:
+        self.path = path
+        self.volume = volume
+        self._sound = None
+        self._failed = False
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._sound is not None or self._failed
+
+    def get(self) -> pygame.mixer.Sound | None:
+        """
+        The decoded sound, or None if it could not be loaded.
+        """
+        if self._sound is not None or self._failed:
+            return self._sound
+        with self._lock:
+            if self._sound is None and not self._failed:
+                self._sound = self._load()
+                self._failed = self._sound is None
+        return self._sound
+
+    def _load(self) -> pygame.mixer.Sound | None:
+        if not pygame.mixer.get_init():
+            return None
+        try:
+            snd = load_cached_pcm(self.path) if Config.SOUND_CACHE_ENABLED else None
+            if snd is None:
+                snd = pygame.mixer.Sound(self.path)
+                if Config.SOUND_CACHE_ENABLED:
+                    store_cached_pcm(self.path, snd)
+            snd.set_volume(self.volume)
+            return snd
+        except (pygame.error, OSError) as e:
+            logger.warning(f"Could not load sound from '{self.path}': {e}")
+            return None
+
+    def play(self, loops: int = 0) -> None:
+        snd = self.get()
+        if snd:
+            snd.play(loops=loops)
+
+    def set_volume(self, volume: float) -> None:
+        self.volume = volume
+        if self._sound is not None:
+            self._sound.set_volume(volume)
+
 class SoundManager:
     """
     Manages sound effects and background music using pygame.mixer.
+
+    Sounds are lazy handles: nothing is decoded at construction time.
+    prefetch() decodes them on a background thread; anything played
+    before that finishes is decoded on the spot.
     """
 
     def __init__(self) -> None:
+        self.sounds = {category: {} for category in Config.SOUNDS}
+        self.background_music_tracks = []
+        self.music_on = True
+        self.current_music = None
+        self.prefetch_thread = None
+        self.enabled = Config.AUDIO_ENABLED
+        if not self.enabled:
+            logger.info("Audio disabled; sound manager is silent.")
+            return
+
         if not pygame.mixer.get_init():
             try:
                 pygame.mixer.init()
@@ -20,34 +142,50 @@ class SoundManager:
             except pygame.error as e:
                 logger.error(f"Failed to initialize Pygame mixer: {e}")
 
-        self.sounds = {}
-        self.background_music_tracks = []
-        self.music_on = True
-        self.current_music = None
         self._load_sounds()
 
     def _load_sounds(self) -> None:
+        # Names that refer to the same file at the same volume share one handle
+        handles: dict[tuple[str, float], SoundHandle] = {}
         for category, sounds_dict in Config.SOUNDS.items():
             self.sounds[category] = {}
             for name, path in sounds_dict.items():
                 if category == "environment" and name == "background_music":
                     self.background_music_tracks = path
                     continue
-                try:
-                    snd = pygame.mixer.Sound(path)
-                    volume = Config.SOUND_VOLUMES.get(name, Config.DEFAULT_SOUND_VOLUME)
-                    snd.set_volume(volume)
-                    self.sounds[category][name] = snd
-                except pygame.error as e:
-                    logger.warning(f"Could not load sound '{name}' from '{path}': {e}")
-                    self.sounds[category][name] = None
+                key = (path, Config.SOUND_VOLUMES.get(name, Config.DEFAULT_SOUND_VOLUME))
+                if key not in handles:
+                    handles[key] = SoundHandle(*key)
+                self.sounds[category][name] = handles[key]
 
         if not self.background_music_tracks:
             logger.info("No background music tracks found.")
 
+    def prefetch(self) -> None:
+        """
+        Decode all sounds on a background thread.
+        """
+        if not self.enabled or self.prefetch_thread is not None:
+            return
+        handles = {id(h): h for category in self.sounds.values() for h in category.values() if h}
+        pending = [h for h in handles.values() if not h.loaded]
+        if not pending:
+            return
+
+        def run() -> None:
+            start = time.perf_counter()
+            for handle in pending:
+                handle.get()
+            logger.info(f"Prefetched {len(pending)} sounds in {time.perf_counter() - start:.2f}s.")
+
+        self.prefetch_thread = threading.Thread(target=run, name="sound-prefetch", daemon=True)
+        self.prefetch_thread.start()
+
     def play(self, category: str, name: str, loops: int = 0) -> None:
+        if not self.enabled:
+            return
         sfx = self.sounds.get(category, {}).get(name, None)
-        if sfx:
+        if sfx and sfx.get():
             sfx.play(loops=loops)
         else:
             logger.warning(f"Sound '{name}' in category '{category}' not found or invalid.")
@@ -66,6 +204,8 @@ class SoundManager:
             logger.warning(f"Could not load background music '{selected_music}': {e}")
 
     def toggle_music(self) -> None:
+        if not self.enabled:
+            return
         if self.music_on:
             pygame.mixer.music.pause()
             self.music_on = False
@@ -76,6 +216,8 @@ class SoundManager:
             logger.info("Background music resumed.")
 
     def stop_music(self) -> None:
+        if not self.enabled:
+            return
         pygame.mixer.music.stop()
         self.music_on = False
         logger.info("Background music stopped.")
@@ -94,7 +236,8 @@ class SoundManager:
 
     def set_music_volume(self, volume: float) -> None:
         volume = max(0.0, min(1.0, volume))
-        pygame.mixer.music.set_volume(volume)
+        if self.enabled:
+            pygame.mixer.music.set_volume(volume)
         Config.DEFAULT_SOUND_VOLUME = volume
         logger.info(f"Background music volume set to {volume}.")
 
@@ -0,0 +1,113 @@
+# spatial_hash.py
+
+from __future__ import annotations
+import logging
+import numpy as np
+from typing import Any, Iterator
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class SpatialHash:
+    """
+    Uniform grid index over entities with x/y tile coordinates.
+    Entities are bucketed by the cell of the tile they stand on
+    (cell = int(coord) // cell_size) and only move between buckets when
+    they cross a cell border.
+    """
+    def __init__(self, cell_size: int | None = None) -> None:
+        self.cell_size = Config.SPATIAL_CELL_SIZE if cell_size is None else cell_size
+        # Buckets are dicts used as insertion-ordered sets, so queries are deterministic
+        self.cells: dict[tuple[int, int], dict[Any, None]] = {}
+        self.entity_cells: dict[Any, tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.entity_cells)
+
+    def __contains__(self, entity: Any) -> bool:
+        return entity in self.entity_cells
+
+    def cell_of(self, x: float, y: float) -> tuple[int, int]:
+        return int(x) // self.cell_size, int(y) // self.cell_size
+
+    def insert(self, entity: Any) -> None:
+        key = self.cell_of(entity.x, entity.y)
+        self.entity_cells[entity] = key
+        self.cells.setdefault(key, {})[entity] = None
+
+    def insert_many(self, entities: list[Any], xs: np.ndarray, ys: np.ndarray) -> None:
+        """
+        Insert many entities at once, given their coordinates as arrays.
+        """
+        cxs = (np.asarray(xs).astype(np.intp) // self.cell_size).tolist()
+        cys = (np.asarray(ys).astype(np.intp) // self.cell_size).tolist()
+        cells = self.cells
+        entity_cells = self.entity_cells
+        for entity, key in zip(entities, zip(cxs, cys)):
+            entity_cells[entity] = key
+            bucket = cells.get(key)
+            if bucket is None:
+                bucket = cells[key] = {}
+            bucket[entity] = None
+
+    def remove(self, entity: Any) -> None:
+        key = self.entity_cells.pop(entity, None)
+        if key is None:
+            return
+        bucket = self.cells[key]
+        del bucket[entity]
+        if not bucket:
+            del self.cells[key]
+
+    def update(self, entity: Any) -> None:
+        """
+        Re-bucket 'entity' after it moved. Cheap when it stayed in its cell.
+        """
+        key = self.cell_of(entity.x, entity.y)
+        old = self.entity_cells.get(entity)
+        if old == key:
+            return
+        if old is not None:
+            bucket = self.cells[old]
+            del bucket[entity]
+            if not bucket:
+                del self.cells[old]
+        self.entity_cells[entity] = key
+        self.cells.setdefault(key, {})[entity] = None
+
+    def clear(self) -> None:
+        self.cells.clear()
+        self.entity_cells.clear()
+
+    def query_cell(self, cx: int, cy: int) -> Iterator[Any]:
+        yield from self.cells.get((cx, cy), ())
+
+    def query_tile(self, tx: int, ty: int) -> list[Any]:
+        """
+        Entities standing on tile (tx, ty), i.e. int(x) == tx and int(y) == ty.
+        """
+        bucket = self.cells.get((tx // self.cell_size, ty // self.cell_size))
+        if not bucket:
+            return []
+        return [e for e in bucket if int(e.x) == tx and int(e.y) == ty]
+
+    def query_rect(self, x0: float, y0: float, x1: float, y1: float) -> list[Any]:
+        """
+        Entities with x0 <= x < x1 and y0 <= y < y1.
+        """
+        cs = self.cell_size
+        result = []
+        for cy in range(int(y0) // cs, int(y1) // cs + 1):
+            for cx in range(int(x0) // cs, int(x1) // cs + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket:
+                    result.extend(e for e in bucket if x0 <= e.x < x1 and y0 <= e.y < y1)
+        return result
+
+    def query_radius(self, x: float, y: float, radius: float) -> list[Any]:
+        """
+        Entities within Euclidean distance 'radius' of (x, y).
+        """
+        r2 = radius * radius
+        return [e for e in self.query_rect(x - radius, y - radius, x + radius + 1e-9, y + radius + 1e-9)
+                if (e.x - x) * (e.x - x) + (e.y - y) * (e.y - y) <= r2]
@@ -1,62 +1,111 @@
 # spawn_manager.py
 
 from __future__ import annotations
+import gc
 import random
 import logging
+import numpy as np
 from typing import TYPE_CHECKING
 
 from config import Config
-from entities import Dinosaur, Item
-from utils import is_passable, get_random_passable_tile
+from entities import Item
 
 logger = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
     # Only imported at type-check time, avoids runtime circular import
     from game import Game
+    from game_map import GameMap
 
-def spawn_items(game: Game, count: int = 6) -> None:
+def plan_items(game_map: GameMap, count: int = 6, radius: int = 15,
+               rand: random.Random | None = None) -> list[tuple[str, int, int]]:
     """
-    Spawn a given number of items (potions/repellent) near the map center.
+    Pick types and positions for exactly 'count' items (potions/repellent)
+    on passable tiles near the map center, as (type, x, y).
     """
-    center_x = Config.MAP_WIDTH // 2
-    center_y = Config.MAP_HEIGHT // 2
-    for _ in range(count):
-        t = random.choice(["potion", "repellent"])
-        rx = center_x + random.randint(-15, 15)
-        ry = center_y + random.randint(-15, 15)
-        if 0 <= rx < Config.MAP_WIDTH and 0 <= ry < Config.MAP_HEIGHT:
-            if is_passable(rx, ry, game.game_map):
-                game.items.append(Item(rx, ry, t))
-    logger.info(f"Spawned {len(game.items)} items. (requested {count})")
+    rand = random if rand is None else rand
+    center_x = game_map.width // 2
+    center_y = game_map.height // 2
+    types = [rand.choice(["potion", "repellent"]) for _ in range(count)]
+    rect = (center_x - radius, center_y - radius, center_x + radius + 1, center_y + radius + 1)
+    rng = np.random.default_rng(rand.getrandbits(64))
+    try:
+        xs, ys = game_map.sample_tiles(count, rect=rect, rng=rng)
+    except ValueError:
+        logger.warning("No passable tile near the map center; spawning items anywhere.")
+        xs, ys = game_map.sample_tiles(count, rng=rng)
+    return list(zip(types, xs.tolist(), ys.tolist()))
 
-def spawn_dinosaurs(game: Game, n_normal: int, n_aggressive: int) -> None:
+def plan_dinosaurs(game_map: GameMap, n_normal: int, n_aggressive: int,
+                   rand: random.Random | None = None) -> list[tuple[np.ndarray, np.ndarray, bool]]:
     """
-    Spawn normal and aggressive dinosaurs.
+    Pick random dino-passable tiles for the normal and aggressive dinosaurs,
+    as (xs, ys, aggressive) groups.
     """
-    for _ in range(n_normal):
-        x, y = get_random_passable_tile(game.game_map, for_dino=True)
-        game.dinosaurs.append(Dinosaur(x, y, aggressive=False))
+    rand = random if rand is None else rand
+    groups = []
+    for count, aggressive in ((n_normal, False), (n_aggressive, True)):
+        if count <= 0:
+            continue
+        rng = np.random.default_rng(rand.getrandbits(64))
+        xs, ys = game_map.sample_tiles(count, for_dino=True, rng=rng)
+        groups.append((xs, ys, aggressive))
+    return groups
+
+def place_items(game: Game, plan: list[tuple[str, int, int]]) -> None:
+    for t, x, y in plan:
+        item = Item(x, y, t)
+        game.items[item] = None
+        game.item_index.insert(item)
+    logger.info(f"Spawned {len(plan)} items.")
 
-    for _ in range(n_aggressive):
-        x, y = get_random_passable_tile(game.game_map, for_dino=True)
-        game.dinosaurs.append(Dinosaur(x, y, aggressive=True))
+def place_dinosaurs(game: Game, groups: list[tuple[np.ndarray, np.ndarray, bool]]) -> None:
+    """
+    Create the planned dinosaurs in bulk.
+    """
+    # Bulk allocation creates no reference cycles; keep the cyclic GC from
+    # rescanning the growing heap over and over while it runs
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for xs, ys, aggressive in groups:
+            dinos = game.dinosaurs.spawn_many(xs, ys, aggressive=aggressive)
+            game.dino_index.insert_many(dinos, xs, ys)
+    finally:
+        if gc_enabled:
+            gc.enable()
 
+    n_aggressive = sum(len(xs) for xs, _, aggressive in groups if aggressive)
+    n_normal = sum(len(xs) for xs, _, aggressive in groups if not aggressive)
     logger.info(f"Spawned {n_normal} normal and {n_aggressive} aggressive dinosaurs.")
 
+def spawn_items(game: Game, count: int = 6, radius: int = 15) -> None:
+    """
+    Spawn exactly 'count' items (potions/repellent) on passable tiles near the map center.
+    """
+    place_items(game, plan_items(game.game_map, count, radius))
+
+def spawn_dinosaurs(game: Game, n_normal: int, n_aggressive: int) -> None:
+    """
+    Spawn normal and aggressive dinosaurs on random dino-passable tiles,
+    in bulk from the map's passable-tile index.
+    """
+    place_dinosaurs(game, plan_dinosaurs(game.game_map, n_normal, n_aggressive))
+
 def spawn_lava(game: Game, count: int = 8, radius: int = 30) -> list[tuple[int, int]]:
     """
-    Spawn lava near the center of the map, damaging the player on contact.
-    """
-    cx = Config.MAP_WIDTH // 2
-    cy = Config.MAP_HEIGHT // 2
-    lava_positions = []
-    for _ in range(count):
-        rx = cx + random.randint(-radius, radius)
-        ry = cy + random.randint(-radius, radius)
-        if 0 <= rx < Config.MAP_WIDTH and 0 <= ry < Config.MAP_HEIGHT:
-            # Only spawn on passable tiles
-            if Config.BIOMES[game.game_map[ry][rx]]["passable"]:
-                lava_positions.append((rx, ry))
+    Spawn lava on passable tiles near the center of the map, damaging the
+    player on contact until it cools down after Config.LAVA_DURATION.
+    """
+    cx = game.game_map.width // 2
+    cy = game.game_map.height // 2
+    rect = (cx - radius, cy - radius, cx + radius + 1, cy + radius + 1)
+    try:
+        xs, ys = game.game_map.sample_tiles(count, rect=rect)
+    except ValueError:
+        logger.warning("No passable tile near the map center for lava.")
+        return []
+    game.lava.add(xs, ys, game.game_clock.sim_time)
+    lava_positions = list(zip(xs.tolist(), ys.tolist()))
     logger.info(f"Lava spawned at positions: {lava_positions}")
     return lava_positions
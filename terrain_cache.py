@@ -0,0 +1,108 @@
+# terrain_cache.py
+
+from __future__ import annotations
+import logging
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Iterable
+
+import pygame
+from config import Config
+
+if TYPE_CHECKING:
+    from game_map import GameMap
+
+logger = logging.getLogger(__name__)
+
+class TerrainChunkCache:
+    """
+    Pre-rendered terrain, baked into fixed-size chunk surfaces the first time
+    they come into view and kept in an LRU cache with a memory cap.
+    Only static terrain is baked; dynamic overlays (lava, boat) are drawn on top.
+    """
+    def __init__(self, game_map: GameMap, chunk_tiles: int | None = None,
+                 max_bytes: int | None = None) -> None:
+        self.game_map = game_map
+        # Settings not given come from Config at construction time
+        self.chunk_tiles = Config.TERRAIN_CHUNK_TILES if chunk_tiles is None else chunk_tiles
+        self.max_bytes = Config.TERRAIN_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.chunks: OrderedDict[tuple[int, int], pygame.Surface] = OrderedDict()
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_chunk(self, cx: int, cy: int) -> pygame.Surface:
+        """
+        Return the surface for chunk (cx, cy), baking it on a miss.
+        """
+        key = (cx, cy)
+        surf = self.chunks.get(key)
+        if surf is not None:
+            self.chunks.move_to_end(key)
+            self.hits += 1
+            return surf
+
+        self.misses += 1
+        surf = self._bake(cx, cy)
+        self.chunks[key] = surf
+        self.bytes_used += self._surface_bytes(surf)
+        while self.bytes_used > self.max_bytes and len(self.chunks) > 1:
+            _, old = self.chunks.popitem(last=False)
+            self.bytes_used -= self._surface_bytes(old)
+            self.evictions += 1
+        return surf
+
+    def _bake(self, cx: int, cy: int) -> pygame.Surface:
+        n = self.chunk_tiles
+        colors = self.game_map.region_colors(cx * n, cy * n, (cx + 1) * n, (cy + 1) * n)
+        rows, cols = colors.shape[:2]
+        # surfarray expects (width, height, 3); one pixel per tile, then scale up
+        small = pygame.surfarray.make_surface(colors.transpose(1, 0, 2))
+        surf = pygame.transform.scale(small, (cols * Config.TILE_SIZE, rows * Config.TILE_SIZE))
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert()
+        return surf
+
+    @staticmethod
+    def _surface_bytes(surf: pygame.Surface) -> int:
+        return surf.get_width() * surf.get_height() * surf.get_bytesize()
+
+    def invalidate_tiles(self, tiles: Iterable[tuple[int, int]]) -> None:
+        """
+        Drop the chunks containing the given (x, y) tiles so they are re-baked.
+        """
+        n = self.chunk_tiles
+        for tx, ty in tiles:
+            surf = self.chunks.pop((tx // n, ty // n), None)
+            if surf is not None:
+                self.bytes_used -= self._surface_bytes(surf)
+
+    def shift(self, dx: int, dy: int) -> None:
+        """
+        Follow the map scrolling by (dx, dy) tiles. Chunks are re-keyed when
+        the shift is a whole number of chunks, otherwise dropped.
+        """
+        n = self.chunk_tiles
+        if dx % n or dy % n:
+            self.clear()
+            return
+        dcx, dcy = dx // n, dy // n
+        self.chunks = OrderedDict(((cx - dcx, cy - dcy), surf) for (cx, cy), surf in self.chunks.items())
+
+    def clear(self) -> None:
+        self.chunks.clear()
+        self.bytes_used = 0
+
+    def draw(self, surface: pygame.Surface, start_x: int, start_y: int, end_x: int, end_y: int,
+             world_to_screen: Callable[[float, float], tuple[int, int]]) -> None:
+        """
+        Blit every chunk overlapping the tile range [start_x, end_x) x [start_y, end_y).
+        """
+        if end_x <= start_x or end_y <= start_y:
+            return
+        n = self.chunk_tiles
+        blits = []
+        for cy in range(start_y // n, (end_y - 1) // n + 1):
+            for cx in range(start_x // n, (end_x - 1) // n + 1):
+                blits.append((self.get_chunk(cx, cy), world_to_screen(cx * n, cy * n)))
+        surface.blits(blits, doreturn=False)
@@ -0,0 +1,45 @@
+# text_cache.py
+
+from __future__ import annotations
+import pygame
+import logging
+from collections import OrderedDict
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class TextCache:
+    """
+    Least-recently-used cache of rendered text surfaces, keyed by font,
+    text, color and antialiasing. Callers get shared surfaces and must not
+    draw onto them.
+    """
+    def __init__(self, max_entries: int | None = None) -> None:
+        self.max_entries = Config.TEXT_CACHE_SIZE if max_entries is None else max_entries
+        self.surfaces: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font: pygame.font.Font, text: str, color: tuple[int, int, int],
+               antialias: bool = True) -> pygame.Surface:
+        key = (font, text, color, antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def stats(self) -> dict[str, int]:
+        return {"surfaces": len(self.surfaces), "hits": self.hits, "misses": self.misses}
+
+    def clear(self) -> None:
+        self.surfaces.clear()
+
+text_cache = TextCache()
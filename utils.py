@@ -1,10 +1,11 @@
 # utils.py
 
-import random
+from __future__ import annotations
 import math
 import pygame
 import logging
 from config import Config
+from asset_manager import asset_manager
 
 logger = logging.getLogger(__name__)
 
@@ -12,25 +13,6 @@ def is_night(time_since_start: float) -> bool:
     cycle_pos = time_since_start % Config.CYCLE_LENGTH
     return cycle_pos > Config.DAY_LENGTH
 
-def is_passable(x: int, y: int, game_map: list[list[int]], for_dino: bool = False) -> bool:
-    if x < 0 or x >= Config.MAP_WIDTH or y < 0 or y >= Config.MAP_HEIGHT:
-        return False
-    tile = game_map[y][x]
-    if for_dino and tile == 3:
-        return False
-    return Config.BIOMES[tile]["passable"]
-
-def get_random_passable_tile(game_map: list[list[int]], for_dino: bool=False) -> tuple[int, int]:
-    attempts = 0
-    while attempts < 1000:
-        x = random.randint(0, Config.MAP_WIDTH - 1)
-        y = random.randint(0, Config.MAP_HEIGHT - 1)
-        if is_passable(x, y, game_map, for_dino=for_dino):
-            return x, y
-        attempts += 1
-    logger.error("Could not find a passable tile after 1000 attempts.")
-    raise ValueError("Could not find a passable tile after 1000 attempts.")
-
 def direction_towards(x_from: float, y_from: float, x_to: float, y_to: float) -> tuple[float, float]:
     dx = x_to - x_from
     dy = y_to - y_from
@@ -40,18 +22,22 @@ def direction_towards(x_from: float, y_from: float, x_to: float, y_to: float) ->
     return dx/dist, dy/dist
 
 def load_frames(frame_keys: list[str], *sprite_config_keys: str) -> tuple[list[pygame.Surface], list[pygame.Surface]]:
+    """
+    Look up tile-sized sprite frames (and their mirrored versions) in the
+    shared asset registry. The returned surfaces are shared between entities.
+    """
     frames_right = []
     frames_left = []
+    size = (Config.TILE_SIZE, Config.TILE_SIZE)
     for key in frame_keys:
         path = Config.get_sprite_path(*sprite_config_keys, key)
         if path:
-            try:
-                sprite = pygame.image.load(path).convert_alpha()
-                sprite = pygame.transform.scale(sprite, (Config.TILE_SIZE, Config.TILE_SIZE))
+            sprite = asset_manager.get_image(path, size)
+            if sprite:
                 frames_right.append(sprite)
-                frames_left.append(pygame.transform.flip(sprite, True, False))
-            except pygame.error as e:
-                logger.warning(f"Could not load sprite '{key}' at '{path}': {e}")
+                frames_left.append(asset_manager.get_image(path, size, flip=True))
+            else:
+                logger.warning(f"Could not load sprite '{key}' at '{path}'.")
         else:
             logger.warning(f"Sprite path not found for '{key}' in {sprite_config_keys}.")
     if not frames_right:
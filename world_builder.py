@@ -0,0 +1,130 @@
+# world_builder.py
+
+from __future__ import annotations
+import time
+import random
+import logging
+import threading
+import numpy as np
+
+from config import Config
+import map_cache
+import spawn_manager
+from game_map import GameMap
+from world_stream import WorldStreamer
+
+logger = logging.getLogger(__name__)
+
+def world_key() -> tuple:
+    """
+    Every setting a prepared world depends on; a world built under other
+    settings is stale.
+    """
+    if Config.WORLD_STREAMING:
+        return ("streaming", Config.SEED, Config.STREAM_CHUNK_TILES, Config.STREAM_RADIUS,
+                Config.STREAM_DINOSAURS_PER_CHUNK, Config.STREAM_ITEMS_PER_CHUNK)
+    return (map_cache.cache_key(), Config.DINOSAUR_COUNT_NORMAL, Config.DINOSAUR_COUNT_AGGRESSIVE)
+
+class PreparedWorld:
+    """
+    Everything reset_game() needs that does not touch pygame: the map with
+    its indexes, the player's start tile and the planned item and dinosaur
+    spawns. 'rng_state' is the state the global 'random' module would have
+    had after building it synchronously, so handing it over keeps seeded
+    runs reproducible. 'streamer' is set in streaming mode.
+    """
+    def __init__(self, game_map: GameMap, start: tuple[int, int], items: list[tuple[str, int, int]],
+                 dinosaurs: list[tuple[np.ndarray, np.ndarray, bool]],
+                 rng_state: tuple, key: tuple, streamer: WorldStreamer | None = None) -> None:
+        self.game_map = game_map
+        self.start = start
+        self.items = items
+        self.dinosaurs = dinosaurs
+        self.rng_state = rng_state
+        self.key = key
+        self.streamer = streamer
+
+def build_world() -> PreparedWorld:
+    """
+    Generate (or load) the island and plan the spawns, drawing only from a
+    private random stream so it is safe to run off the main thread.
+    """
+    rand = random.Random()
+    if Config.WORLD_STREAMING:
+        return _build_streaming_world(rand)
+    game_map = GameMap(*map_cache.get_island(rand))
+    items = spawn_manager.plan_items(game_map, rand=rand)
+    dinosaurs = spawn_manager.plan_dinosaurs(
+        game_map, Config.DINOSAUR_COUNT_NORMAL, Config.DINOSAUR_COUNT_AGGRESSIVE, rand=rand
+    )
+    start = (game_map.width // 2, game_map.height // 2)
+    # Computed afterwards: a random seed is only fixed by the generation itself
+    return PreparedWorld(game_map, start, items, dinosaurs, rand.getstate(), world_key())
+
+def _build_streaming_world(rand: random.Random) -> PreparedWorld:
+    """
+    The starting window of an endless world, with the entities of its chunks.
+    """
+    if Config.SEED is None:
+        Config.SEED = rand.randint(0, 999999999)
+        logger.info(f"No seed specified, using random seed {Config.SEED}.")
+    rand.seed(Config.SEED)
+    streamer = WorldStreamer(Config.SEED)
+    items, dinosaurs = streamer.initial_entities()
+    return PreparedWorld(streamer.game_map, streamer.start_tile(), items, dinosaurs,
+                         rand.getstate(), world_key(), streamer)
+
+class WorldBuilder:
+    """
+    Prepares the next world on a background thread while menus are shown.
+    take() hands it over, waiting only if it is not finished yet; without a
+    prepared world (or with a stale one) it builds synchronously.
+    """
+    def __init__(self) -> None:
+        self.thread: threading.Thread | None = None
+        self.world: PreparedWorld | None = None
+        self.stats = {"prepared": 0, "synchronous": 0, "stale": 0, "wait_seconds": 0.0}
+
+    @property
+    def busy(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self) -> None:
+        """
+        Begin preparing the next world, unless one is ready or underway.
+        """
+        if self.thread is not None or self.world is not None:
+            return
+        self.thread = threading.Thread(target=self._run, name="world-builder", daemon=True)
+        self.thread.start()
+
+    def _run(self) -> None:
+        start = time.perf_counter()
+        try:
+            self.world = build_world()
+        except Exception:
+            # take() falls back to a synchronous build and reports the error there
+            logger.exception("Background world preparation failed.")
+            return
+        logger.info(f"Prepared the next world in {time.perf_counter() - start:.2f}s.")
+
+    def take(self) -> PreparedWorld:
+        if self.thread is not None:
+            start = time.perf_counter()
+            self.thread.join()
+            self.thread = None
+            waited = time.perf_counter() - start
+            self.stats["wait_seconds"] += waited
+            if waited > 0.05:
+                logger.info(f"Waited {waited:.2f}s for the next world.")
+
+        world, self.world = self.world, None
+        if world is not None and world.key != world_key():
+            logger.info("Discarding a world prepared under different settings.")
+            self.stats["stale"] += 1
+            world = None
+        if world is None:
+            self.stats["synchronous"] += 1
+            return build_world()
+        self.stats["prepared"] += 1
+        return world
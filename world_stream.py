@@ -0,0 +1,340 @@
+# world_stream.py
+
+from __future__ import annotations
+import logging
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from config import Config
+from entities import Item
+from game_map import GameMap
+from map_gen import generate_chunk_tiles, zigzag
+from spatial_hash import SpatialHash
+
+if TYPE_CHECKING:
+    from game import Game
+
+logger = logging.getLogger(__name__)
+
+class Chunk:
+    """
+    One chunk of the streaming world: its tiles and, once it has been
+    populated, the dinosaurs and items that were on it when it was paged out.
+    Entity positions are stored in world coordinates. 'tiles' is None for a
+    chunk restored from a saved game until it is needed again.
+    """
+    __slots__ = ("tiles", "populated", "dinosaurs", "items")
+
+    def __init__(self, tiles: np.ndarray | None) -> None:
+        self.tiles = tiles
+        self.populated = False
+        self.dinosaurs = (np.zeros(0), np.zeros(0), np.zeros(0, dtype=bool))
+        self.items: list[tuple[str, float, float]] = []
+
+    def take_entities(self) -> tuple[tuple[np.ndarray, np.ndarray, np.ndarray], list[tuple[str, float, float]]]:
+        """
+        Hand over the stored dinosaurs (xs, ys, aggressive) and items, leaving the chunk empty.
+        """
+        dinosaurs, items = self.dinosaurs, self.items
+        self.dinosaurs = (np.zeros(0), np.zeros(0), np.zeros(0, dtype=bool))
+        self.items = []
+        return dinosaurs, items
+
+class WorldStreamer:
+    """
+    Optional endless world (Config.WORLD_STREAMING).
+
+    The game keeps working on an ordinary fixed-size GameMap, which here is
+    a window of (2 * STREAM_RADIUS + 1)^2 chunks around the player's chunk
+    ("floating origin"). When the player has gone half a chunk past the
+    center chunk, the window moves by whole chunks: its tiles are rewritten
+    in place from the chunk store, and everything holding map coordinates
+    (player, dinosaurs, items, lava, boat, flow field and render caches) is
+    shifted along. Dinosaurs and items on chunks leaving the window are
+    paged out into their chunk and paged back in when it returns.
+
+    Chunks are generated on demand from the seed (map_gen.generate_chunk_tiles)
+    and kept in an LRU store of at most STREAM_MAX_CHUNKS chunks; an evicted
+    chunk is regenerated, with fresh entities, if it is ever needed again.
+    Memory and the work per move therefore do not depend on the distance
+    travelled. 'origin' is the world position of the window's top-left tile.
+
+    A saved game passes the window's 'origin', 'tiles' and 'indexes' in,
+    then hands the stored chunks back via restore_chunks().
+    """
+    def __init__(self, seed: int, chunk_tiles: int | None = None, radius: int | None = None,
+                 max_chunks: int | None = None,
+                 origin: tuple[int, int] | None = None, tiles: np.ndarray | None = None,
+                 indexes: dict[str, np.ndarray] | None = None) -> None:
+        # Settings not given come from Config at construction time
+        chunk_tiles = Config.STREAM_CHUNK_TILES if chunk_tiles is None else chunk_tiles
+        radius = Config.STREAM_RADIUS if radius is None else radius
+        max_chunks = Config.STREAM_MAX_CHUNKS if max_chunks is None else max_chunks
+        self.seed = seed
+        self.chunk_tiles = chunk_tiles
+        self.radius = radius
+        self.span = 2 * radius + 1
+        # The window must always fit in the store
+        self.max_chunks = max(max_chunks, 2 * self.span * self.span)
+        self.chunks: OrderedDict[tuple[int, int], Chunk] = OrderedDict()
+        # Chunks from a saved game, without tiles until they are needed again
+        self.restored: dict[tuple[int, int], Chunk] = {}
+        self.origin = (-radius * chunk_tiles, -radius * chunk_tiles) if origin is None else origin
+        self.stats = {"generated": 0, "evicted": 0, "moves": 0}
+
+        if tiles is not None:
+            # A writable copy: moving the window rewrites it in place
+            self.game_map = GameMap(np.array(tiles, dtype=np.uint8), indexes)
+            return
+        size = self.span * chunk_tiles
+        self.game_map = GameMap(np.zeros((size, size), dtype=np.uint8))
+        self._fill_window()
+
+    def chunk(self, cx: int, cy: int) -> Chunk:
+        """
+        Chunk (cx, cy) in world chunk coordinates, generated on a miss.
+        """
+        key = (cx, cy)
+        chunk = self.chunks.get(key)
+        if chunk is not None:
+            self.chunks.move_to_end(key)
+            return chunk
+        tiles = generate_chunk_tiles(self.seed, cx, cy, self.chunk_tiles)
+        chunk = self.restored.pop(key, None)
+        if chunk is None:
+            chunk = Chunk(tiles)
+        else:
+            chunk.tiles = tiles
+        self.chunks[key] = chunk
+        self.stats["generated"] += 1
+        while len(self.chunks) > self.max_chunks:
+            self.chunks.popitem(last=False)
+            self.stats["evicted"] += 1
+        return chunk
+
+    def _window_chunks(self) -> list[tuple[int, int, int, int]]:
+        """
+        (cx, cy, column, row) of every chunk in the window.
+        """
+        n = self.chunk_tiles
+        ocx, ocy = self.origin[0] // n, self.origin[1] // n
+        return [(ocx + col, ocy + row, col, row) for row in range(self.span) for col in range(self.span)]
+
+    def _fill_window(self) -> None:
+        n = self.chunk_tiles
+        tiles = self.game_map.tiles
+        for cx, cy, col, row in self._window_chunks():
+            tiles[row * n:(row + 1) * n, col * n:(col + 1) * n] = self.chunk(cx, cy).tiles
+        self.game_map.set_indexes()
+
+    def start_tile(self) -> tuple[int, int]:
+        """
+        The passable tile closest to the window's center, to start on.
+        """
+        game_map = self.game_map
+        cx, cy = game_map.width // 2, game_map.height // 2
+        if game_map.is_passable(cx, cy) or not len(game_map.passable_tiles):
+            return cx, cy
+        xs, ys = game_map.index_to_xy(game_map.passable_tiles)
+        best = int(np.argmin((xs - cx) ** 2 + (ys - cy) ** 2))
+        return int(xs[best]), int(ys[best])
+
+    def _populate(self, cx: int, cy: int, chunk: Chunk) -> None:
+        """
+        First visit of a chunk: scatter its dinosaurs and items, from a
+        generator keyed by the chunk so revisits after eviction repeat them.
+        """
+        n = self.chunk_tiles
+        rng = np.random.default_rng([self.seed, 6, zigzag(cx), zigzag(cy)])
+        flat = np.flatnonzero(self.game_map.dino_passable_table[chunk.tiles].reshape(-1))
+        count = int(rng.poisson(Config.STREAM_DINOSAURS_PER_CHUNK)) if len(flat) else 0
+        total = Config.DINOSAUR_COUNT_NORMAL + Config.DINOSAUR_COUNT_AGGRESSIVE
+        aggressive_share = Config.DINOSAUR_COUNT_AGGRESSIVE / total if total else 0.0
+        picked = flat[rng.integers(0, len(flat), count)] if count else np.zeros(0, dtype=np.int64)
+        chunk.dinosaurs = (cx * n + picked % n + 0.0, cy * n + picked // n + 0.0,
+                           rng.random(count) < aggressive_share)
+
+        flat = np.flatnonzero(self.game_map.passable_table[chunk.tiles].reshape(-1))
+        count = int(rng.poisson(Config.STREAM_ITEMS_PER_CHUNK)) if len(flat) else 0
+        picked = flat[rng.integers(0, len(flat), count)].tolist() if count else []
+        chunk.items = [(str(rng.choice(["potion", "repellent"])), cx * n + p % n, cy * n + p // n)
+                       for p in picked]
+        chunk.populated = True
+
+    def initial_entities(self) -> tuple[list[tuple[str, int, int]], list[tuple[np.ndarray, np.ndarray, bool]]]:
+        """
+        Items and dinosaur groups of the starting window, in window
+        coordinates, in the form spawn_manager.place_items/place_dinosaurs take.
+        """
+        ox, oy = self.origin
+        items = []
+        xs, ys, aggressive = [], [], []
+        for cx, cy, _, _ in self._window_chunks():
+            chunk = self.chunk(cx, cy)
+            if not chunk.populated:
+                self._populate(cx, cy, chunk)
+            (cxs, cys, cagg), chunk_items = chunk.take_entities()
+            items.extend((t, x - ox, y - oy) for t, x, y in chunk_items)
+            xs.append(cxs - ox)
+            ys.append(cys - oy)
+            aggressive.append(cagg)
+        xs, ys, aggressive = np.concatenate(xs), np.concatenate(ys), np.concatenate(aggressive)
+        groups = [(xs[aggressive == flag], ys[aggressive == flag], flag) for flag in (False, True)]
+        return items, [group for group in groups if len(group[0])]
+
+    def stored_chunks(self) -> tuple[np.ndarray, np.ndarray, tuple[np.ndarray, np.ndarray, np.ndarray],
+                                     list[tuple[str, float, float]]]:
+        """
+        What a saved game needs to restore the chunk store: the chunk keys
+        (k x 2, least recently used first), whether each was populated, and
+        the paged-out dinosaurs (xs, ys, aggressive) and items.
+        """
+        chunks = list(self.restored.items()) + list(self.chunks.items())
+        keys = np.array([key for key, _ in chunks], dtype=np.int64).reshape(-1, 2)
+        populated = np.array([chunk.populated for _, chunk in chunks], dtype=bool)
+        dinosaurs = tuple(np.concatenate([chunk.dinosaurs[i] for _, chunk in chunks] + [empty])
+                          for i, empty in enumerate(Chunk(None).dinosaurs))
+        items = [item for _, chunk in chunks for item in chunk.items]
+        return keys, populated, dinosaurs, items
+
+    def restore_chunks(self, keys: np.ndarray, populated: np.ndarray,
+                       dinosaurs: tuple[np.ndarray, np.ndarray, np.ndarray],
+                       items: list[tuple[str, float, float]]) -> None:
+        """
+        Counterpart of stored_chunks(). Tiles are regenerated when a chunk is
+        next needed; the window itself came with the saved tiles.
+        """
+        n = self.chunk_tiles
+        restored = {}
+        for key, flag in zip(map(tuple, keys.tolist()), populated.tolist()):
+            chunk = Chunk(None)
+            chunk.populated = flag
+            restored[key] = chunk
+        xs, ys, aggressive = dinosaurs
+        cxs, cys = (xs // n).astype(np.int64), (ys // n).astype(np.int64)
+        for key in set(zip(cxs.tolist(), cys.tolist())):
+            sel = (cxs == key[0]) & (cys == key[1])
+            restored.setdefault(key, Chunk(None)).dinosaurs = (xs[sel], ys[sel], aggressive[sel])
+        for t, wx, wy in items:
+            restored.setdefault((int(wx) // n, int(wy) // n), Chunk(None)).items.append((t, wx, wy))
+        self.restored = restored
+
+    def follow(self, game: Game) -> bool:
+        """
+        Move the window with the player if needed. Returns True if it moved.
+        """
+        n = self.chunk_tiles
+        r = self.radius
+        # Half a chunk of slack around the center chunk, so walking along a border does not thrash
+        lo, hi = r * n - n // 2, (r + 1) * n + n // 2
+        px, py = game.player.x, game.player.y
+        if lo <= px < hi and lo <= py < hi:
+            return False
+        dcx = int(px) // n - r
+        dcy = int(py) // n - r
+        self.move(game, dcx * n, dcy * n)
+        return True
+
+    def move(self, game: Game, dx: int, dy: int) -> None:
+        """
+        Scroll the window by (dx, dy) tiles (whole chunks).
+        """
+        n = self.chunk_tiles
+        size = self.game_map.width
+        old_ox, old_oy = self.origin
+        herd = game.dinosaurs
+
+        # Page out dinosaurs and items that end up outside the new window
+        count = len(herd)
+        x = herd.x[:count] - dx
+        y = herd.y[:count] - dy
+        outside = np.flatnonzero((x < 0) | (x >= size) | (y < 0) | (y >= size))
+        if len(outside):
+            wx = herd.x[outside] + old_ox
+            wy = herd.y[outside] + old_oy
+            keys = np.stack(((wx // n).astype(np.int64), (wy // n).astype(np.int64)), axis=1)
+            aggressive = herd.aggressive[outside].copy()
+            for key in {tuple(k) for k in keys.tolist()}:
+                sel = (keys[:, 0] == key[0]) & (keys[:, 1] == key[1])
+                chunk = self.chunk(*key)
+                cxs, cys, cagg = chunk.dinosaurs
+                chunk.dinosaurs = (np.concatenate((cxs, wx[sel])), np.concatenate((cys, wy[sel])),
+                                   np.concatenate((cagg, aggressive[sel])))
+            keep = herd.remove_many(outside)
+            game.ai_scheduler.compact(keep)
+        kept_items = []
+        for item in game.items:
+            ix, iy = item.x - dx, item.y - dy
+            if 0 <= ix < size and 0 <= iy < size:
+                kept_items.append(item)
+            else:
+                wx, wy = item.x + old_ox, item.y + old_oy
+                self.chunk(int(wx) // n, int(wy) // n).items.append((item.type, wx, wy))
+
+        # New window
+        self.origin = (old_ox + dx, old_oy + dy)
+        self._fill_window()
+
+        # Shift whatever stayed
+        count = len(herd)
+        for name, delta in (("x", dx), ("prev_x", dx), ("y", dy), ("prev_y", dy)):
+            getattr(herd, name)[:count] -= delta
+        for item in kept_items:
+            item.x -= dx
+            item.y -= dy
+        player = game.player
+        player.x -= dx
+        player.prev_x -= dx
+        player.y -= dy
+        player.prev_y -= dy
+        game.camx -= dx
+        game.camy -= dy
+        if game.boat_site is not None:
+            game.boat_site = (game.boat_site[0] - dx, game.boat_site[1] - dy)
+        if game.boat_x is not None:
+            game.boat_x -= dx
+            game.boat_y -= dy
+        game.lava.shift(dx, dy)
+        game.terrain_cache.shift(dx, dy)
+        if game.flow_field is not None:
+            game.flow_field.reset()
+
+        # Page in what the new window chunks hold
+        ox, oy = self.origin
+        old_chunks = {(old_ox // n + col, old_oy // n + row) for row in range(self.span) for col in range(self.span)}
+        new_xs, new_ys, new_aggressive = [], [], []
+        for cx, cy, _, _ in self._window_chunks():
+            if (cx, cy) in old_chunks:
+                continue
+            chunk = self.chunk(cx, cy)
+            if not chunk.populated:
+                self._populate(cx, cy, chunk)
+            (cxs, cys, cagg), chunk_items = chunk.take_entities()
+            new_xs.append(cxs - ox)
+            new_ys.append(cys - oy)
+            new_aggressive.append(cagg)
+            for t, wx, wy in chunk_items:
+                kept_items.append(Item(wx - ox, wy - oy, t))
+        if new_xs:
+            xs, ys, aggressive = np.concatenate(new_xs), np.concatenate(new_ys), np.concatenate(new_aggressive)
+            for flag in (False, True):
+                sel = aggressive == flag
+                if sel.any():
+                    herd.spawn_many(xs[sel], ys[sel], aggressive=flag)
+
+        # Indexes are rebuilt rather than patched; the window holds few entities
+        game.items = dict.fromkeys(kept_items)
+        game.item_index = SpatialHash()
+        game.item_index.insert_many(kept_items, np.array([it.x for it in kept_items]),
+                                    np.array([it.y for it in kept_items]))
+        game.dino_index = SpatialHash()
+        count = len(herd)
+        game.dino_index.insert_many(herd.views, herd.x[:count], herd.y[:count])
+        game.ai_scheduler.index = game.dino_index
+        game.hud.invalidate_minimap()
+
+        self.stats["moves"] += 1
+        logger.debug(f"World window moved by ({dx}, {dy}) to origin {self.origin}; "
+                     f"{len(herd)} dinosaurs, {len(kept_items)} items, {len(self.chunks)} chunks stored.")